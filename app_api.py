@@ -1,12 +1,34 @@
-from fastapi import FastAPI
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Tuple
+import os, threading, time, uuid
+from dataclasses import asdict
+from functools import lru_cache
+from fastapi import FastAPI, File, Form, HTTPException, Query, UploadFile
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional, Dict, Tuple, Literal
 from src.uni_scheduler.scheduler import Scheduler
 from src.uni_scheduler.models import Room, Professor, Course, Slot, Assignment
 from src.uni_scheduler.data_example import dataset_ejemplo
+from src.uni_scheduler.utils import compilar_disponibilidad
+from src.uni_scheduler.jobs import JobQueue, ColaLlena, construir
+from src.uni_scheduler.cache import ResultCache, clave_entradas
+from src.uni_scheduler.metrics import Instrumentacion, Registro
+from src.uni_scheduler.export import escribir_excel, escribir_pdf_alertas, transmitir
+from src.uni_scheduler.ingest import cargar_campus, ErrorIngesta
+from src.uni_scheduler.scenarios import escenario_desde_dict
+from src.uni_scheduler.validation import validar
 
 app = FastAPI(title="Uni Scheduler API", version="1.0.0")
 
+# caché de resultados (UNI_CACHE_DIR la persiste en disco)
+_cache = ResultCache(path=os.environ.get("UNI_CACHE_DIR") or None)
+_registro = Registro()
+
+# cota fija del esquema (el mismo contrato en cualquier máquina); cada endpoint recorta a los CPU del servidor
+MAX_WORKERS = 64
+
+def _workers(pedidos: int) -> int:
+    return min(pedidos, os.cpu_count() or 1)
+
 # ----- Schemas -----
 class SlotOut(BaseModel):
     day: str
@@ -33,6 +55,12 @@ class ProfessorIn(BaseModel):
     disponible_labs: bool = True
     disponibilidad: Dict[str, List[Tuple[str, str]]] = {}
 
+    @model_validator(mode="after")
+    def _ventanas_validas(self):
+        # falla en la ingesta (422) y no dentro de build()
+        compilar_disponibilidad(self)
+        return self
+
 class CourseIn(BaseModel):
     code: str
     name: str
@@ -50,10 +78,113 @@ class ScheduleIn(BaseModel):
     professors: List[ProfessorIn]
     courses: List[CourseIn]
     assistants: List[str] = []
+    engine: Literal["python", "numpy", "csp"] = Field("python", description="python o numpy (mismo resultado); csp = búsqueda exacta acotada por time_budget")
+    multistart: int = Field(0, ge=0, le=256, description="Variantes aleatorias a probar (0 = build determinista)")
+    by_faculty: bool = Field(False, description="Construir cada facultad en su propio proceso (usa workers) y conciliar profesores compartidos")
+    workers: int = Field(1, ge=1, le=MAX_WORKERS, description="Procesos pedidos; el servidor usa a lo sumo os.cpu_count()")
+    time_budget: Optional[float] = Field(None, gt=0, description="Segundos máximos para el multi-start o el motor csp")
+    seed: int = 0
+    optimize: int = Field(0, ge=0, le=10_000_000, description="Iteraciones de búsqueda local después del build (0 = no optimizar)")
+    optimize_time: Optional[float] = Field(None, gt=0, description="Segundos máximos de la búsqueda local")
+
+class OptimizeIn(BaseModel):
+    iterations: int = Field(20000, ge=1, le=10_000_000)
+    time_budget: Optional[float] = Field(None, gt=0)
+    seed: int = 0
+
+class ValidateIn(BaseModel):
+    semester: str = Field(..., description="Abril-Agosto o Agosto-Diciembre")
+    rooms: List[RoomIn]
+    professors: List[ProfessorIn]
+    courses: List[CourseIn]
+    assignments: List[AssignmentOut]
+
+class AlertaOut(BaseModel):
+    codigo: str
+    nivel: str  # error | aviso
+    mensaje: str
+    curso: Optional[str] = None
+    grupo: Optional[str] = None
+    sala: Optional[str] = None
+    profesor: Optional[str] = None
+    dia: Optional[str] = None
+
+class ValidateOut(BaseModel):
+    ok: bool  # sin alertas de nivel error
+    errores: int
+    avisos: int
+    alerts: List[AlertaOut]
+
+class ScenarioIn(BaseModel):
+    name: str
+    semester: Optional[str] = Field(None, description="Otro semestre (None = el de la base)")
+    add_rooms: List[RoomIn] = []
+    remove_rooms: List[str] = []
+    add_courses: List[CourseIn] = []
+    remove_courses: List[str] = []
+    availability: Dict[str, Dict[str, List[Tuple[str, str]]]] = Field({}, description="Reemplaza la disponibilidad de esos profesores")
+    drop_days: Dict[str, List[str]] = Field({}, description="Profesor -> días que deja libres")
+
+class ScenariosIn(BaseModel):
+    base: ScheduleIn = Field(..., description="Dataset base (multistart y optimize no se usan)")
+    scenarios: List[ScenarioIn] = Field(..., min_length=1, max_length=64)
+    workers: int = Field(1, ge=1, le=MAX_WORKERS, description="Procesos pedidos; el servidor usa a lo sumo os.cpu_count()")
+
+class ScenarioRowOut(BaseModel):
+    escenario: str
+    semester: Optional[str] = None
+    alertas: Optional[int] = None
+    asignaciones: Optional[int] = None
+    sin_asignar: Optional[int] = None
+    sin_profesor: Optional[int] = None
+    huecos: Optional[int] = None
+    sobrecarga: Optional[int] = None
+    utilizacion_salas: Optional[Dict[str, float]] = None
+    delta: Optional[Dict[str, int]] = None  # respecto de la base
+    error: Optional[str] = None
+
+class ScenariosOut(BaseModel):
+    scenarios: List[ScenarioRowOut]
 
 class ScheduleOut(BaseModel):
     assignments: List[AssignmentOut]
     alerts: List[str]
+    score: Optional[Dict[str, int]] = None
+    stats: Optional[dict] = None
+
+class LiveScheduleOut(ScheduleOut):
+    schedule_id: str
+
+class HeatmapFacultadOut(BaseModel):
+    salas: int
+    ocupacion: List[List[float]]  # [día][bloque] % de salas ocupadas
+
+class HeatmapOut(BaseModel):
+    dias: List[str]
+    bloques: List[str]  # inicio de cada bloque de 30 min
+    facultades: Dict[str, HeatmapFacultadOut]
+
+class CargaOut(BaseModel):
+    profesores: int
+    promedio_horas: float
+    max_horas: float
+    sobrecarga: int  # pares (profesor, día) sobre 6 h
+    semanal: Dict[float, int]  # horas en la semana -> profesores
+    diaria: Dict[float, int]  # horas en un día con clases -> (profesor, día)
+
+class SalaUsoOut(BaseModel):
+    sala: str
+    faculty: str
+    kind: str
+    horas: float
+    utilizacion: float
+    horas_por_dia: Dict[str, float]
+
+class JobOut(BaseModel):
+    job_id: str
+    status: str  # pendiente | ejecutando | terminado | error | cancelado
+    result: Optional[ScheduleOut] = None
+    error: Optional[str] = None
 
 @app.get("/health")
 def health():
@@ -61,10 +192,14 @@ def health():
 
 @app.get("/sample", response_model=ScheduleIn)
 def sample():
+    return _sample()
+
+@lru_cache(maxsize=1)
+def _sample() -> dict:
     rooms, profs, courses, assistants = dataset_ejemplo()
     return {
         "semester": "Agosto-Diciembre",
-        "rooms": [r.__dict__ for r in rooms],
+        "rooms": [asdict(r) for r in rooms],
         "professors": [{
             "id": p.id,
             "name": p.name,
@@ -72,22 +207,284 @@ def sample():
             "disponible_labs": p.disponible_labs,
             "disponibilidad": p.disponibilidad,
         } for p in profs],
-        "courses": [c.__dict__ for c in courses],
+        "courses": [asdict(c) for c in courses],
         "assistants": assistants,
     }
 
-@app.post("/schedule", response_model=ScheduleOut)
-def schedule(payload: ScheduleIn):
+def _scheduler(payload: ScheduleIn) -> Scheduler:
     rooms = [Room(**r.model_dump()) for r in payload.rooms]
     profs = [Professor(**p.model_dump()) for p in payload.professors]
     courses = [Course(**c.model_dump()) for c in payload.courses]
-    s = Scheduler(payload.semester, rooms, profs, courses, payload.assistants)
-    s.build()
+    return Scheduler(payload.semester, rooms, profs, courses, payload.assistants, engine=payload.engine, time_budget=payload.time_budget)
+
+def _construir(s: Scheduler, payload: ScheduleIn, cache: Optional[ResultCache] = _cache) -> Optional[Dict[str, int]]:
+    score = None
+    if payload.multistart > 0:
+        score = s.build_multistart(payload.multistart, _workers(payload.workers), payload.time_budget, payload.seed)
+    elif payload.by_faculty:
+        try:
+            s.build_por_facultad(_workers(payload.workers))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        s.build(cache=cache)  # se cachea el build, la búsqueda local corre después
+    if payload.optimize > 0:
+        s.optimizar(payload.optimize, payload.optimize_time, payload.seed)
+        score = s.puntaje()
+    return score
+
+def _salida(s: Scheduler) -> dict:
+    return _salida_de(s.assignments, s.alerts)
+
+def _salida_de(asignaciones: List[Assignment], alerts: List[str]) -> dict:
     assignments = [AssignmentOut(
         course_code=a.course_code,
         group=a.group,
         slot=SlotOut(day=a.slot.day, start=a.slot.start, end=a.slot.end),
         room_id=a.room_id,
         professor_id=a.professor_id,
-    ) for a in s.assignments]
-    return {"assignments": assignments, "alerts": s.alerts}
+    ) for a in asignaciones]
+    return {"assignments": assignments, "alerts": alerts}
+
+@app.post("/schedule", response_model=ScheduleOut)
+def schedule(payload: ScheduleIn, stats: bool = Query(False, description="Incluir tiempos por fase y contadores")):
+    s = _scheduler(payload)
+    # sin stats solo se cronometran las fases (contadores apagados: costo ~nulo)
+    inst = Instrumentacion(contadores=stats).instalar(s)
+    # con stats se construye siempre: un hit de caché no pasa por las fases ni los contadores
+    score = _construir(s, payload, cache=None if stats else _cache)
+    _registro.acumular(inst)
+    return {**_salida(s), "score": score, "stats": inst.resumen() if stats else None}
+
+@app.post("/schedule/upload", response_model=ScheduleOut)
+def schedule_upload(
+    semester: str = Form(..., description="Abril-Agosto o Agosto-Diciembre"),
+    rooms: UploadFile = File(..., description="CSV/XLSX: id, faculty, kind, capacity"),
+    professors: UploadFile = File(..., description="CSV/XLSX, una fila por ventana: id, name, habilitado_desde_ciclo, disponible_labs, day, start, end"),
+    courses: UploadFile = File(..., description="CSV/XLSX: code, name, faculty, cycle, inscritos_teorico, inscritos_lab, ..."),
+    engine: Literal["python", "numpy", "csp"] = Form("python"),
+):
+    # ingesta por filas, sin materializar un JSON gigante ni validar objeto por objeto con Pydantic
+    try:
+        r, p, c = cargar_campus(rooms.file, professors.file, courses.file, (rooms.filename, professors.filename, courses.filename))
+    except ErrorIngesta as e:
+        raise HTTPException(status_code=422, detail={"mensaje": str(e), "errores": [err.__dict__ for err in e.errores]})
+    s = Scheduler(semester, r, p, c, [], engine=engine)
+    inst = Instrumentacion(contadores=False).instalar(s)
+    s.build(cache=_cache)
+    _registro.acumular(inst)
+    return _salida(s)
+
+@app.post("/validate", response_model=ValidateOut)
+def validate(payload: ValidateIn):
+    # solo valida: no construye ni modifica nada
+    try:
+        asignaciones = [Assignment(a.course_code, a.group, Slot(a.slot.day, a.slot.start, a.slot.end), a.room_id, a.professor_id)
+                        for a in payload.assignments]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    alertas = validar(payload.semester, [Room(**r.model_dump()) for r in payload.rooms], [Professor(**p.model_dump()) for p in payload.professors],
+                      [Course(**c.model_dump()) for c in payload.courses], asignaciones)
+    errores = sum(1 for a in alertas if a.nivel == "error")
+    return {"ok": errores == 0, "errores": errores, "avisos": len(alertas) - errores, "alerts": [asdict(a) for a in alertas]}
+
+@app.post("/scenarios", response_model=ScenariosOut)
+def scenarios(payload: ScenariosIn):
+    # la base se valida y prepara una vez; la primera fila es la base sin cambios
+    base = _scheduler(payload.base)
+    escenarios = [escenario_desde_dict(e.model_dump()) for e in payload.scenarios]
+    return {"scenarios": base.comparar_escenarios(escenarios, _workers(payload.workers))}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    cache = _cache.stats()
+    return _registro.prometheus({
+        "uni_cache_hits_total": cache["hits"],
+        "uni_cache_misses_total": cache["misses"],
+        "uni_cache_bytes": cache["bytes"],
+        "uni_jobs_pendientes": _cola.pendientes(),
+        "uni_horarios_vivos": len(_vivos),
+    })
+
+@app.get("/cache/stats")
+def cache_stats():
+    return _cache.stats()
+
+# ----- Horarios vivos: cambios incrementales por schedule_id -----
+# cada uno retiene un Scheduler completo (índices y agregados): a lo sumo VIVOS_MAX a la vez y se
+# descartan después de VIVOS_TTL segundos sin uso, como los resultados de la cola de trabajos
+VIVOS_MAX = 64
+VIVOS_TTL = 3600.0
+_vivos: Dict[str, Tuple[Scheduler, threading.Lock]] = {}
+_vivos_uso: Dict[str, float] = {}  # schedule_id -> último acceso
+_vivos_lock = threading.Lock()
+
+def _purgar_vivos():
+    limite = time.time() - VIVOS_TTL
+    for schedule_id in [k for k, t in _vivos_uso.items() if t < limite]:
+        del _vivos[schedule_id], _vivos_uso[schedule_id]
+
+def _hay_lugar():
+    # llamar con _vivos_lock tomado
+    _purgar_vivos()
+    if len(_vivos) >= VIVOS_MAX:
+        raise HTTPException(status_code=429, detail=f"Demasiados horarios vivos ({VIVOS_MAX}); borrar alguno con DELETE /schedules/{{schedule_id}}")
+
+def _vivo(schedule_id: str) -> Tuple[Scheduler, threading.Lock]:
+    with _vivos_lock:
+        _purgar_vivos()
+        if schedule_id not in _vivos:
+            raise HTTPException(status_code=404, detail=f"Horario no encontrado o expirado: {schedule_id}")
+        _vivos_uso[schedule_id] = time.time()
+        return _vivos[schedule_id]
+
+def _aplicar(schedule_id: str, op, *args) -> dict:
+    s, lock = _vivo(schedule_id)
+    with lock:
+        try:
+            op(s, *args)
+        except KeyError as e:
+            raise HTTPException(status_code=404, detail=f"No encontrado: {e.args[0]}")
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"schedule_id": schedule_id, **_salida(s)}
+
+@app.post("/schedules", response_model=LiveScheduleOut)
+def crear_horario(payload: ScheduleIn):
+    with _vivos_lock:
+        _hay_lugar()  # antes de construir: con el límite alcanzado no se gasta el build
+    s = _scheduler(payload)
+    _construir(s, payload)
+    schedule_id = uuid.uuid4().hex
+    with _vivos_lock:
+        _hay_lugar()
+        _vivos[schedule_id] = (s, threading.Lock())
+        _vivos_uso[schedule_id] = time.time()
+    return {"schedule_id": schedule_id, **_salida(s)}
+
+@app.get("/schedules/{schedule_id}", response_model=LiveScheduleOut)
+def ver_horario(schedule_id: str):
+    return _aplicar(schedule_id, lambda s: None)
+
+@app.delete("/schedules/{schedule_id}")
+def borrar_horario(schedule_id: str):
+    _vivo(schedule_id)
+    with _vivos_lock:
+        _vivos.pop(schedule_id, None)
+        _vivos_uso.pop(schedule_id, None)
+    return {"status": "ok"}
+
+@app.post("/schedules/{schedule_id}/courses", response_model=LiveScheduleOut)
+def agregar_curso(schedule_id: str, course: CourseIn):
+    return _aplicar(schedule_id, Scheduler.agregar_curso, Course(**course.model_dump()))
+
+@app.put("/schedules/{schedule_id}/courses/{code}", response_model=LiveScheduleOut)
+def modificar_curso(schedule_id: str, code: str, course: CourseIn):
+    if course.code != code:
+        raise HTTPException(status_code=400, detail="El código del curso no coincide con la URL")
+    return _aplicar(schedule_id, Scheduler.modificar_curso, Course(**course.model_dump()))
+
+@app.delete("/schedules/{schedule_id}/courses/{code}", response_model=LiveScheduleOut)
+def quitar_curso(schedule_id: str, code: str):
+    return _aplicar(schedule_id, Scheduler.quitar_curso, code)
+
+@app.put("/schedules/{schedule_id}/professors/{prof_id}/disponibilidad", response_model=LiveScheduleOut)
+def cambiar_disponibilidad(schedule_id: str, prof_id: str, disponibilidad: Dict[str, List[Tuple[str, str]]]):
+    return _aplicar(schedule_id, Scheduler.cambiar_disponibilidad, prof_id, disponibilidad)
+
+@app.delete("/schedules/{schedule_id}/rooms/{room_id}", response_model=LiveScheduleOut)
+def retirar_sala(schedule_id: str, room_id: str):
+    return _aplicar(schedule_id, Scheduler.retirar_sala, room_id)
+
+# descargas en streaming: el archivo se genera mientras se envía, sin pasar por disco
+@app.get("/schedules/{schedule_id}/horarios.xlsx")
+def descargar_excel(schedule_id: str):
+    s, lock = _vivo(schedule_id)
+    return StreamingResponse(transmitir(escribir_excel, s, lock),
+                             media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+                             headers={"Content-Disposition": 'attachment; filename="horarios.xlsx"'})
+
+@app.get("/schedules/{schedule_id}/alertas.pdf")
+def descargar_pdf(schedule_id: str):
+    s, lock = _vivo(schedule_id)
+    return StreamingResponse(transmitir(escribir_pdf_alertas, s, lock), media_type="application/pdf",
+                             headers={"Content-Disposition": 'attachment; filename="alertas.pdf"'})
+
+@app.post("/schedules/{schedule_id}/optimize", response_model=LiveScheduleOut)
+def optimizar_horario(schedule_id: str, body: OptimizeIn):
+    return _aplicar(schedule_id, Scheduler.optimizar, body.iterations, body.time_budget, body.seed)
+
+# analítica servida desde los agregados que mantiene el Scheduler (no recorre las asignaciones)
+def _leer(schedule_id: str, consulta):
+    s, lock = _vivo(schedule_id)
+    with lock:
+        return consulta(s.agregados)
+
+@app.get("/schedules/{schedule_id}/analytics/heatmap", response_model=HeatmapOut)
+def analitica_heatmap(schedule_id: str, faculty: Optional[str] = None, kind: Optional[Literal["teorico", "lab"]] = None):
+    try:
+        return _leer(schedule_id, lambda ag: ag.heatmap(faculty, kind))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=f"Facultad sin salas: {e.args[0]}")
+
+@app.get("/schedules/{schedule_id}/analytics/professors", response_model=CargaOut)
+def analitica_profesores(schedule_id: str):
+    return _leer(schedule_id, lambda ag: ag.carga_profesores())
+
+@app.get("/schedules/{schedule_id}/analytics/rooms", response_model=List[SalaUsoOut])
+def analitica_salas(schedule_id: str, threshold: float = Query(25.0, ge=0, le=100, description="% de la jornada semanal bajo el que una sala cuenta como subutilizada")):
+    return _leer(schedule_id, lambda ag: ag.salas_subutilizadas(threshold))
+
+# ----- Modo asíncrono: build() en un pool de procesos -----
+_cola = JobQueue()
+
+@app.on_event("shutdown")
+def _cerrar_cola():
+    _cola.cerrar()
+
+def _job_out(job) -> dict:
+    out = {"job_id": job.id, "status": job.estado}
+    if out["status"] == "terminado":
+        asignaciones, alerts, _, score = job.future.result()
+        out["result"] = {**_salida_de(asignaciones, alerts), "score": score}
+    elif out["status"] == "error":
+        out["error"] = str(job.future.exception())
+    return out
+
+@app.post("/jobs", response_model=JobOut, status_code=202)
+def enviar_job(payload: ScheduleIn):
+    s = _scheduler(payload)  # valida en el request, el worker solo construye
+    if payload.by_faculty and payload.multistart == 0 and s.engine == "csp":
+        # mismo error que build_por_facultad en /schedule, antes de encolar
+        raise HTTPException(status_code=400, detail="El build por facultad no aplica al motor csp")
+    clave = clave_entradas(s.semester, s.rooms, s.professors.values(), s.courses, s.assistants_pool)
+    # solo el build() plano se cachea: csp, multi-start y búsqueda local dependen del tiempo disponible
+    # y el build por facultad puede dar otro horario
+    cacheable = s.engine != "csp" and payload.optimize == 0 and payload.multistart == 0 and not payload.by_faculty
+    hit = _cache.get(clave) if cacheable else None
+    if hit is not None:
+        return _job_out(_cola.resuelto((*hit, None)))
+    try:
+        job = _cola.enviar(construir, s.semester, s.rooms, list(s.professors.values()), s.courses, s.assistants_pool, s.engine, s.time_budget,
+                           payload.optimize, payload.optimize_time, payload.seed, payload.multistart, payload.by_faculty, _workers(payload.workers))
+    except ColaLlena as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    if cacheable:
+        job.future.add_done_callback(lambda f: f.cancelled() or f.exception() is not None or _cache.put(clave, *f.result()[:3]))
+    return _job_out(job)
+
+@app.get("/jobs/{job_id}", response_model=JobOut)
+def ver_job(job_id: str, wait: float = Query(0.0, ge=0.0, le=60.0, description="Segundos de long-poll")):
+    try:
+        return _job_out(_cola.obtener(job_id, wait))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Trabajo no encontrado o expirado: {job_id}")
+
+@app.delete("/jobs/{job_id}", response_model=JobOut)
+def cancelar_job(job_id: str):
+    try:
+        if not _cola.cancelar(job_id):
+            raise HTTPException(status_code=409, detail="El trabajo ya empezó o terminó; no se puede cancelar")
+        return _job_out(_cola.obtener(job_id))
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Trabajo no encontrado o expirado: {job_id}")
@@ -1,18 +1,116 @@
 #!/usr/bin/env python3
 # -*- coding: utf-8 -*-
-import argparse, json, os
+import argparse, json, sys
 from src.uni_scheduler.scheduler import Scheduler
 from src.uni_scheduler.data_example import dataset_ejemplo
+from src.uni_scheduler.cache import ResultCache
+from src.uni_scheduler.metrics import Instrumentacion
+from src.uni_scheduler.models import minutes_to_hhmm
+from src.uni_scheduler.ingest import cargar_campus, cargar_horario, ErrorIngesta
+from src.uni_scheduler.scenarios import escenario_desde_dict
+from src.uni_scheduler.validation import validar
 
 def main():
     parser = argparse.ArgumentParser(description="Generador de horarios universitarios")
     parser.add_argument("--semester", default="Agosto-Diciembre", choices=["Abril-Agosto","Agosto-Diciembre"], help="Semestre a usar")
     parser.add_argument("--export", action="store_true", help="Exportar Excel y PDF de alertas")
+    parser.add_argument("--rooms", default=None, help="CSV/XLSX de salas (id, faculty, kind, capacity)")
+    parser.add_argument("--profs", default=None, help="CSV/XLSX de profesores, una fila por ventana (id, name, habilitado_desde_ciclo, disponible_labs, day, start, end)")
+    parser.add_argument("--courses", default=None, help="CSV/XLSX de cursos (code, name, faculty, cycle, inscritos_teorico, inscritos_lab, ...)")
+    parser.add_argument("--engine", default="python", choices=["python","numpy","csp"], help="Motor de búsqueda (numpy es opcional; csp = búsqueda exacta con --time-budget)")
+    parser.add_argument("--cache-dir", default=None, help="Directorio de caché de resultados (reutiliza builds idénticos entre ejecuciones)")
+    parser.add_argument("--multistart", type=int, default=0, help="Probar N variantes aleatorias y quedarse con la mejor (0 = build determinista)")
+    parser.add_argument("--workers", type=int, default=1, help="Procesos para --multistart, --by-faculty o --scenarios")
+    parser.add_argument("--by-faculty", action="store_true", help="Construir cada facultad en su propio proceso y conciliar los profesores compartidos")
+    parser.add_argument("--time-budget", type=float, default=None, help="Segundos máximos para --multistart o --engine csp (csp: 60 por defecto)")
+    parser.add_argument("--seed", type=int, default=0, help="Semilla de --multistart (mismo seed = mismo resultado)")
+    parser.add_argument("--optimize", type=int, default=0, help="Iteraciones de búsqueda local después del build (0 = no optimizar)")
+    parser.add_argument("--optimize-time", type=float, default=None, help="Segundos máximos para --optimize")
+    parser.add_argument("--save-snapshot", default=None, help="Guardar entradas y horario en un snapshot binario")
+    parser.add_argument("--load-snapshot", default=None, help="Cargar un snapshot en lugar de construir (ignora el dataset y --semester)")
+    parser.add_argument("--scenarios", default=None, help="JSON con una lista de escenarios (name, semester, add_rooms, remove_rooms, add_courses, remove_courses, availability, drop_days); imprime la comparación y termina")
+    parser.add_argument("--validate", default=None, help="Validar un horarios.xlsx (p. ej. editado a mano) contra las reglas y el dataset elegido; sale con 1 si hay errores")
+    parser.add_argument("--profile", action="store_true", help="Tiempos por fase, contadores y perfil cProfile de build()")
+    parser.add_argument("--profile-out", default=None, help="Guardar el perfil cProfile en este archivo (.prof)")
     args = parser.parse_args()
 
-    rooms, profs, courses, assistants = dataset_ejemplo()
-    s = Scheduler(args.semester, rooms, profs, courses, assistants)
-    s.build()
+    archivos = (args.rooms, args.profs, args.courses)
+    if args.load_snapshot and any(archivos):
+        parser.error("--load-snapshot no se combina con --rooms/--profs/--courses")
+    if any(archivos):
+        if not all(archivos):
+            parser.error("--rooms, --profs y --courses van juntos")
+        try:
+            rooms, profs, courses = cargar_campus(*archivos)
+        except ErrorIngesta as e:
+            print(f"Error: {e}", file=sys.stderr)
+            for err in e.errores:
+                print(f"  {err}", file=sys.stderr)
+            sys.exit(2)
+        assistants = []
+    elif not args.load_snapshot:
+        rooms, profs, courses, assistants = dataset_ejemplo()
+    if args.validate:
+        # validación sola: el dataset da cursos, salas y profesores; el xlsx, las asignaciones
+        if args.load_snapshot:
+            try:
+                s = Scheduler.load_snapshot(args.load_snapshot)
+            except (OSError, ValueError) as e:
+                print(f"Error: {e}", file=sys.stderr)
+                sys.exit(2)
+            semester, rooms, profs, courses = s.semester, s.rooms, list(s.professors.values()), s.courses
+        else:
+            semester = args.semester
+        try:
+            asignaciones = cargar_horario(args.validate, courses, profs)
+        except ErrorIngesta as e:
+            print(f"Error: {e}", file=sys.stderr)
+            for err in e.errores:
+                print(f"  {err}", file=sys.stderr)
+            sys.exit(2)
+        alertas = validar(semester, rooms, profs, courses, asignaciones)
+        errores = [a for a in alertas if a.nivel == "error"]
+        print(f"{len(asignaciones)} asignaciones, {len(errores)} errores, {len(alertas) - len(errores)} avisos")
+        for a in sorted(alertas, key=lambda a: (a.nivel != "error", a.codigo)):
+            print(f"[{a.nivel}] {a.codigo}: {a.mensaje}")
+        sys.exit(1 if errores else 0)
+    if args.scenarios:
+        # comparación de escenarios sobre el dataset elegido (usa --workers)
+        try:
+            with open(args.scenarios, encoding="utf-8") as f:
+                escenarios = [escenario_desde_dict(e) for e in json.load(f)]
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            parser.error(f"--scenarios inválido: {e!r}")
+        base = Scheduler.load_snapshot(args.load_snapshot, engine=args.engine, time_budget=args.time_budget) if args.load_snapshot else \
+            Scheduler(args.semester, rooms, profs, courses, assistants, engine=args.engine, time_budget=args.time_budget)
+        imprimir_escenarios(base.comparar_escenarios(escenarios, args.workers))
+        return
+    inst = None
+    if args.load_snapshot:
+        # el horario ya viene calculado: no se vuelve a construir
+        try:
+            s = Scheduler.load_snapshot(args.load_snapshot, engine=args.engine, time_budget=args.time_budget)
+        except (OSError, ValueError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(2)
+        courses = s.courses
+    else:
+        s = Scheduler(args.semester, rooms, profs, courses, assistants, engine=args.engine, time_budget=args.time_budget)
+        inst = Instrumentacion(perfil=True).instalar(s) if args.profile or args.profile_out else None
+        if args.multistart > 0:
+            score = s.build_multistart(args.multistart, args.workers, args.time_budget, args.seed)
+            print(f"Multi-start: mejor variante {score.pop('variante')} de {args.multistart} -> {score}")
+        elif args.by_faculty:
+            try:
+                res = s.build_por_facultad(args.workers)
+            except ValueError as e:
+                parser.error(str(e))
+            print(f"Por facultad: {res['facultades']} particiones, {res['recolocados']} cursos recolocados por profesores compartidos")
+        else:
+            s.build(cache=ResultCache(path=args.cache_dir) if args.cache_dir else None)
+    if args.optimize > 0:
+        res = s.optimizar(args.optimize, args.optimize_time, args.seed)
+        print(f"Búsqueda local: {res['iteraciones']} iteraciones, costo {res['costo_inicial']} -> {res['costo_final']} -> {s.puntaje()}")
 
     # Print resumen
     cursos_map = {c.code: c for c in courses}
@@ -20,11 +118,10 @@ def main():
     for fac in sorted({c.faculty for c in courses}):
         print(f"--- {fac} ---")
         asigns = [a for a in s.assignments if cursos_map[a.course_code].faculty == fac]
-        asigns_sorted = sorted(asigns, key=lambda x: (["Lunes","Martes","Miércoles","Jueves","Viernes"].index(x.slot.day), x.slot.start, x.course_code, x.group))
+        asigns_sorted = sorted(asigns, key=lambda x: (x.slot.dia, x.slot.start, x.course_code, x.group))
         for a in asigns_sorted:
             c = cursos_map[a.course_code]
             prof = "Asistente/No asignado" if a.professor_id is None else s.professors[a.professor_id].name
-            from src.uni_scheduler.models import minutes_to_hhmm
             print(f"{c.name:<28} | {a.group:<6} | {a.slot.day:<10} {minutes_to_hhmm(a.slot.start)}-{minutes_to_hhmm(a.slot.end)} | {a.room_id:<10} | {prof}")
     print("\n===== ALERTAS =====")
     if not s.alerts:
@@ -33,10 +130,36 @@ def main():
         for msg in s.alerts:
             print("- ", msg)
 
+    if args.save_snapshot:
+        s.save_snapshot(args.save_snapshot)
+        print(f"\nSnapshot guardado en {args.save_snapshot}")
+
     if args.export:
-        s.export_excel("horarios.xlsx")
-        s.export_pdf_alertas("alertas.pdf")
+        s.exportar("horarios.xlsx", "alertas.pdf")
         print("\nArchivos generados: horarios.xlsx, alertas.pdf")
 
+    if inst:
+        res = inst.resumen()
+        print("\n===== PERFIL =====")
+        for fase, seg in res["tiempos"].items():
+            print(f"{fase:<22} {seg * 1000:10.2f} ms")
+        for nombre, n in res["contadores"].items():
+            print(f"{nombre:<22} {n:10d}")
+        print(inst.perfil_texto())
+        if args.profile_out:
+            inst.perfil.dump_stats(args.profile_out)
+            print(f"Perfil guardado en {args.profile_out}")
+
+def imprimir_escenarios(filas):
+    print(f"{'Escenario':<28} {'Semestre':<17} {'Alertas':>8} {'Sin asignar':>12} {'Sin prof.':>10} {'Huecos':>7} {'Sobrec.':>8} {'Uso salas':>10} {'Uso labs':>9}")
+    for f in filas:
+        if "error" in f:
+            print(f"{f['escenario']:<28} ERROR: {f['error']}")
+            continue
+        d = f.get("delta", {})
+        col = lambda k: f"{f[k]}" + (f" ({d[k]:+d})" if d.get(k) else "")
+        print(f"{f['escenario']:<28} {f['semester']:<17} {col('alertas'):>8} {col('sin_asignar'):>12} {col('sin_profesor'):>10} {col('huecos'):>7} {col('sobrecarga'):>8}"
+              f" {f['utilizacion_salas']['total']:>9.1f}% {f['utilizacion_salas']['lab']:>8.1f}%")
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Benchmark de escalabilidad: tiempo por fase y memoria pico sobre campus sintéticos.
+#   python benchmarks/bench_scheduler.py --tiers small medium --save antes
+#   python benchmarks/bench_scheduler.py --tiers small medium --compare benchmarks/results/antes.json
+import argparse, json, os, platform, subprocess, sys, tempfile, time, tracemalloc
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from src.uni_scheduler.scheduler import Scheduler
+from src.uni_scheduler.synthetic import campus_sintetico
+
+TIERS = {"small": 200, "medium": 1000, "large": 3000, "xl": 10000}
+FASES = ["fase_labs", "fase_teoricos", "fase_validaciones", "export_excel", "export_pdf_alertas"]
+FASES_CSP = ["fase_csp", "fase_validaciones", "export_excel", "export_pdf_alertas"]
+RESULTADOS = os.path.join(RAIZ, "benchmarks", "results")
+
+def _fases(engine: str):
+    return FASES_CSP if engine == "csp" else FASES
+
+def _correr(dataset, semester: str, engine: str, tmp: str, medir, time_budget=None):
+    rooms, profs, courses, assistants = dataset
+    s = Scheduler(semester, rooms, profs, courses, assistants, engine=engine, time_budget=time_budget)
+    out = {}
+    for fase in _fases(engine):
+        fn = getattr(s, fase)
+        args = (os.path.join(tmp, "horarios.xlsx"),) if fase == "export_excel" else (os.path.join(tmp, "alertas.pdf"),) if fase == "export_pdf_alertas" else ()
+        out[fase] = medir(fn, *args)
+    return s, out
+
+def _tiempo(fn, *args):
+    t = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t
+
+def _memoria(fn, *args):
+    tracemalloc.reset_peak()
+    fn(*args)
+    return tracemalloc.get_traced_memory()[1] / 1e6
+
+def medir_tier(nombre: str, semester: str, engine: str, repeat: int, seed: int, time_budget=None) -> dict:
+    dataset = campus_sintetico(TIERS[nombre], seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        tiempos = []
+        for _ in range(repeat):
+            s, t = _correr(dataset, semester, engine, tmp, _tiempo, time_budget)
+            tiempos.append(t)
+        tracemalloc.start()
+        _, mem = _correr(dataset, semester, engine, tmp, _memoria, time_budget)
+        tracemalloc.stop()
+    seg = {f: min(t[f] for t in tiempos) for f in _fases(engine)}
+    return {
+        "cursos": len(dataset[2]), "salas": len(dataset[0]), "profesores": len(dataset[1]),
+        "asignaciones": len(s.assignments), "alertas": len(s.alerts), "puntaje": s.puntaje(),
+        "segundos": seg, "total": sum(seg.values()), "pico_mb": mem,
+    }
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True).stdout.strip() or "sin-git"
+    except OSError:
+        return "sin-git"
+
+def imprimir(res: dict, base: dict = None):
+    for tier, r in res["tiers"].items():
+        print(f"\n[{tier}] {r['cursos']} cursos, {r['salas']} salas, {r['profesores']} profesores -> {r['asignaciones']} asignaciones, {r['alertas']} alertas")
+        if "puntaje" in r:
+            print(f"  puntaje {r['puntaje']}")
+        b = (base or {}).get("tiers", {}).get(tier)
+        for f in list(r["segundos"]) + ["total"]:
+            v = r["total"] if f == "total" else r["segundos"][f]
+            linea = f"  {f:<20} {v:9.3f}s"
+            if b:
+                bv = b["total"] if f == "total" else b["segundos"].get(f)
+                if bv:
+                    linea += f"   base {bv:9.3f}s  x{v / bv:5.2f}"
+            mem = r["pico_mb"].get(f) if f != "total" else max(r["pico_mb"].values())
+            linea += f"   pico {mem:8.1f} MB"
+            if b and f != "total" and b["pico_mb"].get(f):
+                linea += f" (base {b['pico_mb'][f]:.1f})"
+            print(linea)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de escalabilidad del Scheduler")
+    parser.add_argument("--tiers", nargs="+", default=["small", "medium", "large"], choices=list(TIERS))
+    parser.add_argument("--semester", default="Agosto-Diciembre", choices=["Abril-Agosto", "Agosto-Diciembre"])
+    parser.add_argument("--engine", default="python", choices=["python", "numpy", "csp"])
+    parser.add_argument("--time-budget", type=float, default=None, help="Segundos para --engine csp (60 por defecto)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeticiones de tiempo (se toma el mínimo)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", default=None, help="Nombre del baseline (por defecto el commit actual)")
+    parser.add_argument("--compare", default=None, help="JSON de un baseline anterior para comparar")
+    args = parser.parse_args()
+
+    res = {
+        "meta": {"commit": _commit(), "fecha": datetime.now().isoformat(timespec="seconds"), "python": platform.python_version(),
+                 "engine": args.engine, "semester": args.semester, "seed": args.seed, "time_budget": args.time_budget},
+        "tiers": {t: medir_tier(t, args.semester, args.engine, args.repeat, args.seed, args.time_budget) for t in args.tiers},
+    }
+    base = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            base = json.load(f)
+    imprimir(res, base)
+    os.makedirs(RESULTADOS, exist_ok=True)
+    destino = os.path.join(RESULTADOS, f"{args.save or res['meta']['commit']}.json")
+    with open(destino, "w", encoding="utf-8") as f:
+        json.dump(res, f, indent=2, ensure_ascii=False)
+    print(f"\nBaseline guardado en {destino}")
+
+if __name__ == "__main__":
+    main()
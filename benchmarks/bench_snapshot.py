@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# Snapshot binario vs JSON: tamaño en disco, tiempo de guardado y de carga.
+#   python benchmarks/bench_snapshot.py --tiers small medium large
+import argparse, json, os, sys, tempfile, time
+from dataclasses import asdict
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+from src.uni_scheduler.scheduler import Scheduler
+from src.uni_scheduler.models import Room, Professor, Course, Slot, Assignment
+from src.uni_scheduler.snapshot import Snapshot
+from src.uni_scheduler.synthetic import campus_sintetico
+
+TIERS = {"small": 200, "medium": 1000, "large": 3000, "xl": 10000}
+
+# --- JSON de referencia (mismo contenido que el snapshot) ---
+def guardar_json(s: Scheduler, path: str):
+    datos = {
+        "semester": s.semester,
+        "rooms": [asdict(r) for r in s.rooms],
+        "professors": [asdict(p) for p in s.professors.values()],
+        "courses": [asdict(c) for c in s.courses],
+        "assistants": s.assistants_pool,
+        "assignments": [[a.course_code, a.group, a.slot.day, a.slot.start, a.slot.end, a.room_id, a.professor_id] for a in s.assignments],
+        "alerts": s.alerts,
+        "alert_keys": s.alert_keys,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(datos, f, ensure_ascii=False)
+
+def leer_json(path: str):
+    with open(path, encoding="utf-8") as f:
+        d = json.load(f)
+    rooms = [Room(**r) for r in d["rooms"]]
+    profs = [Professor(p["id"], p["name"], p["habilitado_desde_ciclo"], p["disponible_labs"],
+                       {dia: [tuple(v) for v in vs] for dia, vs in p["disponibilidad"].items()}) for p in d["professors"]]
+    courses = [Course(**c) for c in d["courses"]]
+    assignments = [Assignment(code, group, Slot(day, start, end), room, prof) for code, group, day, start, end, room, prof in d["assignments"]]
+    return (d["semester"], rooms, profs, courses, d["assistants"]), (assignments, d["alerts"], [tuple(k) for k in d["alert_keys"]])
+
+def leer_snapshot(path: str):
+    with Snapshot(path) as snap:
+        return snap.entradas(), snap.resultado()
+
+def _minimo(fn, *args, repeat: int):
+    mejor = float("inf")
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn(*args)
+        mejor = min(mejor, time.perf_counter() - t)
+    return mejor
+
+def medir_tier(nombre: str, semester: str, repeat: int, seed: int) -> dict:
+    s = Scheduler(semester, *campus_sintetico(TIERS[nombre], seed=seed))
+    s.build()
+    res = {"asignaciones": len(s.assignments), "alertas": len(s.alerts)}
+    with tempfile.TemporaryDirectory() as tmp:
+        rutas = {"json": os.path.join(tmp, "horario.json"), "snapshot": os.path.join(tmp, "horario.snap")}
+        formatos = {"json": (guardar_json, leer_json), "snapshot": (Scheduler.save_snapshot, leer_snapshot)}
+        for fmt, (guardar, leer) in formatos.items():
+            res[fmt] = {
+                "guardar_s": _minimo(guardar, s, rutas[fmt], repeat=repeat),
+                "bytes": os.path.getsize(rutas[fmt]),
+                "leer_s": _minimo(leer, rutas[fmt], repeat=repeat),
+            }
+        # carga completa: modelos + Scheduler con índices de ocupación restaurados
+        res["snapshot"]["load_snapshot_s"] = _minimo(Scheduler.load_snapshot, rutas["snapshot"], repeat=repeat)
+        assert leer_json(rutas["json"]) == leer_snapshot(rutas["snapshot"])
+    return res
+
+def main():
+    parser = argparse.ArgumentParser(description="Snapshot binario vs JSON")
+    parser.add_argument("--tiers", nargs="+", default=["small", "medium", "large"], choices=list(TIERS))
+    parser.add_argument("--semester", default="Agosto-Diciembre", choices=["Abril-Agosto", "Agosto-Diciembre"])
+    parser.add_argument("--repeat", type=int, default=5, help="Repeticiones (se toma el mínimo)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    for tier in args.tiers:
+        r = medir_tier(tier, args.semester, args.repeat, args.seed)
+        j, b = r["json"], r["snapshot"]
+        print(f"\n[{tier}] {TIERS[tier]} cursos -> {r['asignaciones']} asignaciones, {r['alertas']} alertas")
+        print(f"  {'':<10} {'tamaño':>12} {'guardar':>10} {'leer':>10}")
+        for fmt, v in (("json", j), ("snapshot", b)):
+            print(f"  {fmt:<10} {v['bytes'] / 1024:9.1f} KB {v['guardar_s'] * 1000:8.1f}ms {v['leer_s'] * 1000:8.1f}ms")
+        print(f"  snapshot/json: tamaño x{b['bytes'] / j['bytes']:.2f}, lectura x{b['leer_s'] / j['leer_s']:.2f}"
+              f"  (load_snapshot completo {b['load_snapshot_s'] * 1000:.1f}ms)")
+
+if __name__ == "__main__":
+    main()
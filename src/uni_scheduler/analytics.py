@@ -0,0 +1,152 @@
+from __future__ import annotations
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from .models import Room, Assignment, DAYS, START_MINUTES, END_MINUTES, SLOT, minutes_to_hhmm
+
+# Agregados del horario mantenidos por colocar/liberar (como los OccupancyIndex): minutos por
+# (profesor, día) y por (sala, día), salas ocupadas por (facultad, tipo, día, bloque) y la
+# distribución de carga semanal. Las consultas leen estos contadores: su costo depende del tamaño
+# de la respuesta (facultades × días × bloques, profesores por carga), no de las asignaciones.
+
+BLOQUES = (END_MINUTES - START_MINUTES) // SLOT
+TOPE_MINUTOS = 6 * 60
+
+def _bloques(a: Assignment) -> range:
+    # mismos bloques que occupancy (un slot desalineado ocupa el bloque completo), recortados a la jornada
+    ini = max(0, (a.slot.start - START_MINUTES) // SLOT)
+    fin = min(BLOQUES, -(-(a.slot.end - START_MINUTES) // SLOT))
+    return range(ini, fin)
+
+class Agregados:
+    def __init__(self, rooms: List[Room], prof_ids):
+        self.salas: Dict[str, Room] = {}
+        self.salas_por_grupo: Dict[Tuple[str, str], int] = defaultdict(int)     # (facultad, tipo) -> salas
+        self.sala_dia: Dict[Tuple[str, int], int] = defaultdict(int)            # (sala, día) -> minutos
+        self.sala_total: Dict[str, int] = {}                                    # sala -> minutos en la semana
+        self.salas_por_uso: Dict[int, Dict[str, None]] = defaultdict(dict)      # minutos -> salas (orden de llegada)
+        self.minutos_tipo: Dict[str, int] = defaultdict(int)                    # tipo de sala -> minutos
+        # (facultad, tipo) -> [día][bloque] salas ocupadas
+        self.mapa: Dict[Tuple[str, str], List[List[int]]] = {}
+        # profesor -> {día: minutos}; el día sale del dict al quedar en cero
+        self.prof_dia: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self.prof_total: Dict[str, int] = {}
+        self.carga: Dict[int, int] = defaultdict(int)                           # minutos semanales -> profesores
+        self.carga_dia: Dict[int, int] = defaultdict(int)                       # minutos en un día con clases -> (profesor, día)
+        self.sobrecarga = 0                                                     # pares (profesor, día) sobre 6 h
+        for r in rooms:
+            self.agregar_sala(r)
+        for pid in prof_ids:
+            self._prof(pid)
+
+    def agregar_sala(self, r: Room):
+        self.salas[r.id] = r
+        self.salas_por_grupo[(r.faculty, r.kind)] += 1
+        self.sala_total[r.id] = 0
+        self.salas_por_uso[0][r.id] = None
+        if (r.faculty, r.kind) not in self.mapa:
+            self.mapa[(r.faculty, r.kind)] = [[0] * BLOQUES for _ in DAYS]
+
+    def quitar_sala(self, room_id: str):
+        # la sala ya no debe tener asignaciones (retirar_sala libera antes de llamar)
+        r = self.salas.pop(room_id)
+        grupo = (r.faculty, r.kind)
+        self.salas_por_grupo[grupo] -= 1
+        if not self.salas_por_grupo[grupo]:
+            # sin salas del grupo: fuera del heatmap, como si no hubiera existido
+            del self.salas_por_grupo[grupo], self.mapa[grupo]
+        del self.salas_por_uso[self.sala_total.pop(room_id)][room_id]
+
+    def _prof(self, pid: str):
+        if pid not in self.prof_total:
+            self.prof_total[pid] = 0
+            self.carga[0] += 1
+
+    # --- actualización (colocar / liberar) ---
+    def ocupar(self, a: Assignment):
+        self._mover(a, a.slot.end - a.slot.start, 1)
+
+    def liberar(self, a: Assignment):
+        self._mover(a, a.slot.start - a.slot.end, -1)
+
+    def _mover(self, a: Assignment, minutos: int, signo: int):
+        d = a.slot.dia
+        r = self.salas.get(a.room_id)
+        if r is not None:
+            self.sala_dia[(r.id, d)] += minutos
+            antes = self.sala_total[r.id]
+            del self.salas_por_uso[antes][r.id]
+            self.sala_total[r.id] = antes + minutos
+            self.salas_por_uso[antes + minutos][r.id] = None
+            self.minutos_tipo[r.kind] += minutos
+            fila = self.mapa[(r.faculty, r.kind)][d]
+            for b in _bloques(a):
+                fila[b] += signo
+        pid = a.professor_id
+        if pid:
+            self._prof(pid)
+            dias = self.prof_dia[pid]
+            antes = dias.get(d, 0)
+            despues = antes + minutos
+            if antes:
+                self.carga_dia[antes] -= 1
+            if despues:
+                dias[d] = despues
+                self.carga_dia[despues] += 1
+            else:
+                del dias[d]
+            self.sobrecarga += (despues > TOPE_MINUTOS) - (antes > TOPE_MINUTOS)
+            total = self.prof_total[pid]
+            self.carga[total] -= 1
+            self.prof_total[pid] = total + minutos
+            self.carga[total + minutos] += 1
+
+    # --- consultas ---
+    def minutos_prof(self, pid: str, dia: int) -> int:
+        dias = self.prof_dia.get(pid)
+        return dias.get(dia, 0) if dias else 0
+
+    def heatmap(self, faculty: Optional[str] = None, kind: Optional[str] = None) -> Dict[str, object]:
+        # % de salas ocupadas por facultad, día y bloque de SLOT minutos
+        grupos = [k for k in self.mapa if (faculty is None or k[0] == faculty) and (kind is None or k[1] == kind)]
+        if faculty is not None and not grupos:
+            raise KeyError(faculty)
+        facultades: Dict[str, Dict[str, object]] = {}
+        for fac in sorted({f for f, _ in grupos}):
+            ks = [k for k in grupos if k[0] == fac]
+            n = sum(self.salas_por_grupo[k] for k in ks)
+            ocupacion = [[round(100.0 * sum(self.mapa[k][d][b] for k in ks) / n, 1) if n else 0.0 for b in range(BLOQUES)]
+                         for d in range(len(DAYS))]
+            facultades[fac] = {"salas": n, "ocupacion": ocupacion}
+        return {"dias": list(DAYS), "bloques": [minutes_to_hhmm(START_MINUTES + b * SLOT) for b in range(BLOQUES)],
+                "facultades": facultades}
+
+    def carga_profesores(self) -> Dict[str, object]:
+        # distribución de horas semanales (todos los profesores) y diarias (días con clases)
+        horas = lambda dist: {m / 60: n for m, n in sorted(dist.items()) if n}
+        n = len(self.prof_total)
+        total = sum(m * k for m, k in self.carga.items())
+        return {"profesores": n, "promedio_horas": round(total / 60 / n, 2) if n else 0.0,
+                "max_horas": max((m for m, k in self.carga.items() if k), default=0) / 60,
+                "sobrecarga": self.sobrecarga, "semanal": horas(self.carga), "diaria": horas(self.carga_dia)}
+
+    def salas_subutilizadas(self, umbral: float = 25.0) -> List[Dict[str, object]]:
+        # salas bajo umbral % de la jornada semanal, de menos a más usada
+        jornada = (END_MINUTES - START_MINUTES) * len(DAYS)
+        filas = []
+        for m in sorted(k for k, salas in self.salas_por_uso.items() if salas and 100.0 * k / jornada < umbral):
+            for rid in self.salas_por_uso[m]:
+                r = self.salas[rid]
+                filas.append({"sala": rid, "faculty": r.faculty, "kind": r.kind, "horas": m / 60,
+                              "utilizacion": round(100.0 * m / jornada, 1),
+                              "horas_por_dia": {DAYS[d]: self.sala_dia.get((rid, d), 0) / 60 for d in range(len(DAYS))}})
+        return filas
+
+    def utilizacion(self) -> Dict[str, float]:
+        # % de horas-sala ocupadas sobre la jornada (START_MINUTES..END_MINUTES, lunes a viernes)
+        jornada = (END_MINUTES - START_MINUTES) * len(DAYS)
+        salas = {"teorico": 0, "lab": 0}
+        for (_, kind), n in self.salas_por_grupo.items():
+            salas[kind] = salas.get(kind, 0) + n
+        pct = lambda m, n: round(100.0 * m / (n * jornada), 1) if n else 0.0
+        return {"total": pct(sum(self.minutos_tipo.values()), len(self.salas)),
+                **{k: pct(self.minutos_tipo.get(k, 0), salas[k]) for k in ("teorico", "lab")}}
@@ -0,0 +1,87 @@
+from __future__ import annotations
+import hashlib, json, os, threading
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import List, Optional, Tuple
+from .models import Slot, Assignment
+
+# Caché de resultados de build() direccionada por contenido: la clave es el sha256 del
+# JSON canónico de las entradas. El orden de las listas se respeta (cambia el resultado).
+
+Resultado = Tuple[List[Assignment], List[str], List[Tuple[str, str]]]
+
+def clave_entradas(semester: str, rooms, profs, courses, assistants) -> str:
+    datos = {
+        "semester": semester,
+        "rooms": [asdict(r) for r in rooms],
+        "professors": [asdict(p) for p in profs],
+        "courses": [asdict(c) for c in courses],
+        "assistants": list(assistants),
+    }
+    canon = json.dumps(datos, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canon.encode("utf-8")).hexdigest()
+
+def _serializar(assignments: List[Assignment], alerts: List[str], alert_keys: List[Tuple[str, str]]) -> bytes:
+    filas = [[a.course_code, a.group, a.slot.day, a.slot.start, a.slot.end, a.room_id, a.professor_id] for a in assignments]
+    return json.dumps({"assignments": filas, "alerts": alerts, "alert_keys": alert_keys}, ensure_ascii=False).encode("utf-8")
+
+def _deserializar(raw: bytes) -> Resultado:
+    datos = json.loads(raw)
+    assignments = [Assignment(code, group, Slot(day, start, end), room, prof) for code, group, day, start, end, room, prof in datos["assignments"]]
+    return assignments, datos["alerts"], [tuple(k) for k in datos["alert_keys"]]
+
+class ResultCache:
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, path: Optional[str] = None):
+        self.max_bytes = max_bytes  # cota de memoria sobre los resultados serializados
+        self.path = path            # directorio opcional para persistir entre reinicios
+        self._datos: "OrderedDict[str, bytes]" = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        if path:
+            os.makedirs(path, exist_ok=True)
+
+    def _archivo(self, clave: str) -> str:
+        return os.path.join(self.path, f"{clave}.json")
+
+    def _guardar_memoria(self, clave: str, raw: bytes):
+        if clave in self._datos:
+            self.bytes -= len(self._datos.pop(clave))
+        if len(raw) > self.max_bytes:
+            return
+        self._datos[clave] = raw
+        self.bytes += len(raw)
+        while self.bytes > self.max_bytes:
+            _, viejo = self._datos.popitem(last=False)
+            self.bytes -= len(viejo)
+
+    def get(self, clave: str) -> Optional[Resultado]:
+        with self._lock:
+            raw = self._datos.get(clave)
+            if raw is not None:
+                self._datos.move_to_end(clave)
+            elif self.path and os.path.exists(self._archivo(clave)):
+                with open(self._archivo(clave), "rb") as f:
+                    raw = f.read()
+                self._guardar_memoria(clave, raw)
+            if raw is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        # objetos nuevos en cada hit: nadie comparte Assignments mutables
+        return _deserializar(raw)
+
+    def put(self, clave: str, assignments: List[Assignment], alerts: List[str], alert_keys: List[Tuple[str, str]]):
+        raw = _serializar(assignments, alerts, alert_keys)
+        with self._lock:
+            self._guardar_memoria(clave, raw)
+            if self.path:
+                tmp = f"{self._archivo(clave)}.{os.getpid()}.tmp"
+                with open(tmp, "wb") as f:
+                    f.write(raw)
+                os.replace(tmp, self._archivo(clave))
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._datos), "bytes": self.bytes, "max_bytes": self.max_bytes}
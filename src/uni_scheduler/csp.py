@@ -0,0 +1,394 @@
+from __future__ import annotations
+import math, time
+from bisect import insort
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+from .models import Course, Professor, Room, Slot, Assignment
+from .utils import generar_candidatos
+
+# Motor exacto (engine="csp"): cada grupo es una variable con dominio {(slot, sala)}.
+# Branch & bound en profundidad con:
+#   - MRV: siempre se elige el grupo con menos pares (slot, sala) soportados;
+#   - forward checking: al colocar se descuentan los pares que dejan de ser válidos en los
+#     grupos que comparten la sala o el profesor (conteos por clase y por grupo, sin recorrer
+#     el dominio completo);
+#   - cota: grupos cuya clase ya no tiene pares libres quedan forzosamente sin asignar;
+#   - pasadas de discrepancia limitada guiadas por la mejor solución conocida, para que con
+#     poco tiempo se revisen decisiones de todo el árbol y no solo las últimas.
+# Las restricciones duras son sala, profesor (disponibilidad, choque y tope 6 h/día) y
+# semestre. Un grupo puede quedar sin profesor o sin asignar, pero eso cuesta:
+# se minimiza (grupos sin asignar, grupos sin su profesor) en orden lexicográfico.
+# Con time_budget devuelve la mejor solución encontrada (o la parcial si no hubo ninguna);
+# si se pasa una incumbente (p. ej. el resultado greedy) solo se reemplaza por una mejor.
+# Como el greedy, prefiere Teo-B 30 min después de Teo-A el mismo día: es el primer valor que
+# se prueba cuando la otra sección ya está colocada (orden de valores, no restricción).
+# resolver_por_bloques corre una búsqueda por facultad (o por grupo de ciclos si es grande).
+
+class _Clase:
+    # grupos con la misma facultad, tipo de sala, capacidad requerida y duración comparten
+    # candidatos y salas: el conteo de salas libres por slot se guarda una sola vez
+    __slots__ = ("slots", "pos", "rooms", "por_dia", "cnt", "tot", "vars", "pend")
+
+    def __init__(self, slots: List[Slot], rooms: List[Room]):
+        self.slots = slots
+        self.pos = {s: i for i, s in enumerate(slots)}
+        self.rooms = rooms
+        self.por_dia: Dict[str, List[int]] = defaultdict(list)
+        for i, s in enumerate(slots):
+            self.por_dia[s.day].append(i)
+        self.cnt = [0] * len(slots)
+        self.tot = 0
+        self.vars: List["_Var"] = []
+        self.pend = 0
+
+class _Var:
+    __slots__ = ("i", "course", "group", "clase", "prof", "dur", "disp", "okp", "par")
+
+class BusquedaCSP:
+    def __init__(self, sched, time_budget: Optional[float] = None, cursos: Optional[List[Course]] = None):
+        # cursos: subconjunto a resolver (None = todos); lo ya colocado en sched queda fijo
+        self.s = sched
+        self.cursos = sched.courses if cursos is None else cursos
+        self.time_budget = time_budget
+        self._inicio = time.monotonic()  # el presupuesto incluye armar el modelo
+        self.clases: Dict[Tuple[str, str, int, int], _Clase] = {}
+        self.vars: List[_Var] = []
+        self.por_sala: Dict[str, List[_Clase]] = defaultdict(list)
+        self.por_prof: Dict[str, List[_Var]] = defaultdict(list)
+        self.dom: List[int] = []
+        self.costo = [0, 0]
+        self.nodos = 0
+        self.completa = False   # árbol recorrido entero: la solución es óptima
+        self.agotado = False    # se cortó por tiempo
+        self.parcial = False    # se cortó antes de la primera solución completa
+        self.costo_final: Tuple[float, float] = (math.inf, math.inf)
+        self.salas = {r.id: r for r in sched.rooms}
+        self.actual: Dict[int, Assignment] = {}  # asignación vigente de cada variable en la rama
+        self._crear_variables()
+        self._inicializar()
+
+    # --- modelo ---
+    def _crear_variables(self):
+        s = self.s
+        permitidos = [c for c in self.cursos if s.ciclo_permitido(c.cycle)]
+        labs = [c for c in permitidos if c.inscritos_lab > 0]
+        labs.sort(key=lambda c: -math.ceil(c.inscritos_lab / 15))
+        for c in labs:
+            prof = s.professors.get(c.profesor_id) if c.profesor_id else None
+            if prof and not prof.disponible_labs:
+                prof = None  # asistente
+            for g in range(1, math.ceil(c.inscritos_lab / 15) + 1):
+                self._var(c, f"Lab-{g}", "lab", 15, c.duracion_lab_horas, prof)
+        for c in permitidos:
+            if c.inscritos_teorico <= 0:
+                continue
+            prof = s.professors.get(c.profesor_id) if c.profesor_id else None
+            if prof and prof.habilitado_desde_ciclo > c.cycle:
+                s._alerta(("curso", c.code), f"Profesor no habilitado: {prof.name} desde {prof.habilitado_desde_ciclo}+ para {c.name} (ciclo {c.cycle})")
+                prof = None
+            if c.inscritos_teorico > 60:
+                a = self._var(c, "Teo-A", "teorico", 60, c.duracion_teorico_horas, prof)
+                b = self._var(c, "Teo-B", "teorico", min(60, c.inscritos_teorico - 60), c.duracion_teorico_horas, prof)
+                a.par, b.par = b, a
+            else:
+                self._var(c, "Teo-A", "teorico", min(60, c.inscritos_teorico), c.duracion_teorico_horas, prof)
+
+    def _var(self, course: Course, group: str, kind: str, cap: int, dur_h: int, prof: Optional[Professor]):
+        key = (course.faculty, kind, cap, dur_h)
+        cl = self.clases.get(key)
+        if cl is None:
+            cl = _Clase(generar_candidatos(dur_h), self.s.salas_candidatas(course.faculty, kind, cap))
+            self.clases[key] = cl
+            for r in cl.rooms:
+                self.por_sala[r.id].append(cl)
+        v = _Var()
+        v.i = len(self.vars)
+        v.course, v.group, v.clase, v.dur = course, group, cl, float(dur_h)
+        v.prof = prof.id if prof else None
+        v.disp = [self.s.disponible_prof(prof.id, sl) for sl in cl.slots] if prof else None
+        v.okp = None
+        v.par = None
+        cl.vars.append(v)
+        cl.pend += 1
+        if prof:
+            self.por_prof[prof.id].append(v)
+        self.vars.append(v)
+        return v
+
+    def _inicializar(self):
+        for cl in self.clases.values():
+            for i, sl in enumerate(cl.slots):
+                cl.cnt[i] = sum(1 for r in cl.rooms if self.s.libre_room(r.id, sl))
+            cl.tot = sum(cl.cnt)
+        self.dom = [0] * len(self.vars)
+        for v in self.vars:
+            if v.prof is None:
+                self.dom[v.i] = v.clase.tot
+                continue
+            v.okp = [False] * len(v.clase.slots)
+            self.dom[v.i] = 0
+        for pid, vs in self.por_prof.items():
+            for day in {d for v in vs for d in v.clase.por_dia}:
+                self._actualizar_prof(pid, day)
+
+    # --- propagación ---
+    def _actualizar_sala(self, room_id: str, slot: Slot, delta: int):
+        # delta=-1 antes de ocupar, +1 después de liberar: solo cuentan los slots que cambian de estado
+        for cl in self.por_sala[room_id]:
+            for i in cl.por_dia[slot.day]:
+                sl = cl.slots[i]
+                if sl.start < slot.end and slot.start < sl.end and self.s.libre_room(room_id, sl):
+                    cl.cnt[i] += delta
+                    cl.tot += delta
+                    for u in cl.vars:
+                        if u.prof is None or u.okp[i]:
+                            self.dom[u.i] += delta
+
+    def _actualizar_prof(self, pid: str, day: str):
+        horas = self.s.horas_prof_en_dia(pid, day)
+        for u in self.por_prof[pid]:
+            cl = u.clase
+            tope = horas + u.dur <= 6
+            for i in cl.por_dia.get(day, ()):
+                ok = tope and u.disp[i] and self.s.libre_prof(pid, cl.slots[i])
+                if ok != u.okp[i]:
+                    u.okp[i] = ok
+                    self.dom[u.i] += cl.cnt[i] if ok else -cl.cnt[i]
+
+    def _forzados(self) -> int:
+        return sum(cl.pend for cl in self.clases.values() if cl.tot == 0)
+
+    # --- valores ---
+    def _consecutivo(self, v: _Var) -> int:
+        # índice del slot pegado a la otra sección teórica (30 min después de Teo-A o antes de
+        # Teo-B, como buscar_doble), o -1 si no está colocada o el slot no es candidato
+        otra = self.actual.get(v.par.i) if v.par is not None else None
+        if otra is None:
+            return -1
+        dur = otra.slot.end - otra.slot.start
+        o = otra.slot
+        slot = Slot(o.dia, o.end + 30, o.end + 30 + dur) if v.group == "Teo-B" else Slot(o.dia, o.start - 30 - dur, o.start - 30)
+        return v.clase.pos.get(slot, -1)
+
+    def _valores(self, v: _Var, guia: Optional[tuple]):
+        # primero el valor de la mejor solución conocida (búsqueda guiada), luego el slot pegado
+        # a la otra sección teórica, luego con su profesor, luego sin profesor (penalizado) y al
+        # final sin asignar
+        cl = v.clase
+        libre_room = self.s.libre_room
+        if guia is not None:
+            slot, room_id, pid = guia
+            i = cl.pos[slot]
+            if cl.cnt[i] and libre_room(room_id, slot) and (pid is None or v.okp[i]):
+                yield (i, self.salas[room_id], pid)
+        j = self._consecutivo(v)
+        if j >= 0 and cl.cnt[j]:
+            for pid in ((v.prof, None) if v.prof and v.okp[j] else (None,)):
+                for r in cl.rooms:
+                    if libre_room(r.id, cl.slots[j]):
+                        yield (j, r, pid)
+        if v.prof:
+            for i, sl in enumerate(cl.slots):
+                if i != j and cl.cnt[i] and v.okp[i]:
+                    for r in cl.rooms:
+                        if libre_room(r.id, sl):
+                            yield (i, r, v.prof)
+        for i, sl in enumerate(cl.slots):
+            if i != j and cl.cnt[i]:
+                for r in cl.rooms:
+                    if libre_room(r.id, sl):
+                        yield (i, r, None)
+        yield None
+
+    def _aplicar(self, v: _Var, val) -> Optional[Assignment]:
+        if val is None:
+            self.costo[0] += 1
+            return None
+        i, room, pid = val
+        slot = v.clase.slots[i]
+        self._actualizar_sala(room.id, slot, -1)
+        asg = self.s.colocar(v.course, v.group, slot, room, pid)
+        self.actual[v.i] = asg
+        if pid:
+            self._actualizar_prof(pid, slot.day)
+        elif v.prof:
+            self.costo[1] += 1
+        return asg
+
+    def _deshacer(self, v: _Var, asg: Optional[Assignment]):
+        if asg is None:
+            self.costo[0] -= 1
+            return
+        self.s.liberar(asg)
+        self.s.assignments.pop()  # LIFO: siempre es la última colocada
+        del self.actual[v.i]
+        self._actualizar_sala(asg.room_id, asg.slot, +1)
+        if asg.professor_id:
+            self._actualizar_prof(asg.professor_id, asg.slot.day)
+        elif v.prof:
+            self.costo[1] -= 1
+
+    # --- búsqueda ---
+    def incumbente(self, assignments: List[Assignment]) -> Tuple[Dict[int, tuple], Tuple[int, int]]:
+        # traduce un horario ya construido (mismos grupos) a solución + costo
+        por_grupo = {(v.course.code, v.group): v for v in self.vars}
+        sol: Dict[int, tuple] = {}
+        sin_prof = 0
+        for a in assignments:
+            v = por_grupo.get((a.course_code, a.group))
+            if v is None:
+                continue
+            sol[v.i] = (a.slot, a.room_id, a.professor_id)
+            if v.prof and a.professor_id is None:
+                sin_prof += 1
+        return sol, (len(self.vars) - len(sol), sin_prof)
+
+    def resolver(self, incumbente: Optional[Tuple[Dict[int, tuple], Tuple[int, int]]] = None):
+        # búsqueda de discrepancia limitada: la pasada k recorre las ramas que se apartan a lo
+        # sumo k veces del primer valor; si ninguna rama quedó recortada, el árbol está completo
+        self._limite = self._inicio + self.time_budget if self.time_budget else None
+        self._mejor: Optional[Dict[int, tuple]] = None
+        self._mejor_costo = (math.inf, math.inf)
+        if incumbente is not None:
+            self._mejor, self._mejor_costo = incumbente
+        k = 0
+        while not self._pasada(k):
+            if self.agotado:
+                break
+            k += 1
+        self.costo_final = self._mejor_costo
+        return self._mejor
+
+    def _pasada(self, k: int) -> bool:
+        pend = list(range(len(self.vars)))  # orden de prioridad: desempate del MRV
+        dom = self.dom
+        frames: List[list] = []             # [var, generador, valor, asignación, índice del valor]
+        disc = 0
+        recortado = False
+        nuevo = True
+        while True:
+            if nuevo:
+                nuevo = False
+                self.nodos += 1
+                if (self.costo[0] + self._forzados(), self.costo[1]) >= self._mejor_costo:
+                    pass  # poda
+                elif not pend:
+                    self._mejor_costo = (self.costo[0], self.costo[1])
+                    self._mejor = self._foto(frames)
+                else:
+                    vi = min(pend, key=dom.__getitem__)
+                    pend.remove(vi)
+                    v = self.vars[vi]
+                    v.clase.pend -= 1
+                    frames.append([v, self._valores(v, self._mejor.get(vi) if self._mejor else None), None, None, -1])
+            if not frames:
+                self.completa = not recortado
+                return self.completa
+            if self._limite and time.monotonic() > self._limite:
+                self.agotado = True
+                break
+            f = frames[-1]
+            if f[2] is not None:
+                self._deshacer(f[0], f[3])
+                f[2] = f[3] = None
+            if f[4] == 0:
+                if disc == k:
+                    val = StopIteration  # apartarse del primer valor excede la pasada
+                    recortado = True
+                else:
+                    disc += 1
+                    val = next(f[1], StopIteration)
+            else:
+                val = next(f[1], StopIteration)
+            if val is StopIteration:
+                frames.pop()
+                if f[4] > 0:
+                    disc -= 1
+                insort(pend, f[0].i)
+                f[0].clase.pend += 1
+                continue
+            f[4] += 1
+            f[2] = val if val is not None else False
+            f[3] = self._aplicar(f[0], val)
+            nuevo = True
+        if self._mejor is None:
+            self._mejor = self._foto(frames)  # parcial: lo colocado hasta el corte
+            self.parcial = True
+        for f in reversed(frames):
+            if f[2] is not None:
+                self._deshacer(f[0], f[3])
+        return False
+
+    def _foto(self, frames) -> Dict[int, tuple]:
+        return {f[0].i: (f[3].slot, f[3].room_id, f[3].professor_id) for f in frames if f[3] is not None}
+
+    def aplicar(self, solucion: Dict[int, tuple]):
+        for v in self.vars:
+            val = solucion.get(v.i)
+            if val is not None:
+                slot, room_id, pid = val
+                self.s.colocar(v.course, v.group, slot, self.salas[room_id], pid)
+            elif v.group.startswith("Lab-"):
+                self.s._alerta(("curso", v.course.code), f"Laboratorio no asignado: {v.course.name} requiere grupo {v.group} y no hay slot disponible")
+            else:
+                self.s._alerta(("curso", v.course.code), f"Teórico no asignado: {v.course.name} {v.group}")
+        if self.parcial:
+            self.s._alerta(("motor", "csp"), f"Búsqueda CSP detenida por tiempo antes de una solución completa: {len(self.vars) - len(solucion)} grupos sin colocar")
+
+BLOQUE_MAX = 150  # cursos por subproblema; más grande, el árbol no alcanza a revisar nada en el presupuesto
+
+def bloques(courses: List[Course]) -> List[List[Course]]:
+    # una facultad por bloque; las que pasan de BLOQUE_MAX cursos se cortan en ciclos consecutivos
+    por_fac: Dict[str, Dict[int, List[Course]]] = defaultdict(lambda: defaultdict(list))
+    for c in courses:
+        por_fac[c.faculty][c.cycle].append(c)
+    res: List[List[Course]] = []
+    for fac in sorted(por_fac):
+        ciclos = por_fac[fac]
+        if sum(len(cs) for cs in ciclos.values()) <= BLOQUE_MAX:
+            res.append([c for cyc in sorted(ciclos) for c in ciclos[cyc]])
+            continue
+        actual: List[Course] = []
+        for cyc in sorted(ciclos):
+            if actual and len(actual) + len(ciclos[cyc]) > BLOQUE_MAX:
+                res.append(actual)
+                actual = []
+            actual = actual + ciclos[cyc]
+        if actual:
+            res.append(actual)
+    return res
+
+def resolver_por_bloques(sched, time_budget: float) -> Dict[str, object]:
+    # Las salas no cruzan facultades: se resuelve un bloque (facultad, o ciclos consecutivos de
+    # una facultad grande) por vez, cada uno con su propio árbol (las discrepancias no se
+    # reparten entre todo el campus) y una parte del tiempo que queda proporcional a sus cursos.
+    # Lo colocado fuera del bloque queda fijo en sched, así que las salas de la facultad y los
+    # profesores compartidos se respetan a través de libre_room, libre_prof y del tope diario.
+    # El greedy (sobre una copia) da la incumbente de cada bloque: nunca se devuelve algo peor.
+    from .scheduler import Scheduler
+    limite = time.monotonic() + time_budget
+    semilla = Scheduler(sched.semester, sched.rooms, list(sched.professors.values()), sched.courses, sched.assistants_pool, seed=sched.seed)
+    semilla.fase_labs()
+    semilla.fase_teoricos()
+    salas = {r.id: r for r in sched.rooms}
+    for a in semilla.assignments:
+        sched.colocar(sched.cursos_por_codigo[a.course_code], a.group, a.slot, salas[a.room_id], a.professor_id)
+    partes = bloques(sched.courses)
+    restantes = len(sched.courses)
+    stats = {"bloques": len(partes), "bloques_completos": 0, "nodos": 0, "optimo": False, "parcial": False}
+    for cursos in partes:
+        codigos = {c.code for c in cursos}
+        previas = [a for a in sched.assignments if a.course_code in codigos]
+        for a in previas:
+            sched.liberar(a)
+        sched.assignments = [a for a in sched.assignments if a.course_code not in codigos]
+        parte = max(limite - time.monotonic(), 0.0) * len(cursos) / restantes
+        restantes -= len(cursos)
+        busqueda = BusquedaCSP(sched, parte, cursos)
+        busqueda.aplicar(busqueda.resolver(busqueda.incumbente(previas)))
+        stats["nodos"] += busqueda.nodos
+        stats["bloques_completos"] += busqueda.completa
+        stats["parcial"] = stats["parcial"] or busqueda.parcial
+    # un bloque completo es óptimo con el resto fijo; el horario lo es solo si hubo un único bloque
+    stats["optimo"] = len(partes) == 1 and stats["bloques_completos"] == 1
+    return stats
@@ -0,0 +1,192 @@
+from __future__ import annotations
+import queue, threading, time
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Callable, Dict, Iterator, List
+from .models import Assignment, DAYS, START_MINUTES, END_MINUTES, SLOT, minutes_to_hhmm
+
+# Exportación en streaming: openpyxl write-only alimentado por generadores y PDF por páginas.
+# `destino` puede ser una ruta o cualquier objeto con write() (BytesIO, un _Tubo hacia HTTP).
+# openpyxl write-only vuelca cada hoja a un archivo temporal propio hasta save(); la memoria
+# queda acotada, pero el Excel sí pasa por disco (el PDF no).
+
+SIN_PROF = "Asistente/No asignado"
+CABECERA = ["Curso", "Grupo", "Día", "Inicio", "Fin", "Sala", "Profesor"]
+BLOQUES = (END_MINUTES - START_MINUTES) // SLOT
+LINEAS_POR_PAGINA = 52
+
+def _orden(a: Assignment) -> int:
+    # clave entera precalculada: minutos desde el lunes 00:00
+    return a.slot.dia * 1440 + a.slot.start
+
+def _filas_listado(sched, asigns: List[Assignment]) -> Iterator[list]:
+    cursos = sched.cursos_por_codigo
+    profs = sched.professors
+    yield CABECERA
+    for a in sorted(asigns, key=lambda a: (_orden(a), a.course_code, a.group)):
+        yield [cursos[a.course_code].name, a.group, a.slot.day, minutes_to_hhmm(a.slot.start), minutes_to_hhmm(a.slot.end),
+               a.room_id, profs[a.professor_id].name if a.professor_id else SIN_PROF]
+
+def _filas_grilla(titulos: Dict[str, str], por_recurso: Dict[str, List[Assignment]], etiqueta: Callable[[Assignment], str]) -> Iterator[list]:
+    # una grilla (bloques de SLOT minutos × días) por recurso, una debajo de otra, recortada
+    # entre el primer y el último bloque ocupado; cada clase se escribe en su bloque de inicio
+    # con el rango horario (menos celdas que repetir la etiqueta en todos sus bloques)
+    horas = [minutes_to_hhmm(START_MINUTES + b * SLOT) for b in range(BLOQUES)]
+    for rid in sorted(por_recurso):
+        celdas: Dict[int, str] = {}
+        desde, hasta = BLOQUES, 0
+        for a in por_recurso[rid]:
+            d = a.slot.dia
+            b0 = max(0, (a.slot.start - START_MINUTES) // SLOT)
+            b1 = min(BLOQUES, -(-(a.slot.end - START_MINUTES) // SLOT))
+            desde, hasta = min(desde, b0), max(hasta, b1)
+            celdas[b0 * len(DAYS) + d] = f"{etiqueta(a)} ({minutes_to_hhmm(a.slot.start)}-{minutes_to_hhmm(a.slot.end)})"
+        yield [titulos.get(rid, rid)]
+        yield ["Hora"] + DAYS
+        for b in range(desde, hasta):
+            base = b * len(DAYS)
+            yield [horas[b]] + [celdas.get(base + d) for d in range(len(DAYS))]
+        yield []
+
+def escribir_excel(sched, destino):
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    cursos = sched.cursos_por_codigo
+    por_fac_ciclo: Dict[tuple, List[Assignment]] = defaultdict(list)
+    for a in sched.assignments:
+        c = cursos[a.course_code]
+        por_fac_ciclo[(c.faculty, c.cycle)].append(a)
+    for (fac, cyc), asigns in por_fac_ciclo.items():
+        ws = wb.create_sheet(f"{fac}-C{cyc}"[:31])
+        for fila in _filas_listado(sched, asigns):
+            ws.append(fila)
+
+    por_sala = {rid: asigns for rid, asigns in sched.room_occupancy.items() if asigns}
+    salas = {r.id: f"Sala {r.id} ({r.faculty}, {r.kind}, cap. {r.capacity})" for r in sched.rooms}
+    ws = wb.create_sheet("Salas")
+    for fila in _filas_grilla(salas, por_sala, lambda a: f"{cursos[a.course_code].name} {a.group}"):
+        ws.append(fila)
+
+    por_prof = {pid: asigns for pid, asigns in sched.prof_occupancy.items() if asigns}
+    profs = {p.id: f"{p.name} ({p.id})" for p in sched.professors.values()}
+    ws = wb.create_sheet("Profesores")
+    for fila in _filas_grilla(profs, por_prof, lambda a: f"{cursos[a.course_code].name} {a.group} · {a.room_id}"):
+        ws.append(fila)
+
+    ws = wb.create_sheet("Alertas")
+    ws.append(["Mensaje"])
+    for msg in sched.alerts:
+        ws.append([msg])
+    wb.save(destino)
+
+def escribir_pdf_alertas(sched, destino):
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+    c = canvas.Canvas(destino, pagesize=A4)
+    width, height = A4
+    x = 40
+    c.setFont("Helvetica-Bold", 14)
+    c.drawString(x, height - 50, "Alertas de Horarios")
+    lineas = [f"• {msg}" for msg in sched.alerts] or ["No se registraron alertas."]
+    # un objeto de texto por página en lugar de un drawString por línea
+    y, i, primera = height - 70, 0, True
+    while i < len(lineas):
+        n = LINEAS_POR_PAGINA - 1 if primera else LINEAS_POR_PAGINA
+        t = c.beginText(x, y)
+        t.setFont("Helvetica", 10)
+        t.setLeading(14)
+        t.textLines(lineas[i:i + n])
+        c.drawText(t)
+        i += n
+        if i < len(lineas):
+            c.showPage()
+        y, primera = height - 50, False
+    c.save()
+
+# --- descarga HTTP sin escribir el archivo final en disco ---
+class _Tubo:
+    # objeto de archivo de solo escritura y no posicionable: lo que se escribe sale en trozos
+    # por un iterador (con contrapresión acotada por max_trozos)
+    TROZO = 64 * 1024
+    ESPERA_MAX = 120.0  # segundos con la cola llena sin que nadie lea: el cliente se fue
+
+    def __init__(self, max_trozos: int = 16):
+        self._cola: "queue.Queue[object]" = queue.Queue(max_trozos)
+        self._buf = bytearray()
+        self.cancelado = False
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, datos) -> int:
+        if self.cancelado:
+            # el cliente se fue: se descarta el resto (con write-only casi todo el trabajo ya se
+            # hizo en append; cortar a mitad de save() deja al escritor en un estado sucio)
+            return len(datos)
+        self._buf += datos
+        if len(self._buf) >= self.TROZO:
+            self._enviar(bytes(self._buf))
+            self._buf.clear()
+        return len(datos)
+
+    def flush(self):
+        pass
+
+    def _enviar(self, item):
+        # si el cliente corta antes del primer trozo, trozos() nunca corre su finally: el plazo
+        # evita que el hilo productor quede bloqueado para siempre
+        limite = time.monotonic() + self.ESPERA_MAX
+        while not self.cancelado:
+            try:
+                self._cola.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if time.monotonic() >= limite:
+                    self.cancelado = True
+
+    def cerrar(self, error: BaseException = None):
+        if self._buf:
+            self._enviar(bytes(self._buf))
+            self._buf.clear()
+        self._enviar(error)
+
+    def trozos(self) -> Iterator[bytes]:
+        try:
+            while True:
+                item = self._cola.get()
+                if item is None:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                yield item
+        finally:
+            self.cancelado = True  # el cliente cortó: el productor deja de escribir
+
+def copia(sched) -> SimpleNamespace:
+    # lo que leen escribir_excel y escribir_pdf_alertas, en listas y dicts propios; los modelos se
+    # comparten (de ellos solo se leen ids, nombres y capacidades, que los cambios no tocan)
+    return SimpleNamespace(
+        assignments=list(sched.assignments), alerts=list(sched.alerts), rooms=list(sched.rooms),
+        cursos_por_codigo=dict(sched.cursos_por_codigo), professors=dict(sched.professors),
+        room_occupancy={k: list(v) for k, v in sched.room_occupancy.items() if v},
+        prof_occupancy={k: list(v) for k, v in sched.prof_occupancy.items() if v})
+
+def transmitir(escribir: Callable, sched, lock=None) -> Iterator[bytes]:
+    # escribir(sched, destino) corre en un hilo; el iterador entrega los bytes a medida que salen.
+    # Con lock, solo se toma para copiar el horario: una descarga lenta no frena los cambios
+    if lock is not None:
+        with lock:
+            sched = copia(sched)
+    tubo = _Tubo()
+
+    def productor():
+        try:
+            escribir(sched, tubo)
+        except BaseException as e:
+            if not tubo.cancelado:
+                tubo.cerrar(e)
+            return
+        tubo.cerrar()
+
+    threading.Thread(target=productor, daemon=True).start()
+    return tubo.trozos()
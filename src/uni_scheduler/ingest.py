@@ -0,0 +1,378 @@
+from __future__ import annotations
+import csv, datetime, io, os, zipfile
+from dataclasses import dataclass
+from itertools import islice
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+from .models import Room, Professor, Course, Slot, Assignment, DAYS, hhmm_to_minutes
+from .utils import compilar_disponibilidad
+
+# Ingesta masiva desde CSV o XLSX (openpyxl read-only). Las filas se leen en streaming, se
+# validan por lotes y se construyen los modelos directamente; los errores se acumulan por
+# fila y columna (hasta MAX_ERRORES) en lugar de cortar en el primero.
+#
+#   salas:      id, faculty, kind, capacity
+#   profesores: id, name, habilitado_desde_ciclo, disponible_labs, day, start, end
+#               (una fila por ventana de disponibilidad; day/start/end vacíos = sin ventanas)
+#   cursos:     code, name, faculty, cycle, inscritos_teorico, inscritos_lab,
+#               duracion_teorico_horas, duracion_lab_horas, profesor_id
+#   horario:    el horarios.xlsx exportado (hojas por facultad-ciclo: Curso, Grupo, Día, Inicio,
+#               Fin, Sala, Profesor), quizás editado a mano; cursos y profesores van por nombre
+
+LOTE = 1000
+MAX_ERRORES = 200
+COLUMNAS = {
+    "salas": ("id", "faculty", "kind", "capacity"),
+    "profesores": ("id", "name"),
+    "cursos": ("code", "name", "faculty", "cycle", "inscritos_teorico", "inscritos_lab"),
+}
+
+@dataclass
+class ErrorFila:
+    archivo: str
+    fila: int
+    columna: Optional[str]
+    mensaje: str
+
+    def __str__(self):
+        donde = f"{self.archivo}:{self.fila}" + (f" [{self.columna}]" if self.columna else "")
+        return f"{donde}: {self.mensaje}"
+
+class ErrorIngesta(ValueError):
+    def __init__(self, errores: List[ErrorFila]):
+        super().__init__(f"{len(errores)} errores de ingesta" + (f" (se cortó en {MAX_ERRORES})" if len(errores) >= MAX_ERRORES else ""))
+        self.errores = errores
+
+class _ErrorLectura(ErrorIngesta):
+    # el archivo no se pudo leer (inexistente, codificación, xlsx corrupto): un solo ErrorFila
+    def __init__(self, archivo: str, fila: int, mensaje: str):
+        super().__init__([ErrorFila(archivo, fila, None, mensaje)])
+
+class _Errores(list):
+    def agregar(self, archivo: str, fila: int, columna: Optional[str], mensaje: str):
+        self.append(ErrorFila(archivo, fila, columna, mensaje))
+        if len(self) >= MAX_ERRORES:
+            raise ErrorIngesta(list(self))
+
+class _Campo(ValueError):
+    def __init__(self, columna: str, mensaje: str):
+        super().__init__(mensaje)
+        self.columna = columna
+
+# --- lectura ---
+def _es_xlsx(fuente, nombre: Optional[str]) -> bool:
+    nombre = nombre or (fuente if isinstance(fuente, str) else None)
+    if nombre:
+        return os.path.splitext(nombre)[1].lower() in (".xlsx", ".xlsm")
+    inicio = fuente.read(2)
+    fuente.seek(0)
+    return inicio == b"PK"  # zip
+
+def _ilegible(e: BaseException) -> str:
+    if isinstance(e, UnicodeDecodeError):
+        return f"el archivo no está en UTF-8 (byte 0x{e.object[e.start:e.start + 1].hex()}); guardarlo como CSV UTF-8"
+    if isinstance(e, OSError):
+        return f"no se pudo abrir: {e.strerror or e}"
+    if isinstance(e, csv.Error):
+        return f"CSV ilegible: {e}"
+    return f"no es un xlsx válido: {e}"
+
+def leer_filas(fuente, nombre: Optional[str] = None, cabecera: Optional[List[str]] = None) -> Iterator[Tuple[int, Dict[str, object]]]:
+    # (número de fila, {columna: valor}); fuente = ruta o archivo binario. cabecera: lista que se
+    # llena con las columnas (también si no hay filas de datos). Un archivo ilegible lanza
+    # ErrorIngesta con un ErrorFila en la fila donde se cortó la lectura
+    archivo = nombre or str(fuente if isinstance(fuente, str) else "archivo")
+    cabecera = [] if cabecera is None else cabecera
+    i = 1
+    try:
+        if _es_xlsx(fuente, nombre):
+            from openpyxl import load_workbook
+            from openpyxl.utils.exceptions import InvalidFileException
+            try:
+                wb = load_workbook(fuente, read_only=True, data_only=True)
+            except InvalidFileException as e:
+                raise _ErrorLectura(archivo, 1, _ilegible(e)) from None
+            try:
+                filas = wb.worksheets[0].iter_rows(values_only=True)
+                cabecera[:] = [str(c).strip().lower() if c is not None else "" for c in next(filas, ())]
+                for i, fila in enumerate(filas, start=2):
+                    if any(v not in (None, "") for v in fila):
+                        yield i, dict(zip(cabecera, fila))
+            finally:
+                wb.close()
+            return
+        texto = open(fuente, newline="", encoding="utf-8-sig") if isinstance(fuente, str) else io.TextIOWrapper(fuente, encoding="utf-8-sig", newline="")
+        try:
+            primera = texto.readline()
+            sep = ";" if primera.count(";") > primera.count(",") else ","
+            cabecera[:] = [c.strip().lower() for c in next(csv.reader([primera], delimiter=sep), [])]
+            for i, fila in enumerate(csv.reader(texto, delimiter=sep), start=2):
+                if any(v.strip() for v in fila):
+                    yield i, dict(zip(cabecera, fila + [""] * (len(cabecera) - len(fila))))
+        finally:
+            if isinstance(fuente, str):
+                texto.close()
+            else:
+                texto.detach()  # el archivo del llamador queda abierto
+    except (UnicodeDecodeError, zipfile.BadZipFile, OSError, csv.Error) as e:
+        # i: última fila leída; el error está en la siguiente (o en la cabecera)
+        raise _ErrorLectura(archivo, i + 1 if cabecera else 1, _ilegible(e)) from None
+
+def _lotes(filas: Iterator, n: int = LOTE) -> Iterator[list]:
+    while True:
+        lote = list(islice(filas, n))
+        if not lote:
+            return
+        yield lote
+
+def _lotes_de(fuente, nombre: Optional[str], archivo: str, tipo: str, errores: _Errores) -> Iterator[list]:
+    # lotes con la cabecera validada aunque no haya filas de datos; un archivo ilegible suma su
+    # error a `errores` (con los de los otros archivos) y no se leen más filas de él
+    cabecera: List[str] = []
+    try:
+        lotes = _lotes(leer_filas(fuente, nombre, cabecera))
+        lote = next(lotes, None)
+        _columnas(archivo, tipo, cabecera, errores)
+        while lote is not None:
+            yield lote
+            lote = next(lotes, None)
+    except _ErrorLectura as e:
+        f = e.errores[0]
+        errores.agregar(archivo, f.fila, None, f.mensaje)
+
+# --- conversión de celdas ---
+def _vacio(v) -> bool:
+    return v is None or (isinstance(v, str) and not v.strip())
+
+def _texto(fila: dict, col: str, obligatorio: bool = True) -> Optional[str]:
+    v = fila.get(col)
+    if _vacio(v):
+        if obligatorio:
+            raise _Campo(col, "valor obligatorio")
+        return None
+    return str(v).strip()
+
+def _entero(fila: dict, col: str, defecto: Optional[int] = None, minimo: int = 0) -> int:
+    v = fila.get(col)
+    if _vacio(v):
+        if defecto is None:
+            raise _Campo(col, "valor obligatorio")
+        return defecto
+    try:
+        n = float(v) if not isinstance(v, (int, float)) else v
+        if n != int(n):
+            raise ValueError
+        n = int(n)
+    except (TypeError, ValueError):
+        raise _Campo(col, f"se esperaba un entero: {v!r}") from None
+    if n < minimo:
+        raise _Campo(col, f"debe ser >= {minimo}: {n}")
+    return n
+
+def _booleano(fila: dict, col: str, defecto: bool) -> bool:
+    v = fila.get(col)
+    if _vacio(v):
+        return defecto
+    if isinstance(v, bool):
+        return v
+    s = str(v).strip().lower()
+    if s in ("1", "true", "si", "sí", "s", "yes", "y", "x"):
+        return True
+    if s in ("0", "false", "no", "n"):
+        return False
+    raise _Campo(col, f"se esperaba sí/no: {v!r}")
+
+def _hora(fila: dict, col: str) -> str:
+    v = fila.get(col)
+    if isinstance(v, (datetime.time, datetime.datetime)):
+        return f"{v.hour:02d}:{v.minute:02d}"
+    s = _texto(fila, col)
+    try:
+        h, m = s.split(":")[:2]
+        return f"{int(h):02d}:{int(m):02d}"
+    except ValueError:
+        raise _Campo(col, f"hora inválida (HH:MM): {s!r}") from None
+
+def _columnas(archivo: str, tipo: str, cabecera: List[str], errores: _Errores):
+    faltan = [c for c in COLUMNAS[tipo] if c not in cabecera]
+    if faltan:
+        errores.agregar(archivo, 1, None, f"faltan columnas: {', '.join(faltan)}")
+        raise ErrorIngesta(list(errores))
+
+def _cerrar(errores: _Errores, propio: bool):
+    if propio and errores:
+        raise ErrorIngesta(list(errores))
+
+# --- salas ---
+def cargar_salas(fuente, nombre: Optional[str] = None, errores: Optional[_Errores] = None) -> List[Room]:
+    archivo = nombre or str(fuente if isinstance(fuente, str) else "salas")
+    propio = errores is None  # sin lista del llamador: se lanza ErrorIngesta al final
+    errores = _Errores() if propio else errores
+    salas: List[Room] = []
+    vistos: Set[str] = set()
+    for lote in _lotes_de(fuente, nombre, archivo, "salas", errores):
+        for i, fila in lote:
+            try:
+                rid = _texto(fila, "id")
+                kind = _texto(fila, "kind").lower()
+                if kind not in ("teorico", "lab"):
+                    raise _Campo("kind", f"debe ser teorico o lab: {kind!r}")
+                sala = Room(rid, _texto(fila, "faculty"), kind, _entero(fila, "capacity", minimo=1))
+            except _Campo as e:
+                errores.agregar(archivo, i, e.columna, str(e))
+                continue
+            if rid in vistos:
+                errores.agregar(archivo, i, "id", f"sala duplicada: {rid}")
+                continue
+            vistos.add(rid)
+            salas.append(sala)
+    _cerrar(errores, propio)
+    return salas
+
+# --- profesores ---
+def cargar_profesores(fuente, nombre: Optional[str] = None, errores: Optional[_Errores] = None) -> List[Professor]:
+    archivo = nombre or str(fuente if isinstance(fuente, str) else "profesores")
+    propio = errores is None  # sin lista del llamador: se lanza ErrorIngesta al final
+    errores = _Errores() if propio else errores
+    profs: Dict[str, Professor] = {}
+    primera_fila: Dict[str, int] = {}
+    for lote in _lotes_de(fuente, nombre, archivo, "profesores", errores):
+        for i, fila in lote:
+            try:
+                pid = _texto(fila, "id")
+                datos = (_texto(fila, "name"), _entero(fila, "habilitado_desde_ciclo", 1, minimo=1), _booleano(fila, "disponible_labs", True))
+                ventana = None
+                if not all(_vacio(fila.get(c)) for c in ("day", "start", "end")):
+                    dia = _texto(fila, "day")
+                    if dia not in DAYS:
+                        raise _Campo("day", f"día desconocido: {dia!r}")
+                    ventana = (dia, _hora(fila, "start"), _hora(fila, "end"))
+            except _Campo as e:
+                errores.agregar(archivo, i, e.columna, str(e))
+                continue
+            prof = profs.get(pid)
+            if prof is None:
+                prof = profs[pid] = Professor(pid, *datos, disponibilidad={})
+                primera_fila[pid] = i
+            elif (prof.name, prof.habilitado_desde_ciclo, prof.disponible_labs) != datos:
+                errores.agregar(archivo, i, None, f"datos de {pid} distintos a los de la fila {primera_fila[pid]}")
+                continue
+            if ventana:
+                prof.disponibilidad.setdefault(ventana[0], []).append(ventana[1:])
+    for pid, prof in profs.items():
+        try:
+            compilar_disponibilidad(prof)
+        except ValueError as e:
+            errores.agregar(archivo, primera_fila[pid], "start", str(e))
+    _cerrar(errores, propio)
+    return list(profs.values())
+
+# --- cursos ---
+def cargar_cursos(fuente, nombre: Optional[str] = None, profesores: Optional[Set[str]] = None,
+                  errores: Optional[_Errores] = None) -> List[Course]:
+    # profesores: ids conocidos para validar profesor_id (None = no se valida)
+    archivo = nombre or str(fuente if isinstance(fuente, str) else "cursos")
+    propio = errores is None  # sin lista del llamador: se lanza ErrorIngesta al final
+    errores = _Errores() if propio else errores
+    cursos: List[Course] = []
+    vistos: Set[str] = set()
+    for lote in _lotes_de(fuente, nombre, archivo, "cursos", errores):
+        for i, fila in lote:
+            try:
+                code = _texto(fila, "code")
+                pid = _texto(fila, "profesor_id", obligatorio=False)
+                if pid is not None and profesores is not None and pid not in profesores:
+                    raise _Campo("profesor_id", f"profesor desconocido: {pid}")
+                curso = Course(
+                    code, _texto(fila, "name"), _texto(fila, "faculty"), _entero(fila, "cycle", minimo=1),
+                    _entero(fila, "inscritos_teorico"), _entero(fila, "inscritos_lab"),
+                    _entero(fila, "duracion_teorico_horas", 2, minimo=1), _entero(fila, "duracion_lab_horas", 2, minimo=1),
+                    pid,
+                )
+            except _Campo as e:
+                errores.agregar(archivo, i, e.columna, str(e))
+                continue
+            if code in vistos:
+                errores.agregar(archivo, i, "code", f"curso duplicado: {code}")
+                continue
+            vistos.add(code)
+            cursos.append(curso)
+    _cerrar(errores, propio)
+    return cursos
+
+def cargar_campus(salas, profesores, cursos, nombres: Tuple[Optional[str], Optional[str], Optional[str]] = (None, None, None)):
+    # las tres fuentes juntas; ErrorIngesta con todos los errores (de los tres archivos) si hay alguno
+    errores = _Errores()
+    rooms = cargar_salas(salas, nombres[0], errores)
+    profs = cargar_profesores(profesores, nombres[1], errores)
+    courses = cargar_cursos(cursos, nombres[2], {p.id for p in profs}, errores)
+    if errores:
+        raise ErrorIngesta(list(errores))
+    return rooms, profs, courses
+
+# --- horario exportado ---
+HOJAS_DERIVADAS = ("Salas", "Profesores", "Alertas")
+
+def _unico(candidatos: list, preferido=None):
+    if len(candidatos) == 1:
+        return candidatos[0]
+    if preferido is not None and preferido in candidatos:
+        return preferido
+    return None
+
+def cargar_horario(fuente, courses: List[Course], professors: List[Professor], nombre: Optional[str] = None) -> List[Assignment]:
+    # asignaciones de un horarios.xlsx; el nombre de la hoja ({facultad}-C{ciclo}) desambigua
+    # cursos con el mismo nombre y el profesor del curso desambigua profesores homónimos
+    from openpyxl import load_workbook
+    from openpyxl.utils.exceptions import InvalidFileException
+    from .export import CABECERA, SIN_PROF
+    archivo = nombre or str(fuente if isinstance(fuente, str) else "horarios.xlsx")
+    errores = _Errores()
+    cursos_por_nombre: Dict[str, List[Course]] = {}
+    for c in courses:
+        cursos_por_nombre.setdefault(c.name, []).append(c)
+    profs_por_nombre: Dict[str, List[str]] = {}
+    for p in professors:
+        profs_por_nombre.setdefault(p.name, []).append(p.id)
+    cabecera = [c.lower() for c in CABECERA]
+    asignaciones: List[Assignment] = []
+    try:
+        wb = load_workbook(fuente, read_only=True, data_only=True)
+    except (zipfile.BadZipFile, InvalidFileException, OSError) as e:
+        raise _ErrorLectura(archivo, 1, _ilegible(e)) from None
+    try:
+        for ws in wb.worksheets:
+            if ws.title in HOJAS_DERIVADAS:
+                continue
+            hoja = f"{archivo}[{ws.title}]"
+            filas = ws.iter_rows(values_only=True)
+            encabezado = [str(v).strip().lower() if v is not None else "" for v in next(filas, ())]
+            if encabezado[:len(cabecera)] != cabecera:
+                errores.agregar(hoja, 1, None, f"cabecera inesperada, se esperaba: {', '.join(CABECERA)}")
+                continue
+            for i, valores in enumerate(filas, start=2):
+                if all(_vacio(v) for v in valores):
+                    continue
+                fila = dict(zip(cabecera, valores))
+                try:
+                    nombre_curso = _texto(fila, "curso")
+                    curso = _unico([c for c in cursos_por_nombre.get(nombre_curso, []) if f"{c.faculty}-C{c.cycle}"[:31] == ws.title]) \
+                        or _unico(cursos_por_nombre.get(nombre_curso, []))
+                    if curso is None:
+                        raise _Campo("curso", f"curso desconocido o ambiguo: {nombre_curso!r}")
+                    dia = _texto(fila, "día")
+                    if dia not in DAYS:
+                        raise _Campo("día", f"día desconocido: {dia!r}")
+                    inicio, fin = hhmm_to_minutes(_hora(fila, "inicio")), hhmm_to_minutes(_hora(fila, "fin"))
+                    prof = _texto(fila, "profesor", obligatorio=False)
+                    pid = None
+                    if prof is not None and prof != SIN_PROF:
+                        pid = _unico(profs_por_nombre.get(prof, []), curso.profesor_id)
+                        if pid is None:
+                            raise _Campo("profesor", f"profesor desconocido o ambiguo: {prof!r}")
+                    asignaciones.append(Assignment(curso.code, _texto(fila, "grupo"), Slot(dia, inicio, fin), _texto(fila, "sala"), pid))
+                except _Campo as e:
+                    errores.agregar(hoja, i, e.columna, str(e))
+    finally:
+        wb.close()
+    _cerrar(errores, True)
+    return asignaciones
@@ -0,0 +1,107 @@
+from __future__ import annotations
+import threading, time, uuid
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from .models import Room, Professor, Course, Assignment
+from .scheduler import Scheduler
+
+# Cola de trabajos para correr build() fuera del proceso que atiende requests.
+
+def construir(semester: str, rooms: List[Room], profs: List[Professor], courses: List[Course],
+              assistants: List[str], engine: str = "python", time_budget: Optional[float] = None,
+              optimize: int = 0, optimize_time: Optional[float] = None, seed: int = 0,
+              multistart: int = 0, by_faculty: bool = False, workers: int = 1
+              ) -> Tuple[List[Assignment], List[str], List[Tuple[str, str]], Optional[Dict[str, int]]]:
+    # mismas opciones que POST /schedule; el puntaje solo viene con multistart u optimize
+    s = Scheduler(semester, rooms, profs, courses, assistants, engine=engine, time_budget=time_budget)
+    score = None
+    if multistart > 0:
+        score = s.build_multistart(multistart, workers, time_budget, seed)
+    elif by_faculty:
+        s.build_por_facultad(workers)
+    else:
+        s.build()
+    if optimize > 0:
+        s.optimizar(optimize, optimize_time, seed)
+        score = s.puntaje()
+    return s.assignments, s.alerts, s.alert_keys, score
+
+class ColaLlena(RuntimeError):
+    pass
+
+@dataclass
+class Job:
+    id: str
+    future: Future
+    creado: float = field(default_factory=time.time)
+    terminado: Optional[float] = None
+
+    @property
+    def estado(self) -> str:
+        f = self.future
+        if f.cancelled():
+            return "cancelado"
+        if f.done():
+            return "error" if f.exception() is not None else "terminado"
+        return "ejecutando" if f.running() else "pendiente"
+
+class JobQueue:
+    def __init__(self, workers: int = 2, max_pendientes: int = 16, ttl: float = 600.0):
+        self.workers = workers
+        self.max_pendientes = max_pendientes
+        self.ttl = ttl  # segundos que se guarda un resultado después de terminar
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+
+    def _purgar(self):
+        limite = time.time() - self.ttl
+        for jid in [j.id for j in self._jobs.values() if j.terminado is not None and j.terminado < limite]:
+            del self._jobs[jid]
+
+    def pendientes(self) -> int:
+        return sum(1 for j in self._jobs.values() if not j.future.done())
+
+    def enviar(self, fn, *args) -> Job:
+        with self._lock:
+            self._purgar()
+            if self.pendientes() >= self.max_pendientes:
+                raise ColaLlena(f"Cola llena ({self.max_pendientes} trabajos pendientes)")
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.workers)
+            job = Job(uuid.uuid4().hex, self._pool.submit(fn, *args))
+            self._jobs[job.id] = job
+        job.future.add_done_callback(lambda _f: setattr(job, "terminado", time.time()))
+        return job
+
+    def resuelto(self, valor) -> Job:
+        # trabajo ya terminado (p. ej. resultado en caché), con la misma interfaz de consulta
+        f: Future = Future()
+        f.set_running_or_notify_cancel()
+        f.set_result(valor)
+        job = Job(uuid.uuid4().hex, f, terminado=time.time())
+        with self._lock:
+            self._purgar()
+            self._jobs[job.id] = job
+        return job
+
+    def obtener(self, job_id: str, espera: float = 0.0) -> Job:
+        # espera > 0: long-poll hasta que termine o se agote el tiempo
+        with self._lock:
+            self._purgar()
+            job = self._jobs[job_id]
+        if espera > 0 and not job.future.done():
+            wait([job.future], timeout=espera)
+        return job
+
+    def cancelar(self, job_id: str) -> bool:
+        # solo se cancelan trabajos que no empezaron; un proceso en ejecución no se interrumpe
+        with self._lock:
+            job = self._jobs[job_id]
+        return job.future.cancel()
+
+    def cerrar(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
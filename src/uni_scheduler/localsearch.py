@@ -0,0 +1,321 @@
+from __future__ import annotations
+import math, random, time
+from typing import Dict, List, Optional, Tuple
+from .models import Course, Slot, Assignment
+from .utils import generar_candidatos
+
+# Post-optimización (Scheduler.optimizar): recocido simulado sobre un horario ya construido.
+# Vecindarios: mover un grupo a otro (slot, sala), intercambiar dos grupos compatibles e
+# insertar un grupo que quedó sin asignar. Un movimiento se puntúa solo con lo que toca
+# (sus grupos, sus cursos y los pares profesor×día afectados), nunca re-validando todo.
+# Las restricciones duras se respetan siempre: sala libre, profesor libre y disponible, 6 h/día.
+
+PESOS = {
+    "sin_asignar": 1000.0,  # por grupo
+    "sin_profesor": 100.0,  # grupo sin el profesor que le corresponde
+    "huecos": 10.0,         # curso con >2 días entre teórico y lab (genera alerta)
+    "proximidad": 1.0,      # por día de distancia teórico–lab (el objetivo de fase_teoricos)
+    "ocio_prof": 0.5,       # por hora libre entre clases de un profesor en un día
+    "holgura_sala": 0.01,   # por asiento sobrante en la sala
+}
+T_INICIAL = 2.0
+T_FINAL = 0.01
+_REGENERADAS = ("Laboratorio no asignado:", "Teórico no asignado:", "Hueco >2 días")
+
+class _Grupo:
+    __slots__ = ("key", "course", "name", "kind", "cap", "dur", "prof", "slots", "slots_prof", "pos")
+
+class _Bolsa:
+    # conjunto con elección aleatoria O(1)
+    def __init__(self):
+        self.items: List[_Grupo] = []
+        self.pos: Dict[Tuple[str, str], int] = {}
+
+    def __len__(self):
+        return len(self.items)
+
+    def poner(self, g: _Grupo):
+        if g.key not in self.pos:
+            self.pos[g.key] = len(self.items)
+            self.items.append(g)
+
+    def sacar(self, g: _Grupo):
+        i = self.pos.pop(g.key, None)
+        if i is None:
+            return
+        ultimo = self.items.pop()
+        if ultimo is not g:
+            self.items[i] = ultimo
+            self.pos[ultimo.key] = i
+
+    def elegir(self, rng: random.Random) -> _Grupo:
+        return self.items[rng.randrange(len(self.items))]
+
+class BusquedaLocal:
+    def __init__(self, sched, seed: int = 0):
+        self.s = sched
+        self.rng = random.Random(seed)
+        self.salas = {r.id: r for r in sched.rooms}
+        self.grupos: List[_Grupo] = []
+        self.por_key: Dict[Tuple[str, str], _Grupo] = {}
+        self.pools: Dict[Tuple[str, str, int], List[_Grupo]] = {}
+        self._candidatos: Dict[int, List[Slot]] = {}
+        self._crear_grupos()
+        self.actual: Dict[Tuple[str, str], Assignment] = {}
+        self.orden: Dict[Tuple[str, str], int] = {}
+        for i, a in enumerate(sched.assignments):
+            if (a.course_code, a.group) in self.por_key:
+                self.actual[(a.course_code, a.group)] = a
+                self.orden[(a.course_code, a.group)] = i
+        self.faltan = _Bolsa()
+        self.sin_prof = _Bolsa()
+        for g in self.grupos:
+            self._registrar(g)
+
+    # --- modelo ---
+    def _crear_grupos(self):
+        s = self.s
+        for c in s.courses:
+            if not s.ciclo_permitido(c.cycle):
+                continue
+            prof = s.professors.get(c.profesor_id) if c.profesor_id else None
+            if c.inscritos_lab > 0:
+                pid = prof.id if prof and prof.disponible_labs else None
+                for g in range(1, math.ceil(c.inscritos_lab / 15) + 1):
+                    self._grupo(c, f"Lab-{g}", "lab", 15, c.duracion_lab_horas, pid)
+            if c.inscritos_teorico > 0:
+                pid = prof.id if prof and prof.habilitado_desde_ciclo <= c.cycle else None
+                self._grupo(c, "Teo-A", "teorico", min(60, c.inscritos_teorico), c.duracion_teorico_horas, pid)
+                if c.inscritos_teorico > 60:
+                    self._grupo(c, "Teo-B", "teorico", min(60, c.inscritos_teorico - 60), c.duracion_teorico_horas, pid)
+
+    def _grupo(self, c: Course, name: str, kind: str, cap: int, dur_h: int, pid: Optional[str]):
+        g = _Grupo()
+        g.key, g.course, g.name, g.kind, g.cap, g.dur, g.prof = (c.code, name), c, name, kind, cap, dur_h, pid
+        if dur_h not in self._candidatos:
+            self._candidatos[dur_h] = generar_candidatos(dur_h)
+        g.slots = self._candidatos[dur_h]
+        g.slots_prof = [sl for sl in g.slots if self.s.disponible_prof(pid, sl)] if pid else []
+        g.pos = len(self.grupos)
+        self.grupos.append(g)
+        self.por_key[g.key] = g
+        self.pools.setdefault((c.faculty, kind, dur_h), []).append(g)
+
+    def _registrar(self, g: _Grupo):
+        asg = self.actual.get(g.key)
+        if asg is None:
+            self.faltan.poner(g)
+            self.sin_prof.sacar(g)
+        else:
+            self.faltan.sacar(g)
+            if g.prof and asg.professor_id is None:
+                self.sin_prof.poner(g)
+            else:
+                self.sin_prof.sacar(g)
+
+    # --- costo (por pieza, para evaluar solo lo que cambia) ---
+    def _costo_grupo(self, g: _Grupo) -> float:
+        asg = self.actual.get(g.key)
+        if asg is None:
+            return PESOS["sin_asignar"]
+        costo = PESOS["holgura_sala"] * (self.salas[asg.room_id].capacity - g.cap)
+        if g.prof and asg.professor_id is None:
+            costo += PESOS["sin_profesor"]
+        return costo
+
+    def _costo_curso(self, code: str) -> float:
+        t = {a.slot.dia for a in self.s.por_curso.get((code, "Teo"), ())}
+        l = {a.slot.dia for a in self.s.por_curso.get((code, "Lab"), ())}
+        if not t or not l:
+            return 0.0
+        gap = min(abs(x - y) for x in t for y in l)
+        return PESOS["proximidad"] * gap + (PESOS["huecos"] if gap > 2 else 0.0)
+
+    def _costo_prof_dia(self, pid: str, day: str) -> float:
+        xs = sorted((a.slot.start, a.slot.end) for a in self.s.prof_occupancy.get(pid, ()) if a.slot.day == day)
+        ocio = sum(max(0, b[0] - a[1]) for a, b in zip(xs, xs[1:]))
+        return PESOS["ocio_prof"] * ocio / 60
+
+    def _costo_local(self, grupos: List[_Grupo], prof_dias: set) -> float:
+        return (sum(self._costo_grupo(g) for g in grupos)
+                + sum(self._costo_curso(code) for code in {g.course.code for g in grupos})
+                + sum(self._costo_prof_dia(pid, day) for pid, day in prof_dias))
+
+    def desglose(self) -> Dict[str, float]:
+        # costo completo por término (se usa al inicio y al final, no por movimiento)
+        d = dict.fromkeys(PESOS, 0.0)
+        for g in self.grupos:
+            asg = self.actual.get(g.key)
+            if asg is None:
+                d["sin_asignar"] += PESOS["sin_asignar"]
+                continue
+            d["holgura_sala"] += PESOS["holgura_sala"] * (self.salas[asg.room_id].capacity - g.cap)
+            if g.prof and asg.professor_id is None:
+                d["sin_profesor"] += PESOS["sin_profesor"]
+        for code in {g.course.code for g in self.grupos}:
+            c = self._costo_curso(code)
+            if c >= PESOS["huecos"]:
+                d["huecos"] += PESOS["huecos"]
+                c -= PESOS["huecos"]
+            d["proximidad"] += c
+        for pid, asigns in self.s.prof_occupancy.items():
+            for day in {a.slot.day for a in asigns}:
+                d["ocio_prof"] += self._costo_prof_dia(pid, day)
+        return d
+
+    # --- primitivas ---
+    def _quitar(self, g: _Grupo):
+        self.s.liberar(self.actual.pop(g.key))
+
+    def _poner(self, g: _Grupo, slot: Slot, room_id: str, pid: Optional[str]):
+        self.actual[g.key] = self.s.colocar(g.course, g.name, slot, self.salas[room_id], pid)
+        self.s.assignments.pop()  # la lista final se arma al terminar
+
+    def _prof_para(self, g: _Grupo, slot: Slot) -> Optional[str]:
+        s = self.s
+        if g.prof and s.disponible_prof(g.prof, slot) and s.libre_prof(g.prof, slot) and s.cabe_en_tope(g.prof, slot.day, slot.duration_hours()):
+            return g.prof
+        return None
+
+    def _sala_para(self, g: _Grupo, slot: Slot, preferida: Optional[str] = None) -> Optional[str]:
+        if preferida and self.salas[preferida].capacity >= g.cap and self.s.libre_room(preferida, slot):
+            return preferida
+        sala = self.s.primera_sala_libre(g.course.faculty, g.kind, g.cap, slot)
+        return sala.id if sala else None
+
+    def _revertir(self, previos: List[Tuple[_Grupo, Optional[Assignment]]]):
+        for g, _ in previos:
+            if g.key in self.actual:
+                self._quitar(g)
+        for g, asg in previos:
+            if asg is not None:
+                self._poner(g, asg.slot, asg.room_id, asg.professor_id)
+            self._registrar(g)
+
+    def _prof_dias(self, pares) -> set:
+        return {(pid, day) for pid, day in pares if pid}
+
+    # --- vecindarios: devuelven (delta, previos) o None si el movimiento no es factible ---
+    def _mover(self, g: _Grupo):
+        viejo = self.actual.get(g.key)
+        # sin su profesor: se prueban primero slots dentro de su disponibilidad
+        repara = g.prof and (viejo is None or viejo.professor_id is None) and g.slots_prof
+        slot = self.rng.choice(g.slots_prof if repara and self.rng.random() < 0.7 else g.slots)
+        if viejo is not None and slot == viejo.slot:
+            return None
+        pd = self._prof_dias([(viejo.professor_id, viejo.slot.day) if viejo else (None, None), (g.prof, slot.day)])
+        antes = self._costo_local([g], pd)
+        previos = [(g, viejo)]
+        if viejo is not None:
+            self._quitar(g)
+        sala = self._sala_para(g, slot)
+        if sala is None:
+            self._revertir(previos)
+            return None
+        self._poner(g, slot, sala, self._prof_para(g, slot))
+        self._registrar(g)
+        return self._costo_local([g], pd) - antes, previos
+
+    def _intercambiar(self, g: _Grupo):
+        a = self.actual.get(g.key)
+        pool = self.pools[(g.course.faculty, g.kind, g.dur)]
+        h = pool[self.rng.randrange(len(pool))]
+        b = self.actual.get(h.key)
+        if a is None or b is None or h is g or a.slot == b.slot:
+            return None
+        pd = self._prof_dias([(a.professor_id, a.slot.day), (b.professor_id, b.slot.day), (g.prof, b.slot.day), (h.prof, a.slot.day)])
+        antes = self._costo_local([g, h], pd)
+        previos = [(g, a), (h, b)]
+        self._quitar(g)
+        self._quitar(h)
+        sala_g = self._sala_para(g, b.slot, b.room_id)
+        if sala_g is not None:
+            self._poner(g, b.slot, sala_g, self._prof_para(g, b.slot))
+            sala_h = self._sala_para(h, a.slot, a.room_id)
+            if sala_h is not None:
+                self._poner(h, a.slot, sala_h, self._prof_para(h, a.slot))
+                self._registrar(g)
+                self._registrar(h)
+                return self._costo_local([g, h], pd) - antes, previos
+        self._revertir(previos)
+        return None
+
+    # --- búsqueda ---
+    def _foto(self, previos) -> Dict[Tuple[str, str], Optional[tuple]]:
+        # estado anterior al movimiento recién aplicado (el último mejor)
+        foto = {k: (a.slot, a.room_id, a.professor_id) for k, a in self.actual.items()}
+        for g, asg in previos:
+            foto[g.key] = (asg.slot, asg.room_id, asg.professor_id) if asg is not None else None
+        return foto
+
+    def _restaurar(self, foto):
+        for g in self.grupos:
+            if g.key in self.actual:
+                self._quitar(g)
+        for g in self.grupos:
+            val = foto.get(g.key)
+            if val is not None:
+                self._poner(g, *val)
+            self._registrar(g)
+
+    def optimizar(self, iteraciones: int = 20000, time_budget: Optional[float] = None) -> Dict[str, float]:
+        inicio = time.monotonic()
+        rng = self.rng
+        inicial = self.desglose()
+        costo = mejor = sum(inicial.values())
+        foto = None  # None: el estado actual es el mejor visto
+        aceptados = i = 0
+        while i < iteraciones and self.grupos:
+            transcurrido = time.monotonic() - inicio
+            if time_budget and transcurrido >= time_budget:
+                break
+            avance = max(i / iteraciones, transcurrido / time_budget if time_budget else 0.0)
+            temp = T_INICIAL * (T_FINAL / T_INICIAL) ** avance
+            i += 1
+            r = rng.random()
+            if r < 0.25 and self.faltan:
+                res = self._mover(self.faltan.elegir(rng))
+            elif r < 0.5 and self.sin_prof:
+                res = self._mover(self.sin_prof.elegir(rng))
+            elif r < 0.75:
+                res = self._mover(self.grupos[rng.randrange(len(self.grupos))])
+            else:
+                res = self._intercambiar(self.grupos[rng.randrange(len(self.grupos))])
+            if res is None:
+                continue
+            delta, previos = res
+            if delta <= 1e-9 or rng.random() < math.exp(-delta / temp):
+                if delta > 1e-9 and foto is None:
+                    foto = self._foto(previos)
+                costo += delta
+                aceptados += 1
+                if costo < mejor - 1e-9:
+                    mejor, foto = costo, None
+            else:
+                self._revertir(previos)
+        if foto is not None:
+            self._restaurar(foto)
+        self._cerrar()
+        final = self.desglose()
+        return {"iteraciones": i, "aceptados": aceptados, "segundos": round(time.monotonic() - inicio, 3),
+                "costo_inicial": round(sum(inicial.values()), 3), "costo_final": round(sum(final.values()), 3),
+                "desglose": {k: round(v, 3) for k, v in final.items()}}
+
+    def _cerrar(self):
+        # lista final en el orden original (los grupos nuevos al final) y alertas recalculadas
+        s = self.s
+        fin = len(s.assignments)
+        s.assignments = sorted(self.actual.values(), key=lambda a: self.orden.get((a.course_code, a.group), fin + self.por_key[(a.course_code, a.group)].pos))
+        quedan = [(k, m) for k, m in zip(s.alert_keys, s.alerts) if k[0] != "prof" and not m.startswith(_REGENERADAS)]
+        s.alert_keys = [k for k, _ in quedan]
+        s.alerts = [m for _, m in quedan]
+        for g in self.faltan.items:
+            c = g.course
+            if g.kind == "lab":
+                s._alerta(("curso", c.code), f"Laboratorio no asignado: {c.name} requiere grupo {g.name} y no hay slot disponible")
+            else:
+                s._alerta(("curso", c.code), f"Teórico no asignado: {c.name} {g.name}")
+        for c in s.courses:
+            s._validar_hueco(c)
+        for pid in list(s.prof_occupancy):
+            s._validar_horas_prof(pid)
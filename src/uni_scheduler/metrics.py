@@ -0,0 +1,125 @@
+from __future__ import annotations
+import cProfile, io, pstats, threading, time
+from typing import Dict, Optional
+
+# Instrumentación opt-in: se instala envolviendo métodos de una instancia de Scheduler,
+# así un Scheduler sin instrumentar no paga nada en el camino caliente.
+
+FASES = ("fase_labs", "fase_teoricos", "fase_csp", "fase_validaciones", "optimizar", "export_excel", "export_pdf_alertas")
+CONTADORES = (
+    "slots_probados",           # candidatos recorridos por buscar_* hasta colocar (o todos si falla)
+    "busquedas_sala",           # salas_disponibles / primera_sala_libre
+    "libre_room",
+    "libre_prof",
+    "rechazo_disponibilidad",   # el slot cae fuera de la disponibilidad del profesor
+    "rechazo_tope_6h",
+)
+
+class Instrumentacion:
+    def __init__(self, contadores: bool = True, perfil: bool = False):
+        self.contadores_activos = contadores
+        self.tiempos: Dict[str, float] = {}
+        self.contadores: Dict[str, int] = dict.fromkeys(CONTADORES, 0)
+        self.perfil: Optional[cProfile.Profile] = cProfile.Profile() if perfil else None
+
+    def instalar(self, sched):
+        sched.instrumentacion = self
+        for fase in FASES + ("build",):
+            self._cronometrar(sched, fase)
+        if self.contadores_activos:
+            for nombre in ("libre_room", "libre_prof"):
+                self._contar(sched, nombre, nombre)
+            for nombre in ("salas_disponibles", "primera_sala_libre"):
+                self._contar(sched, nombre, "busquedas_sala")
+            self._contar_rechazos(sched, "disponible_prof", "rechazo_disponibilidad")
+            self._contar_rechazos(sched, "cabe_en_tope", "rechazo_tope_6h")
+            for nombre in ("buscar_lab", "buscar_simple", "buscar_doble"):
+                self._contar_slots(sched._motor, nombre)
+        return self
+
+    def _cronometrar(self, obj, nombre: str):
+        orig = getattr(obj, nombre)
+        perfil = self.perfil if nombre == "build" else None
+        def envuelto(*args, **kwargs):
+            t = time.perf_counter()
+            if perfil:
+                perfil.enable()
+            try:
+                return orig(*args, **kwargs)
+            finally:
+                if perfil:
+                    perfil.disable()
+                self.tiempos[nombre] = self.tiempos.get(nombre, 0.0) + time.perf_counter() - t
+        setattr(obj, nombre, envuelto)
+
+    def _contar(self, obj, nombre: str, contador: str):
+        orig = getattr(obj, nombre)
+        c = self.contadores
+        def envuelto(*args):
+            c[contador] += 1
+            return orig(*args)
+        setattr(obj, nombre, envuelto)
+
+    def _contar_rechazos(self, obj, nombre: str, contador: str):
+        orig = getattr(obj, nombre)
+        c = self.contadores
+        def envuelto(*args):
+            ok = orig(*args)
+            if not ok:
+                c[contador] += 1
+            return ok
+        setattr(obj, nombre, envuelto)
+
+    def _contar_slots(self, obj, nombre: str):
+        orig = getattr(obj, nombre)
+        c = self.contadores
+        def envuelto(course, *args):
+            slots = args[-2]
+            hallado = orig(course, *args)
+            c["slots_probados"] += len(slots) if hallado is None else slots.index(hallado[0]) + 1
+            return hallado
+        setattr(obj, nombre, envuelto)
+
+    def resumen(self) -> dict:
+        return {"tiempos": dict(self.tiempos), "contadores": dict(self.contadores) if self.contadores_activos else {}}
+
+    def perfil_texto(self, n: int = 25) -> str:
+        if self.perfil is None:
+            return ""
+        out = io.StringIO()
+        pstats.Stats(self.perfil, stream=out).sort_stats("cumulative").print_stats(n)
+        return out.getvalue()
+
+class Registro:
+    # acumulados del proceso para /metrics (formato de texto de Prometheus)
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.tiempos: Dict[str, float] = dict.fromkeys(FASES + ("build",), 0.0)
+        self.contadores: Dict[str, int] = dict.fromkeys(CONTADORES, 0)
+
+    def acumular(self, inst: Instrumentacion):
+        with self._lock:
+            self.builds += 1
+            for k, v in inst.tiempos.items():
+                self.tiempos[k] = self.tiempos.get(k, 0.0) + v
+            if inst.contadores_activos:
+                for k, v in inst.contadores.items():
+                    self.contadores[k] += v
+
+    def prometheus(self, extra: Optional[Dict[str, float]] = None) -> str:
+        with self._lock:
+            lineas = [
+                "# HELP uni_builds_total Horarios construidos vía /schedule.",
+                "# TYPE uni_builds_total counter",
+                f"uni_builds_total {self.builds}",
+                "# HELP uni_fase_segundos_total Tiempo acumulado por fase.",
+                "# TYPE uni_fase_segundos_total counter",
+            ]
+            lineas += [f'uni_fase_segundos_total{{fase="{k}"}} {v:.6f}' for k, v in self.tiempos.items()]
+            lineas += ["# HELP uni_eventos_total Contadores del camino caliente (solo requests con stats).", "# TYPE uni_eventos_total counter"]
+            lineas += [f'uni_eventos_total{{evento="{k}"}} {v}' for k, v in self.contadores.items()]
+        for nombre, valor in (extra or {}).items():
+            tipo = "counter" if nombre.endswith("_total") else "gauge"
+            lineas += [f"# TYPE {nombre} {tipo}", f"{nombre} {valor}"]
+        return "\n".join(lineas) + "\n"
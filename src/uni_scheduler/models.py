@@ -1,8 +1,10 @@
 from __future__ import annotations
+import sys
 from dataclasses import dataclass, field, asdict
 from typing import Dict, List, Optional, Tuple
 
 DAYS = ["Lunes", "Martes", "Miércoles", "Jueves", "Viernes"]
+DAY_INDEX = {d: i for i, d in enumerate(DAYS)}
 START_MINUTES = 7 * 60
 END_MINUTES = 20 * 60
 SLOT = 30
@@ -16,14 +18,14 @@ def hhmm_to_minutes(hhmm: str) -> int:
     h, m = map(int, hhmm.split(":"))
     return h * 60 + m
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Room:
     id: str
     faculty: str   # Ingeniería / Ciencias / Letras
     kind: str      # "teorico" | "lab"
     capacity: int
 
-@dataclass
+@dataclass(slots=True)
 class Professor:
     id: str
     name: str
@@ -32,7 +34,7 @@ class Professor:
     disponibilidad: Dict[str, List[Tuple[str, str]]] = field(default_factory=dict)
     # ejemplo: {"Lunes": [("07:00","12:00"), ("14:00","18:00")]}
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Course:
     code: str
     name: str
@@ -44,22 +46,47 @@ class Course:
     duracion_lab_horas: int = 2
     profesor_id: Optional[str] = None
 
-@dataclass
+# Slot y Assignment son inmutables y sin __dict__ (hay uno por sección del campus).
+# Slot conserva el campo público `day` (nombre) y guarda además `dia`, el código entero
+# (índice en DAYS) que usan los índices de ocupación; `dia` no es campo del dataclass, así que
+# Slot(day="Lunes", ...) y asdict(slot) no cambian.
+@dataclass(frozen=True)
 class Slot:
-    day: str
+    __slots__ = ("day", "start", "end", "dia")
+    day: str    # se acepta el nombre ("Lunes") o el código (0)
     start: int
     end: int
+    def __post_init__(self):
+        if isinstance(self.day, int):
+            if not 0 <= self.day < len(DAYS):
+                raise ValueError(f"Código de día fuera de rango: {self.day!r}")
+            object.__setattr__(self, "dia", self.day)
+            object.__setattr__(self, "day", DAYS[self.day])
+        elif self.day in DAY_INDEX:
+            object.__setattr__(self, "dia", DAY_INDEX[self.day])
+        else:
+            raise ValueError(f"Día desconocido: {self.day!r}")
+    def __reduce__(self):
+        # frozen con __slots__ propios: el pickle por defecto haría setattr
+        return (Slot, (self.day, self.start, self.end))
     def overlaps(self, other: "Slot") -> bool:
-        return self.day == other.day and not (self.end <= other.start or other.end <= self.start)
+        return self.dia == other.dia and not (self.end <= other.start or other.end <= self.start)
     def duration_hours(self) -> float:
         return (self.end - self.start) / 60.0
     def __str__(self):
         return f"{self.day} {minutes_to_hhmm(self.start)}-{minutes_to_hhmm(self.end)}"
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Assignment:
     course_code: str
     group: str
     slot: Slot
     room_id: str
     professor_id: Optional[str]
+    def __post_init__(self):
+        # ids internados: las asignaciones que vienen de JSON/caché no duplican cadenas
+        object.__setattr__(self, "course_code", sys.intern(self.course_code))
+        object.__setattr__(self, "group", sys.intern(self.group))
+        object.__setattr__(self, "room_id", sys.intern(self.room_id))
+        if self.professor_id is not None:
+            object.__setattr__(self, "professor_id", sys.intern(self.professor_id))
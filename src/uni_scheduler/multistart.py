@@ -0,0 +1,92 @@
+from __future__ import annotations
+import os, threading, time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional, Tuple
+from .models import Room, Professor, Course
+
+# Multi-start: variantes del greedy con distinto orden de cursos/slots, en paralelo.
+# Resultado reproducible para un mismo seed mientras no se agote time_budget.
+
+ORDEN_PUNTAJE = ("sin_asignar", "sin_profesor", "huecos", "sobrecarga")
+
+# un solo pool por proceso, de os.cpu_count() procesos, compartido por todas las llamadas: los
+# requests concurrentes no suman procesos y cada llamada tiene a lo sumo `workers` variantes en vuelo
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+def _pool_compartido() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+        return _pool
+
+def _descartar_pool(pool: ProcessPoolExecutor):
+    # un proceso murió (BrokenProcessPool): la próxima llamada arranca un pool nuevo
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+def semilla_variante(seed: int, i: int) -> Optional[str]:
+    return None if i == 0 else f"{seed}:{i}"
+
+def variante(semester: str, rooms: List[Room], profs: List[Professor], courses: List[Course],
+             assistants: List[str], engine: str, seed: Optional[str]):
+    from .scheduler import Scheduler
+    s = Scheduler(semester, rooms, profs, courses, assistants, engine=engine, seed=seed)
+    s.build()
+    return s.puntaje(), s.assignments, s.alerts, s.alert_keys
+
+def _clave(score: Dict[str, int], i: int) -> Tuple:
+    return tuple(score[k] for k in ORDEN_PUNTAJE) + (i,)
+
+def mejor_variante(sched, n: int, workers: int = 1, time_budget: Optional[float] = None, seed: int = 0):
+    args = (sched.semester, sched.rooms, list(sched.professors.values()), sched.courses, sched.assistants_pool, sched.engine)
+    limite = time.monotonic() + time_budget if time_budget else None
+    resultados: Dict[int, tuple] = {}
+    if workers <= 1:
+        for i in range(max(n, 1)):
+            if i > 0 and limite and time.monotonic() >= limite:
+                break
+            resultados[i] = variante(*args, semilla_variante(seed, i))
+    else:
+        pool = _pool_compartido()
+        semillas = iter(range(max(n, 1)))
+        futuros: Dict[object, int] = {}
+        pendientes = set()
+
+        def lanzar():
+            i = next(semillas, None)
+            if i is not None:
+                f = pool.submit(variante, *args, semilla_variante(seed, i))
+                futuros[f] = i
+                pendientes.add(f)
+
+        try:
+            for _ in range(workers):
+                lanzar()
+            while pendientes:
+                restante = None if limite is None else max(limite - time.monotonic(), 0)
+                # siempre se espera la variante 0 (la primera en salir) para no devolver algo peor que build()
+                if restante == 0 and 0 in resultados:
+                    break
+                hechos, _ = wait(pendientes, timeout=restante if 0 in resultados else None, return_when=FIRST_COMPLETED)
+                for f in hechos:
+                    pendientes.discard(f)
+                    resultados[futuros[f]] = f.result()
+                    if limite is None or time.monotonic() < limite:
+                        lanzar()
+        except BrokenProcessPool:
+            _descartar_pool(pool)
+            raise
+        finally:
+            # las que no empezaron se cancelan; las que ya corren (a lo sumo `workers`) terminan en
+            # el pool compartido sin bloquear esta llamada
+            for f in pendientes:
+                f.cancel()
+    i = min(resultados, key=lambda i: _clave(resultados[i][0], i))
+    score, assignments, alerts, alert_keys = resultados[i]
+    return assignments, alerts, alert_keys, dict(score, variante=i)
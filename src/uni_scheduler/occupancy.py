@@ -0,0 +1,41 @@
+from __future__ import annotations
+from functools import lru_cache
+from typing import Dict, Tuple
+from .models import Slot, SLOT
+
+# Índice de ocupación: un entero por (recurso, código de día), un bit por bloque de SLOT minutos
+# contado desde las 00:00 (bit i = [i*SLOT, (i+1)*SLOT)).
+
+@lru_cache(maxsize=None)
+def _mask(start: int, end: int) -> int:
+    ini = start // SLOT
+    fin = -(-end // SLOT)  # techo: un slot desalineado ocupa el bloque completo
+    if fin <= ini:
+        return 0
+    return ((1 << (fin - ini)) - 1) << ini
+
+def slot_mask(slot: Slot) -> int:
+    return _mask(slot.start, slot.end)
+
+def ventana_mask(start: int, end: int) -> int:
+    # redondeo hacia adentro: solo bloques completamente dentro de la ventana
+    ini = -(-start // SLOT)
+    fin = end // SLOT
+    if fin <= ini:
+        return 0
+    return ((1 << (fin - ini)) - 1) << ini
+
+class OccupancyIndex:
+    def __init__(self):
+        self.masks: Dict[Tuple[str, int], int] = {}
+
+    def libre(self, key: str, slot: Slot) -> bool:
+        return not (self.masks.get((key, slot.dia), 0) & _mask(slot.start, slot.end))
+
+    def ocupar(self, key: str, slot: Slot):
+        k = (key, slot.dia)
+        self.masks[k] = self.masks.get(k, 0) | _mask(slot.start, slot.end)
+
+    def liberar(self, key: str, slot: Slot):
+        k = (key, slot.dia)
+        self.masks[k] = self.masks.get(k, 0) & ~_mask(slot.start, slot.end)
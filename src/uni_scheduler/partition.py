@@ -0,0 +1,82 @@
+from __future__ import annotations
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Set, Tuple
+from .models import Room, Professor, Course, Assignment
+
+# Build particionado por facultad: las salas solo se usan dentro de su facultad, así que cada
+# facultad (sus salas, sus cursos y los profesores que esos cursos piden) corre las fases de
+# labs y teóricos en su propio proceso. Lo único compartido son los profesores:
+#   1. se reproducen las particiones en orden de facultad sobre un horario común; una sección
+#      cuyo profesor ya está ocupado o pasaría el tope de 6 h ese día marca su curso en conflicto;
+#   2. los cursos en conflicto se liberan y se vuelven a colocar con el horario completo a la
+#      vista (mismas fases), así que el resultado cumple libre_prof y el tope igual que build();
+#   3. las validaciones corren una vez sobre el resultado unido.
+
+def construir_facultad(semester: str, rooms: List[Room], profs: List[Professor], courses: List[Course],
+                       assistants: List[str], engine: str, seed) -> Tuple[List[Assignment], List[str], List[Tuple[str, str]]]:
+    from .scheduler import Scheduler
+    s = Scheduler(semester, rooms, profs, courses, assistants, engine=engine, seed=seed)
+    s.fase_labs()
+    s.fase_teoricos()
+    return s.assignments, s.alerts, s.alert_keys
+
+def particiones(sched) -> List[tuple]:
+    por_fac: Dict[str, List[Course]] = defaultdict(list)
+    for c in sched.courses:
+        por_fac[c.faculty].append(c)
+    partes = []
+    for fac in sorted(por_fac):
+        cursos = por_fac[fac]
+        pids = {c.profesor_id for c in cursos if c.profesor_id in sched.professors}
+        partes.append((sched.semester, [r for r in sched.rooms if r.faculty == fac], [p for p in sched.professors.values() if p.id in pids],
+                       cursos, sched.assistants_pool, sched.engine, sched.seed))
+    return partes
+
+def _cabe(sched, a: Assignment) -> bool:
+    if not sched.libre_room(a.room_id, a.slot):
+        return False
+    if a.professor_id is None:
+        return True
+    return sched.libre_prof(a.professor_id, a.slot) and sched.cabe_en_tope(a.professor_id, a.slot.day, a.slot.duration_hours())
+
+def unir(sched, resultados: List[tuple]) -> Set[str]:
+    # pasos 1 y 2 sobre un Scheduler vacío; devuelve los cursos que hubo que recolocar
+    salas = {r.id: r for r in sched.rooms}
+    conflicto: Set[str] = set()
+    for assignments, alerts, alert_keys in resultados:
+        for a in assignments:
+            if a.course_code in conflicto:
+                continue
+            if not _cabe(sched, a):
+                conflicto.add(a.course_code)
+                continue
+            sched.colocar(sched.cursos_por_codigo[a.course_code], a.group, a.slot, salas[a.room_id], a.professor_id)
+        sched.alerts.extend(alerts)
+        sched.alert_keys.extend(alert_keys)
+    if conflicto:
+        salen = [a for a in sched.assignments if a.course_code in conflicto]
+        for a in salen:
+            sched.liberar(a)
+        sched.assignments = [a for a in sched.assignments if a.course_code not in conflicto]
+        for code in conflicto:
+            sched.por_curso.pop((code, "Teo"), None)
+            sched.por_curso.pop((code, "Lab"), None)
+        sched._quitar_alertas({("curso", code) for code in conflicto})
+        sched._colocar_cursos([c for c in sched.courses if c.code in conflicto])
+    return conflicto
+
+def construir_por_facultad(sched, workers: int = 1) -> Dict[str, object]:
+    t0 = time.perf_counter()
+    partes = particiones(sched)
+    if workers <= 1 or len(partes) <= 1:
+        resultados = [construir_facultad(*p) for p in partes]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(partes))) as pool:
+            resultados = list(pool.map(construir_facultad, *zip(*partes)))
+    t1 = time.perf_counter()
+    conflicto = unir(sched, resultados)
+    sched.fase_validaciones()
+    return {"facultades": len(partes), "recolocados": len(conflicto),
+            "segundos_particiones": round(t1 - t0, 3), "segundos_union": round(time.perf_counter() - t1, 3)}
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+from .models import Room, Professor, Course, DAYS
+from .utils import generar_candidatos
+
+# Escenarios "qué pasa si": un dataset base y N deltas chicos (salas, cursos, disponibilidad,
+# semestre). La base se prepara una sola vez (catálogo de salas, disponibilidad compilada,
+# slots candidatos) y viaja una vez a cada proceso; cada escenario reutiliza lo que no toca.
+
+@dataclass
+class Escenario:
+    nombre: str
+    semester: Optional[str] = None                      # None = el de la base
+    agregar_salas: List[Room] = field(default_factory=list)
+    quitar_salas: List[str] = field(default_factory=list)
+    agregar_cursos: List[Course] = field(default_factory=list)
+    quitar_cursos: List[str] = field(default_factory=list)
+    disponibilidad: Dict[str, Dict[str, List[Tuple[str, str]]]] = field(default_factory=dict)  # reemplaza la del profesor
+    quitar_dias: Dict[str, List[str]] = field(default_factory=dict)  # profesor -> días que deja libres
+
+def escenario_desde_dict(d: dict) -> Escenario:
+    # mismo formato en la API y en el JSON de la CLI
+    return Escenario(
+        nombre=d["name"],
+        semester=d.get("semester"),
+        agregar_salas=[Room(**r) for r in d.get("add_rooms", [])],
+        quitar_salas=list(d.get("remove_rooms", [])),
+        agregar_cursos=[Course(**c) for c in d.get("add_courses", [])],
+        quitar_cursos=list(d.get("remove_courses", [])),
+        disponibilidad={pid: {dia: [tuple(v) for v in vs] for dia, vs in disp.items()} for pid, disp in d.get("availability", {}).items()},
+        quitar_dias={pid: list(dias) for pid, dias in d.get("drop_days", {}).items()},
+    )
+
+def _faltan(que: str, ids, conocidos) -> None:
+    faltan = [i for i in ids if i not in conocidos]
+    if faltan:
+        raise ValueError(f"{que} inexistente: {', '.join(faltan)}")
+
+def _entradas(base, esc: Escenario):
+    # listas del escenario; lo que no cambia se pasa tal cual (mismos objetos que la base)
+    rooms = base.rooms
+    if esc.agregar_salas or esc.quitar_salas:
+        _faltan("Sala", esc.quitar_salas, {r.id for r in base.rooms})
+        quitar = set(esc.quitar_salas)
+        rooms = [r for r in base.rooms if r.id not in quitar] + esc.agregar_salas
+    profs = list(base.professors.values())
+    if esc.disponibilidad or esc.quitar_dias:
+        _faltan("Profesor", list(esc.disponibilidad) + list(esc.quitar_dias), base.professors)
+        for dias in esc.quitar_dias.values():
+            _faltan("Día", dias, DAYS)
+        profs = [_profesor(p, esc) if p.id in esc.disponibilidad or p.id in esc.quitar_dias else p for p in profs]
+    courses = list(base.courses)
+    if esc.agregar_cursos or esc.quitar_cursos:
+        _faltan("Curso", esc.quitar_cursos, base.cursos_por_codigo)
+        quitar = set(esc.quitar_cursos)
+        courses = [c for c in base.courses if c.code not in quitar] + esc.agregar_cursos
+    return esc.semester or base.semester, rooms, profs, courses
+
+def _profesor(p: Professor, esc: Escenario) -> Professor:
+    disp = esc.disponibilidad.get(p.id, p.disponibilidad)
+    fuera = set(esc.quitar_dias.get(p.id, ()))
+    return Professor(p.id, p.name, p.habilitado_desde_ciclo, p.disponible_labs, {d: vs for d, vs in disp.items() if d not in fuera})
+
+def utilizacion(sched) -> Dict[str, float]:
+    # % de horas-sala ocupadas sobre la jornada, de los agregados del Scheduler (ver analytics.py)
+    return sched.agregados.utilizacion()
+
+def correr(base, esc: Escenario) -> dict:
+    from .scheduler import Scheduler
+    fila = {"escenario": esc.nombre}
+    try:
+        semester, rooms, profs, courses = _entradas(base, esc)
+        s = Scheduler(semester, rooms, profs, courses, base.assistants_pool, engine=base.engine, time_budget=base.time_budget, base=base)
+        s.build()
+    except ValueError as e:
+        return {**fila, "error": str(e)}
+    return {**fila, "semester": semester, "alertas": len(s.alerts), "asignaciones": len(s.assignments),
+            **s.puntaje(), "utilizacion_salas": utilizacion(s)}
+
+# --- procesos: la base se envía una vez por worker (initializer), no una vez por escenario ---
+_BASE = None
+
+def _iniciar(base):
+    global _BASE
+    _BASE = base
+    for c in base.courses:
+        generar_candidatos(c.duracion_teorico_horas)
+        generar_candidatos(c.duracion_lab_horas)
+
+def _correr_en_worker(esc: Escenario) -> dict:
+    return correr(_BASE, esc)
+
+def comparar(base, escenarios: List[Escenario], workers: int = 1) -> List[dict]:
+    # base: Scheduler sin construir (ya validado); la primera fila es la base sin cambios
+    todos = [Escenario("base")] + list(escenarios)
+    if workers <= 1 or len(todos) == 1:
+        filas = [correr(base, esc) for esc in todos]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todos)), initializer=_iniciar, initargs=(base,)) as pool:
+            filas = list(pool.map(_correr_en_worker, todos))
+    ref = filas[0]
+    for f in filas[1:]:
+        if "error" not in f and "error" not in ref:
+            f["delta"] = {k: f[k] - ref[k] for k in ("alertas", "sin_asignar", "sin_profesor", "huecos", "sobrecarga")}
+    return filas
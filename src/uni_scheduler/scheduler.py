@@ -1,21 +1,64 @@
 from __future__ import annotations
 import math
+import random
 from collections import defaultdict
 from typing import Dict, List, Optional, Tuple
-from .models import Room, Professor, Course, Slot, Assignment, DAYS, minutes_to_hhmm, END_MINUTES
-from .utils import generar_candidatos, profesor_disponible
+from .models import Room, Professor, Course, Slot, Assignment, DAYS, DAY_INDEX, END_MINUTES
+from .utils import generar_candidatos, compilar_disponibilidad, disponible_en
+from .occupancy import OccupancyIndex
+from .analytics import Agregados, TOPE_MINUTOS
+from .cache import clave_entradas
+
+CSP_TIME_BUDGET = 60.0  # segundos por defecto para engine="csp"
 
 class Scheduler:
-    def __init__(self, semester: str, rooms: List[Room], professors: List[Professor], courses: List[Course], assistants_pool: List[str] = None):
+    def __init__(self, semester: str, rooms: List[Room], professors: List[Professor], courses: List[Course], assistants_pool: List[str] = None, engine: str = "python", seed=None, time_budget: Optional[float] = None,
+                 base: Optional["Scheduler"] = None):
         self.semester = semester  # "Abril-Agosto" | "Agosto-Diciembre"
         self.rooms = rooms
+        # base: otro Scheduler del que se reutilizan el catálogo de salas (si la lista es la misma)
+        # y la disponibilidad compilada de los profesores que no cambiaron (ver scenarios.py)
+        if base is not None and base.rooms is rooms:
+            self._catalogo = base._catalogo
+            self._elegibles = base._elegibles
+        else:
+            self._indexar_salas()
         self.professors: Dict[str, Professor] = {p.id: p for p in professors}
+        # disponibilidad compilada una sola vez (ValueError si hay ventanas mal formadas)
+        previa = base.professors if base is not None else {}
+        self.disponibilidad: Dict[str, Dict[str, int]] = {
+            p.id: base.disponibilidad[p.id] if previa.get(p.id) is p else compilar_disponibilidad(p) for p in professors}
         self.courses = courses
+        self.cursos_por_codigo: Dict[str, Course] = {c.code: c for c in courses}
         self.assistants_pool = assistants_pool or []
         self.room_occupancy: Dict[str, List[Assignment]] = defaultdict(list)
         self.prof_occupancy: Dict[str, List[Assignment]] = defaultdict(list)
+        # bitmasks por (recurso, día) para las consultas de libre_room/libre_prof
+        self.room_index = OccupancyIndex()
+        self.prof_index = OccupancyIndex()
+        # minutos por (profesor, día) y (sala, día), mapa de ocupación y distribución de carga
+        # (ver analytics.py); colocar/liberar los mantienen al día
+        self.agregados = Agregados(rooms, self.professors)
         self.assignments: List[Assignment] = []
+        # índice por (curso, "Teo"|"Lab") mantenido en colocar
+        self.por_curso: Dict[Tuple[str, str], List[Assignment]] = defaultdict(list)
         self.alerts: List[str] = []
+        # entidad de cada alerta, en paralelo a alerts: ("curso", code) | ("prof", id)
+        self.alert_keys: List[Tuple[str, str]] = []
+        # motor de búsqueda: "python" (slot por slot), "numpy" (matriz de factibilidad, mismo resultado)
+        # o "csp" (búsqueda exacta con time_budget, ver csp.py)
+        self.engine = engine
+        self.time_budget = time_budget
+        # seed: perturba el orden de cursos y slots (variantes de build_multistart); None = determinista
+        self.seed = seed
+        self._rng = random.Random(seed) if seed is not None else None
+        if engine == "numpy":
+            from .vectorized import MotorNumpy
+            self._motor = MotorNumpy(self)
+        elif engine in ("python", "csp"):
+            self._motor = self
+        else:
+            raise ValueError(f"Motor desconocido: {engine}")
 
     # --- reglas de semestre ---
     def ciclo_permitido(self, cycle: int) -> bool:
@@ -25,204 +68,453 @@ class Scheduler:
             return cycle % 2 == 0
         return True
 
+    def _alerta(self, clave: Tuple[str, str], msg: str):
+        self.alerts.append(msg)
+        self.alert_keys.append(clave)
+
     # --- helpers de ocupación ---
     def libre_room(self, room_id: str, slot: Slot) -> bool:
-        return all(not slot.overlaps(a.slot) for a in self.room_occupancy[room_id])
+        return self.room_index.libre(room_id, slot)
 
     def libre_prof(self, prof_id: str, slot: Slot) -> bool:
-        return all(not slot.overlaps(a.slot) for a in self.prof_occupancy[prof_id])
+        return self.prof_index.libre(prof_id, slot)
+
+    def disponible_prof(self, prof_id: str, slot: Slot) -> bool:
+        return disponible_en(self.disponibilidad[prof_id], slot)
 
     def horas_prof_en_dia(self, prof_id: str, day: str) -> float:
-        return sum(a.slot.duration_hours() for a in self.prof_occupancy[prof_id] if a.slot.day == day)
+        return self.agregados.minutos_prof(prof_id, DAY_INDEX[day]) / 60
+
+    def cabe_en_tope(self, prof_id: str, day: str, horas: float) -> bool:
+        # tope de 6 h/día por profesor (incluye labs)
+        return self.agregados.minutos_prof(prof_id, DAY_INDEX[day]) + horas * 60 <= TOPE_MINUTOS
+
+    def dias_curso(self, code: str, tipo: str) -> List[int]:
+        return [a.slot.dia for a in self.por_curso.get((code, tipo), ())]
 
     # --- salas ---
+    def _indexar_salas(self):
+        # catálogo por (facultad, tipo) en el orden de self.rooms (la primera sala libre es la misma
+        # que recorriendo self.rooms); las salas que alcanzan cada capacidad se filtran una sola vez
+        self._catalogo: Dict[Tuple[str, str], List[Room]] = defaultdict(list)
+        for r in self.rooms:
+            self._catalogo[(r.faculty, r.kind)].append(r)
+        self._elegibles: Dict[Tuple[str, str, int], List[Room]] = {}
+
+    def salas_candidatas(self, faculty: str, kind: str, capacidad_req: int) -> List[Room]:
+        # lista compartida: no modificar
+        key = (faculty, kind, capacidad_req)
+        salas = self._elegibles.get(key)
+        if salas is None:
+            salas = self._elegibles[key] = [r for r in self._catalogo.get((faculty, kind), ()) if r.capacity >= capacidad_req]
+        return salas
+
     def salas_disponibles(self, faculty: str, kind: str, capacidad_req: int, slot: Slot) -> List[Room]:
-        cands = [r for r in self.rooms if r.faculty == faculty and r.kind == kind and r.capacity >= capacidad_req]
-        return [r for r in cands if self.libre_room(r.id, slot)]
+        return [r for r in self.salas_candidatas(faculty, kind, capacidad_req) if self.libre_room(r.id, slot)]
+
+    def primera_sala_libre(self, faculty: str, kind: str, capacidad_req: int, slot: Slot) -> Optional[Room]:
+        for r in self.salas_candidatas(faculty, kind, capacidad_req):
+            if self.libre_room(r.id, slot):
+                return r
+        return None
 
     # --- colocar ---
     def colocar(self, course: Course, group: str, slot: Slot, room: Room, professor_id: Optional[str]):
         asg = Assignment(course.code, group, slot, room.id, professor_id)
         self.assignments.append(asg)
+        self.por_curso[(course.code, group.split("-", 1)[0])].append(asg)
         self.room_occupancy[room.id].append(asg)
+        self.room_index.ocupar(room.id, slot)
+        self.agregados.ocupar(asg)
         if professor_id:
             self.prof_occupancy[professor_id].append(asg)
+            self.prof_index.ocupar(professor_id, slot)
+        if self._motor is not self:
+            self._motor.ocupar(asg)
+        return asg
 
     # --- Fase 1: Labs primero ---
     def fase_labs(self):
         lab_courses = [c for c in self.courses if c.inscritos_lab > 0 and self.ciclo_permitido(c.cycle)]
-        lab_courses.sort(key=lambda c: -math.ceil(c.inscritos_lab / 15))
+        if self._rng:
+            lab_courses.sort(key=lambda c: (-math.ceil(c.inscritos_lab / 15), self._rng.random()))
+        else:
+            lab_courses.sort(key=lambda c: -math.ceil(c.inscritos_lab / 15))
         for c in lab_courses:
-            grupos = math.ceil(c.inscritos_lab / 15)
-            prof = self.professors.get(c.profesor_id) if c.profesor_id else None
-            slots = generar_candidatos(c.duracion_lab_horas)
-            for g in range(1, grupos + 1):
-                asignado = False
-                for slot in slots:
-                    salas = self.salas_disponibles(c.faculty, "lab", 15, slot)
-                    if not salas:
-                        continue
-                    prof_id = None
-                    if prof and prof.disponible_labs and profesor_disponible(prof, slot) and self.libre_prof(prof.id, slot):
-                        if self.horas_prof_en_dia(prof.id, slot.day) + slot.duration_hours() <= 6:
-                            prof_id = prof.id
-                    # si el prof no hace labs, se permite asistente (prof_id None)
-                    self.colocar(c, f"Lab-{g}", slot, salas[0], prof_id)
-                    asignado = True
-                    break
-                if not asignado:
-                    self.alerts.append(f"Laboratorio no asignado: {c.name} requiere grupo Lab-{g} y no hay slot disponible")
+            self._colocar_labs(c)
+
+    def _colocar_labs(self, c: Course):
+        grupos = math.ceil(c.inscritos_lab / 15)
+        prof = self.professors.get(c.profesor_id) if c.profesor_id else None
+        slots = self._orden_slots(generar_candidatos(c.duracion_lab_horas))
+        for g in range(1, grupos + 1):
+            hallado = self._motor.buscar_lab(c, slots, prof)
+            if hallado is None:
+                self._alerta(("curso", c.code), f"Laboratorio no asignado: {c.name} requiere grupo Lab-{g} y no hay slot disponible")
+                continue
+            slot, sala, prof_id = hallado
+            # si el prof no hace labs, se permite asistente (prof_id None)
+            self.colocar(c, f"Lab-{g}", slot, sala, prof_id)
+
+    def buscar_lab(self, c: Course, slots: List[Slot], prof: Optional[Professor]) -> Optional[Tuple[Slot, Room, Optional[str]]]:
+        for slot in slots:
+            sala = self.primera_sala_libre(c.faculty, "lab", 15, slot)
+            if sala is None:
+                continue
+            prof_id = None
+            if prof and prof.disponible_labs and self.disponible_prof(prof.id, slot) and self.libre_prof(prof.id, slot):
+                if self.cabe_en_tope(prof.id, slot.day, slot.duration_hours()):
+                    prof_id = prof.id
+            return slot, sala, prof_id
+        return None
 
     # --- Fase 2: Teóricos ---
     def fase_teoricos(self):
         teo_courses = [c for c in self.courses if c.inscritos_teorico > 0 and self.ciclo_permitido(c.cycle)]
+        if self._rng:
+            self._rng.shuffle(teo_courses)
         for c in teo_courses:
-            grupos = []
-            if c.inscritos_teorico > 60:
-                grupos.append(("Teo-A", 60))
-                grupos.append(("Teo-B", c.inscritos_teorico - 60))
-            else:
-                grupos.append(("Teo-A", c.inscritos_teorico))
-
-            # proximidad a labs: día medio
-            lab_days_idx = [DAYS.index(a.slot.day) for a in self.assignments if a.course_code == c.code and a.group.startswith("Lab-")]
-            target_day = None
-            if lab_days_idx:
-                avg = round(sum(lab_days_idx) / len(lab_days_idx))
-                target_day = DAYS[min(max(avg, 0), len(DAYS)-1)]
-            slots = generar_candidatos(c.duracion_teorico_horas)
-            if target_day:
-                slots.sort(key=lambda s: abs(DAYS.index(s.day) - DAYS.index(target_day)))
-
-            prof = self.professors.get(c.profesor_id) if c.profesor_id else None
-            if prof and prof.habilitado_desde_ciclo > c.cycle:
-                self.alerts.append(f"Profesor no habilitado: {prof.name} desde {prof.habilitado_desde_ciclo}+ para {c.name} (ciclo {c.cycle})")
-                prof = None
-
-            if len(grupos) == 2:
-                if not self._colocar_teorico_doble_consecutivo(c, grupos, slots, prof):
-                    for (gname, cap) in grupos:
-                        self._colocar_teorico_simple(c, gname, cap, slots, prof)
-            else:
-                gname, cap = grupos[0]
-                self._colocar_teorico_simple(c, gname, cap, slots, prof)
+            self._colocar_teoricos(c)
+
+    def _orden_slots(self, slots: List[Slot]) -> List[Slot]:
+        # con seed: días en orden aleatorio, se conserva el orden horario dentro de cada día
+        if not self._rng:
+            return slots
+        rank = [0] * len(DAYS)
+        for i, d in enumerate(self._rng.sample(range(len(DAYS)), len(DAYS))):
+            rank[d] = i
+        slots.sort(key=lambda s: rank[s.dia])
+        return slots
+
+    def _colocar_teoricos(self, c: Course):
+        grupos = []
+        if c.inscritos_teorico > 60:
+            grupos.append(("Teo-A", 60))
+            grupos.append(("Teo-B", c.inscritos_teorico - 60))
+        else:
+            grupos.append(("Teo-A", c.inscritos_teorico))
+
+        # proximidad a labs: día medio
+        lab_days_idx = self.dias_curso(c.code, "Lab")
+        target_day = None
+        if lab_days_idx:
+            avg = round(sum(lab_days_idx) / len(lab_days_idx))
+            target_day = DAYS[min(max(avg, 0), len(DAYS)-1)]
+        slots = self._orden_slots(generar_candidatos(c.duracion_teorico_horas))
+        if target_day:
+            t_idx = DAY_INDEX[target_day]
+            slots.sort(key=lambda s: abs(s.dia - t_idx))
+
+        prof = self.professors.get(c.profesor_id) if c.profesor_id else None
+        if prof and prof.habilitado_desde_ciclo > c.cycle:
+            self._alerta(("curso", c.code), f"Profesor no habilitado: {prof.name} desde {prof.habilitado_desde_ciclo}+ para {c.name} (ciclo {c.cycle})")
+            prof = None
+
+        if len(grupos) == 2:
+            if not self._colocar_teorico_doble_consecutivo(c, grupos, slots, prof):
+                for (gname, cap) in grupos:
+                    self._colocar_teorico_simple(c, gname, cap, slots, prof)
+        else:
+            gname, cap = grupos[0]
+            self._colocar_teorico_simple(c, gname, cap, slots, prof)
 
     def _colocar_teorico_doble_consecutivo(self, c: Course, grupos, slots, prof: Optional[Professor]) -> bool:
+        hallado = self._motor.buscar_doble(c, grupos, slots, prof)
+        if hallado is None:
+            return False
+        s, sala_A, s2, sala_B, prof_id = hallado
+        self.colocar(c, grupos[0][0], s, sala_A, prof_id)
+        self.colocar(c, grupos[1][0], s2, sala_B, prof_id)
+        return True
+
+    def buscar_doble(self, c: Course, grupos, slots: List[Slot], prof: Optional[Professor]):
         dur = c.duracion_teorico_horas * 60
         gap = 30
         for s in slots:
-            s2 = Slot(s.day, s.end + gap, s.end + gap + dur)
+            s2 = Slot(s.dia, s.end + gap, s.end + gap + dur)
             if s2.end > END_MINUTES:
                 continue
-            salas_A = self.salas_disponibles(c.faculty, "teorico", min(60, grupos[0][1]), s)
-            salas_B = self.salas_disponibles(c.faculty, "teorico", min(60, grupos[1][1]), s2)
-            if not salas_A or not salas_B:
+            sala_A = self.primera_sala_libre(c.faculty, "teorico", min(60, grupos[0][1]), s)
+            if sala_A is None:
+                continue
+            sala_B = self.primera_sala_libre(c.faculty, "teorico", min(60, grupos[1][1]), s2)
+            if sala_B is None:
                 continue
             prof_id = None
-            if prof and all([profesor_disponible(prof, s), profesor_disponible(prof, s2), self.libre_prof(prof.id, s), self.libre_prof(prof.id, s2)]):
-                if self.horas_prof_en_dia(prof.id, s.day) + s.duration_hours() + s2.duration_hours() <= 6:
+            if prof and all([self.disponible_prof(prof.id, s), self.disponible_prof(prof.id, s2), self.libre_prof(prof.id, s), self.libre_prof(prof.id, s2)]):
+                if self.cabe_en_tope(prof.id, s.day, s.duration_hours() + s2.duration_hours()):
                     prof_id = prof.id
-            self.colocar(c, grupos[0][0], s, salas_A[0], prof_id)
-            self.colocar(c, grupos[1][0], s2, salas_B[0], prof_id)
-            return True
-        return False
+            return s, sala_A, s2, sala_B, prof_id
+        return None
 
     def _colocar_teorico_simple(self, c: Course, gname: str, cap: int, slots, prof: Optional[Professor]):
+        hallado = self._motor.buscar_simple(c, cap, slots, prof)
+        if hallado is None:
+            self._alerta(("curso", c.code), f"Teórico no asignado: {c.name} {gname}")
+            return
+        s, sala, prof_id = hallado
+        self.colocar(c, gname, s, sala, prof_id)
+
+    def buscar_simple(self, c: Course, cap: int, slots: List[Slot], prof: Optional[Professor]) -> Optional[Tuple[Slot, Room, Optional[str]]]:
         for s in slots:
-            salas = self.salas_disponibles(c.faculty, "teorico", min(60, cap), s)
-            if not salas:
+            sala = self.primera_sala_libre(c.faculty, "teorico", min(60, cap), s)
+            if sala is None:
                 continue
             prof_id = None
-            if prof and profesor_disponible(prof, s) and self.libre_prof(prof.id, s):
-                if self.horas_prof_en_dia(prof.id, s.day) + s.duration_hours() <= 6:
+            if prof and self.disponible_prof(prof.id, s) and self.libre_prof(prof.id, s):
+                if self.cabe_en_tope(prof.id, s.day, s.duration_hours()):
                     prof_id = prof.id
             elif prof:
                 # profesor existe pero no cabe en disponibilidad/tope
                 pass
-            self.colocar(c, gname, s, salas[0], prof_id)
-            return
-        self.alerts.append(f"Teórico no asignado: {c.name} {gname}")
+            return s, sala, prof_id
+        return None
+
+    # --- Fase 1+2 alternativa: búsqueda exacta ---
+    def fase_csp(self):
+        # búsqueda exacta por bloques (facultad o ciclos) partiendo del greedy (ver csp.resolver_por_bloques)
+        from .csp import resolver_por_bloques
+        stats = resolver_por_bloques(self, self.time_budget if self.time_budget is not None else CSP_TIME_BUDGET)
+        # mismas definiciones que puntaje() (sin_profesor incluye labs con asistente)
+        puntaje = self.puntaje()
+        self.csp_stats = {**stats, "sin_asignar": puntaje["sin_asignar"], "sin_profesor": puntaje["sin_profesor"]}
 
     # --- Fase 3: Validaciones ---
     def fase_validaciones(self):
         # cursos fuera de semestre
         for c in self.courses:
-            if not self.ciclo_permitido(c.cycle):
-                self.alerts.append(f"Curso fuera del ciclo permitido ({self.semester}): {c.name} (ciclo {c.cycle})")
+            self._validar_ciclo(c)
 
         # huecos > 2 días entre teórico y lab
         for c in self.courses:
-            dias_teo = [a for a in self.assignments if a.course_code == c.code and a.group.startswith("Teo-")]
-            dias_lab = [a for a in self.assignments if a.course_code == c.code and a.group.startswith("Lab-")]
-            if dias_teo and dias_lab:
-                t_idx = [DAYS.index(a.slot.day) for a in dias_teo]
-                l_idx = [DAYS.index(a.slot.day) for a in dias_lab]
-                min_gap = min(abs(t - l) for t in t_idx for l in l_idx)
-                if min_gap > 2:
-                    self.alerts.append(f"Hueco >2 días entre teórico y lab: {c.name} (min {min_gap} días)")
+            self._validar_hueco(c)
 
         # profesor >6h por día
-        for pid, asigns in self.prof_occupancy.items():
-            horas = {}
-            for a in asigns:
-                horas.setdefault(a.slot.day, 0.0)
-                horas[a.slot.day] += a.slot.duration_hours()
-            for d, h in horas.items():
-                if h > 6:
-                    self.alerts.append(f"Profesor {self.professors[pid].name} sobrepasó horas máximas el {d}: {h:.1f}h")
-
-    def build(self):
+        for pid in self.prof_occupancy:
+            self._validar_horas_prof(pid)
+
+    def _validar_ciclo(self, c: Course):
+        if not self.ciclo_permitido(c.cycle):
+            self._alerta(("curso", c.code), f"Curso fuera del ciclo permitido ({self.semester}): {c.name} (ciclo {c.cycle})")
+
+    def _validar_hueco(self, c: Course):
+        t_idx = set(self.dias_curso(c.code, "Teo"))
+        l_idx = set(self.dias_curso(c.code, "Lab"))
+        if t_idx and l_idx:
+            # a lo sumo len(DAYS) días distintos por lado
+            min_gap = min(abs(t - l) for t in t_idx for l in l_idx)
+            if min_gap > 2:
+                self._alerta(("curso", c.code), f"Hueco >2 días entre teórico y lab: {c.name} (min {min_gap} días)")
+
+    def _validar_horas_prof(self, pid: str):
+        for d, m in self.agregados.prof_dia.get(pid, {}).items():
+            if m > TOPE_MINUTOS:
+                self._alerta(("prof", pid), f"Profesor {self.professors[pid].name} sobrepasó horas máximas el {DAYS[d]}: {m / 60:.1f}h")
+
+    def validar(self):
+        # validación completa del horario actual con alertas estructuradas (ver validation.py)
+        from .validation import validar
+        return validar(self.semester, self.rooms, self.professors.values(), self.courses, self.assignments)
+
+    def build(self, cache=None):
+        # cache: ResultCache opcional; un hit restaura exactamente el resultado de un build() previo
+        if self.engine == "csp":
+            # con presupuesto de tiempo el resultado no es determinista: no se cachea
+            self.fase_csp()
+            self.fase_validaciones()
+            return
+        if self._rng is not None:
+            # variante perturbada (seed): no es el build() determinista que identifica la clave
+            cache = None
+        clave = None
+        if cache is not None:
+            clave = clave_entradas(self.semester, self.rooms, self.professors.values(), self.courses, self.assistants_pool)
+            hit = cache.get(clave)
+            if hit is not None:
+                self._restaurar(*hit)
+                return
         self.fase_labs()
         self.fase_teoricos()
         self.fase_validaciones()
+        if cache is not None:
+            cache.put(clave, self.assignments, self.alerts, self.alert_keys)
+
+    def _restaurar(self, assignments: List[Assignment], alerts: List[str], alert_keys: List[Tuple[str, str]]):
+        salas = {r.id: r for r in self.rooms}
+        for a in assignments:
+            self.colocar(self.cursos_por_codigo[a.course_code], a.group, a.slot, salas[a.room_id], a.professor_id)
+        self.alerts = list(alerts)
+        self.alert_keys = list(alert_keys)
+
+    def puntaje(self) -> Dict[str, int]:
+        # menor es mejor; build_multistart compara en este orden
+        esperados = 0
+        for c in self.courses:
+            if self.ciclo_permitido(c.cycle):
+                if c.inscritos_lab > 0:
+                    esperados += math.ceil(c.inscritos_lab / 15)
+                if c.inscritos_teorico > 0:
+                    esperados += 2 if c.inscritos_teorico > 60 else 1
+        huecos = 0
+        for c in self.courses:
+            t_idx = set(self.dias_curso(c.code, "Teo"))
+            l_idx = set(self.dias_curso(c.code, "Lab"))
+            if t_idx and l_idx and min(abs(t - l) for t in t_idx for l in l_idx) > 2:
+                huecos += 1
+        return {
+            "sin_asignar": esperados - len(self.assignments),
+            "sin_profesor": sum(1 for a in self.assignments if a.professor_id is None),
+            "huecos": huecos,
+            "sobrecarga": self.agregados.sobrecarga,
+        }
+
+    def build_multistart(self, n: int = 8, workers: int = 1, time_budget: Optional[float] = None, seed: int = 0) -> Dict[str, int]:
+        # n variantes (la 0 es el build() determinista) y se queda con la de mejor puntaje
+        from .multistart import mejor_variante
+        assignments, alerts, alert_keys, score = mejor_variante(self, n, workers, time_budget, seed)
+        self._restaurar(assignments, alerts, alert_keys)
+        return score
+
+    def build_por_facultad(self, workers: int = 1) -> Dict[str, object]:
+        # fases de labs y teóricos por facultad en procesos separados + conciliación de
+        # profesores compartidos (ver partition.py); el resultado puede diferir del de build()
+        if self.engine == "csp":
+            raise ValueError("El build por facultad no aplica al motor csp")
+        from .partition import construir_por_facultad
+        return construir_por_facultad(self, workers)
+
+    def comparar_escenarios(self, escenarios, workers: int = 1) -> List[dict]:
+        # escenarios "qué pasa si" sobre estas entradas (sin construir este horario), ver scenarios.py
+        from .scenarios import comparar
+        return comparar(self, escenarios, workers)
+
+    # --- Post-optimización: búsqueda local sobre el horario ya construido ---
+    def optimizar(self, iteraciones: int = 20000, time_budget: Optional[float] = None, seed: int = 0) -> Dict[str, float]:
+        from .localsearch import BusquedaLocal
+        return BusquedaLocal(self, seed).optimizar(iteraciones, time_budget)
 
-    # --- Export ---
-    def export_excel(self, path: str = "horarios.xlsx"):
+    # --- Cambios incrementales (sin reconstruir todo el horario) ---
+    def liberar(self, asg: Assignment):
+        self.room_occupancy[asg.room_id].remove(asg)
+        self.room_index.liberar(asg.room_id, asg.slot)
+        self.agregados.liberar(asg)
+        if asg.professor_id:
+            self.prof_occupancy[asg.professor_id].remove(asg)
+            self.prof_index.liberar(asg.professor_id, asg.slot)
+        self.por_curso[(asg.course_code, asg.group.split("-", 1)[0])].remove(asg)
+        if self._motor is not self:
+            self._motor.liberar(asg)
+
+    def _recolocar(self, codes: set, quitar: bool = False):
+        # libera los cursos afectados, descarta sus alertas y los vuelve a colocar con las mismas fases
+        profs = set()
+        salen = [a for a in self.assignments if a.course_code in codes]
+        for a in salen:
+            self.liberar(a)
+            if a.professor_id:
+                profs.add(a.professor_id)
+        if salen:
+            self.assignments = [a for a in self.assignments if a.course_code not in codes]
+        for code in codes:
+            self.por_curso.pop((code, "Teo"), None)
+            self.por_curso.pop((code, "Lab"), None)
+        cursos = [] if quitar else [self.cursos_por_codigo[code] for code in codes if code in self.cursos_por_codigo]
+        profs.update(c.profesor_id for c in cursos if c.profesor_id in self.professors)
+        self._quitar_alertas({("curso", code) for code in codes} | {("prof", pid) for pid in profs})
+        self._colocar_cursos(cursos)
+        for c in cursos:
+            self._validar_ciclo(c)
+            self._validar_hueco(c)
+        for pid in profs:
+            self._validar_horas_prof(pid)
+
+    def _quitar_alertas(self, claves: set):
+        quedan = [(k, m) for k, m in zip(self.alert_keys, self.alerts) if k not in claves]
+        self.alert_keys = [k for k, _ in quedan]
+        self.alerts = [m for _, m in quedan]
+
+    def _colocar_cursos(self, cursos: List[Course]):
+        # mismas fases que build() (labs y luego teóricos) para un subconjunto de cursos
+        permitidos = [c for c in cursos if self.ciclo_permitido(c.cycle)]
+        labs = [c for c in permitidos if c.inscritos_lab > 0]
+        labs.sort(key=lambda c: -math.ceil(c.inscritos_lab / 15))
+        for c in labs:
+            self._colocar_labs(c)
+        for c in permitidos:
+            if c.inscritos_teorico > 0:
+                self._colocar_teoricos(c)
+
+    def agregar_curso(self, course: Course):
+        if course.code in self.cursos_por_codigo:
+            raise ValueError(f"Curso ya existe: {course.code}")
+        self.courses.append(course)
+        self.cursos_por_codigo[course.code] = course
+        self._recolocar({course.code})
+
+    def quitar_curso(self, code: str):
+        course = self.cursos_por_codigo.pop(code)
+        self.courses.remove(course)
+        self._recolocar({code}, quitar=True)
+
+    def modificar_curso(self, course: Course):
+        anterior = self.cursos_por_codigo[course.code]
+        self.courses[self.courses.index(anterior)] = course
+        self.cursos_por_codigo[course.code] = course
+        self._recolocar({course.code})
+
+    def cambiar_disponibilidad(self, prof_id: str, disponibilidad: Dict[str, List[Tuple[str, str]]]):
+        prof = self.professors[prof_id]
+        nueva = Professor(prof.id, prof.name, prof.habilitado_desde_ciclo, prof.disponible_labs, disponibilidad)
+        self.disponibilidad[prof_id] = compilar_disponibilidad(nueva)  # valida antes de tocar nada
+        prof.disponibilidad = disponibilidad
+        if self._motor is not self:
+            self._motor.actualizar_disponibilidad(prof_id)
+        codes = {c.code for c in self.courses if c.profesor_id == prof_id}
+        codes.update(a.course_code for a in self.prof_occupancy[prof_id])
+        self._recolocar(codes)
+
+    def retirar_sala(self, room_id: str):
+        if all(r.id != room_id for r in self.rooms):
+            raise KeyError(room_id)
+        self.rooms = [r for r in self.rooms if r.id != room_id]
+        self._indexar_salas()
+        self._recolocar({a.course_code for a in self.room_occupancy[room_id]})
+        self.agregados.quitar_sala(room_id)
+
+    # --- Snapshot binario (ver snapshot.py) ---
+    def save_snapshot(self, path: str):
+        from .snapshot import guardar
+        guardar(self, path)
+
+    @classmethod
+    def load_snapshot(cls, path: str, engine: str = "python", time_budget: Optional[float] = None) -> "Scheduler":
+        # restaura entradas y resultado sin volver a ejecutar build()
+        from .snapshot import Snapshot
+        with Snapshot(path) as snap:
+            semester, rooms, profs, courses, assistants = snap.entradas()
+            resultado = snap.resultado()
+        s = cls(semester, rooms, profs, courses, assistants, engine=engine, time_budget=time_budget)
+        s._restaurar(*resultado)
+        return s
+
+    # --- Export (streaming, ver export.py) ---
+    def export_excel(self, path="horarios.xlsx"):
         try:
-            from openpyxl import Workbook
+            import openpyxl  # noqa: F401
         except Exception:
             return
-        wb = Workbook()
-        wb.remove(wb.active)
-        por_fac_ciclo = defaultdict(list)
-        cursos_map = {c.code: c for c in self.courses}
-        for a in self.assignments:
-            c = cursos_map[a.course_code]
-            por_fac_ciclo[(c.faculty, c.cycle)].append(a)
-        for (fac, cyc), asigns in por_fac_ciclo.items():
-            title = f"{fac}-C{cyc}"[:31]
-            ws = wb.create_sheet(title)
-            ws.append(["Curso", "Grupo", "Día", "Inicio", "Fin", "Sala", "Profesor"])
-            for a in sorted(asigns, key=lambda x: (DAYS.index(x.slot.day), x.slot.start, x.course_code, x.group)):
-                prof_name = self.professors[a.professor_id].name if a.professor_id else "Asistente/No asignado"
-                ws.append([cursos_map[a.course_code].name, a.group, a.slot.day, minutes_to_hhmm(a.slot.start), minutes_to_hhmm(a.slot.end), a.room_id, prof_name])
-        ws = wb.create_sheet("Alertas")
-        ws.append(["Mensaje"])
-        for msg in self.alerts:
-            ws.append([msg])
-        wb.save(path)
-
-    def export_pdf_alertas(self, path: str = "alertas.pdf"):
+        from .export import escribir_excel
+        escribir_excel(self, path)
+
+    def export_pdf_alertas(self, path="alertas.pdf"):
         try:
-            from reportlab.lib.pagesizes import A4
-            from reportlab.pdfgen import canvas
+            import reportlab  # noqa: F401
         except Exception:
             return
-        c = canvas.Canvas(path, pagesize=A4)
-        width, height = A4
-        x, y = 40, height - 50
-        c.setFont("Helvetica-Bold", 14)
-        c.drawString(x, y, "Alertas de Horarios")
-        y -= 20
-        c.setFont("Helvetica", 10)
-        if not self.alerts:
-            c.drawString(x, y, "No se registraron alertas.")
-        else:
-            for msg in self.alerts:
-                if y < 60:
-                    c.showPage()
-                    y = height - 50
-                    c.setFont("Helvetica", 10)
-                c.drawString(x, y, f"• {msg}")
-                y -= 14
-        c.save()
+        from .export import escribir_pdf_alertas
+        escribir_pdf_alertas(self, path)
+
+    def exportar(self, excel_path="horarios.xlsx", pdf_path="alertas.pdf"):
+        # uno después del otro: con el GIL, dos hilos no bajaban el tiempo total
+        self.export_excel(excel_path)
+        self.export_pdf_alertas(pdf_path)
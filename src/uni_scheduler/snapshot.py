@@ -0,0 +1,213 @@
+from __future__ import annotations
+import mmap, os, struct, sys
+from array import array
+from typing import Dict, List, Optional, Tuple
+from .models import Room, Professor, Course, Slot, Assignment, DAYS
+
+# Snapshot binario de un horario (entradas + assignments + alertas), versionado.
+#
+#   cabecera:  "UNIS" | versión u16 | reservado u16 | n secciones u32
+#   índice:    n × (offset u64, largo en bytes u64)
+#   secciones: alineadas a 8 bytes; todas son arreglos int32 little-endian salvo CADENAS
+#
+# Los ids, nombres, grupos y alertas van a una tabla de cadenas internadas (cada cadena una
+# sola vez); el resto son filas de enteros de ancho fijo con índices a esa tabla (-1 = None).
+# Al cargar se mapea el archivo y las secciones se leen como memoryview sin copiar ni parsear.
+
+MAGIA = b"UNIS"
+VERSION = 1
+_CABECERA = struct.Struct("<4sHHI")
+_ENTRADA = struct.Struct("<QQ")
+
+# secciones y ancho de fila (en int32)
+DESPLAZAMIENTOS, CADENAS, META, ASISTENTES, SALAS, PROFESORES, VENTANAS, CURSOS, ASIGNACIONES, ALERTAS = range(10)
+ANCHO = {
+    DESPLAZAMIENTOS: 1,
+    META: 1,          # semester
+    ASISTENTES: 1,
+    SALAS: 4,         # id, faculty, kind, capacity
+    PROFESORES: 4,    # id, name, habilitado_desde_ciclo, disponible_labs
+    VENTANAS: 4,      # profesor (fila), día, inicio, fin (inicio -1 = día sin ventanas)
+    CURSOS: 9,        # code, name, faculty, cycle, inscritos T/L, duración T/L, profesor_id
+    ASIGNACIONES: 7,  # course_code, group, día, start, end, room_id, professor_id
+    ALERTAS: 3,       # mensaje, tipo de clave, id de clave
+}
+_NATIVO = sys.byteorder == "little"
+
+class _Tabla:
+    # internado de cadenas: índice estable por valor
+    def __init__(self):
+        self.indice: Dict[str, int] = {}
+        self.cadenas: List[str] = []
+
+    def __call__(self, s: Optional[str]) -> int:
+        if s is None:
+            return -1
+        i = self.indice.get(s)
+        if i is None:
+            i = self.indice[s] = len(self.cadenas)
+            self.cadenas.append(s)
+        return i
+
+def _enteros(valores) -> array:
+    a = array("i", valores)
+    if not _NATIVO:
+        a.byteswap()
+    return a
+
+# --- escritura ---
+def guardar(sched, path: str):
+    t = _Tabla()
+    secciones: Dict[int, array] = {}
+    secciones[META] = _enteros([t(sched.semester)])
+    secciones[ASISTENTES] = _enteros(t(a) for a in sched.assistants_pool)
+    salas = array("i")
+    for r in sched.rooms:
+        salas.extend((t(r.id), t(r.faculty), t(r.kind), r.capacity))
+    profs, ventanas = array("i"), array("i")
+    for i, p in enumerate(sched.professors.values()):
+        profs.extend((t(p.id), t(p.name), p.habilitado_desde_ciclo, int(p.disponible_labs)))
+        for day, vs in p.disponibilidad.items():
+            if not vs:
+                ventanas.extend((i, DAYS.index(day), -1, -1))
+            for ini, fin in vs:
+                ventanas.extend((i, DAYS.index(day), t(ini), t(fin)))
+    cursos = array("i")
+    for c in sched.courses:
+        cursos.extend((t(c.code), t(c.name), t(c.faculty), c.cycle, c.inscritos_teorico, c.inscritos_lab,
+                       c.duracion_teorico_horas, c.duracion_lab_horas, t(c.profesor_id)))
+    asigs = array("i")
+    for a in sched.assignments:
+        asigs.extend((t(a.course_code), t(a.group), a.slot.dia, a.slot.start, a.slot.end, t(a.room_id), t(a.professor_id)))
+    alertas = array("i")
+    for (tipo, eid), msg in zip(sched.alert_keys, sched.alerts):
+        alertas.extend((t(msg), t(tipo), t(eid)))
+    for sec, arr in ((SALAS, salas), (PROFESORES, profs), (VENTANAS, ventanas), (CURSOS, cursos), (ASIGNACIONES, asigs), (ALERTAS, alertas)):
+        if not _NATIVO:
+            arr.byteswap()
+        secciones[sec] = arr
+
+    datos = bytearray()
+    desp = [0]
+    for s in t.cadenas:
+        datos += s.encode("utf-8")
+        desp.append(len(datos))
+    secciones[DESPLAZAMIENTOS] = _enteros(desp)
+    secciones[CADENAS] = datos
+
+    n = len(ANCHO) + 1
+    pos = _CABECERA.size + n * _ENTRADA.size
+    indice, cuerpo = [], bytearray()
+    for sec in range(n):
+        raw = bytes(secciones[sec])
+        relleno = -(pos + len(cuerpo)) % 8
+        cuerpo += b"\0" * relleno
+        indice.append((pos + len(cuerpo), len(raw)))
+        cuerpo += raw
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(_CABECERA.pack(MAGIA, VERSION, 0, n))
+        for entrada in indice:
+            f.write(_ENTRADA.pack(*entrada))
+        f.write(cuerpo)
+    os.replace(tmp, path)
+
+# --- lectura ---
+class Snapshot:
+    # vista mapeada en memoria; filas(sec) y cadena(i) leen directamente del archivo
+    def __init__(self, path: str):
+        self._f = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # archivo vacío
+            self._f.close()
+            raise ValueError(f"Snapshot inválido: {path}") from None
+        try:
+            self._vistas: List[memoryview] = []
+            self._indexar(path)
+        except BaseException:
+            self.cerrar()
+            raise
+
+    def _indexar(self, path: str):
+        if len(self._mm) < _CABECERA.size:
+            raise ValueError(f"Snapshot inválido: {path}")
+        magia, version, _, n = _CABECERA.unpack_from(self._mm, 0)
+        if magia != MAGIA:
+            raise ValueError(f"Snapshot inválido: {path}")
+        if version != VERSION:
+            raise ValueError(f"Versión de snapshot no soportada: {version} (se esperaba {VERSION})")
+        if n < len(ANCHO) + 1 or _CABECERA.size + n * _ENTRADA.size > len(self._mm):
+            raise ValueError(f"Snapshot truncado: {path}")
+        self._secciones: List[memoryview] = []
+        base = memoryview(self._mm)
+        self._vistas.append(base)
+        for k in range(n):
+            off, largo = _ENTRADA.unpack_from(self._mm, _CABECERA.size + k * _ENTRADA.size)
+            if off + largo > len(self._mm):
+                raise ValueError(f"Snapshot truncado: {path}")
+            self._secciones.append(base[off:off + largo])
+            self._vistas.append(self._secciones[-1])
+        self._cadenas = self._secciones[CADENAS]
+        self._desp = self._enteros(DESPLAZAMIENTOS)
+
+    def _enteros(self, sec: int):
+        raw = self._secciones[sec]
+        if _NATIVO:
+            v = raw.cast("i")
+            self._vistas.append(v)
+            return v
+        a = array("i", bytes(raw))
+        a.byteswap()
+        return a
+
+    def cadena(self, i: int) -> Optional[str]:
+        if i < 0:
+            return None
+        return str(self._cadenas[self._desp[i]:self._desp[i + 1]], "utf-8")
+
+    def filas(self, sec: int) -> List[tuple]:
+        it = iter(self._enteros(sec).tolist())
+        return list(zip(*[it] * ANCHO[sec]))
+
+    def __len__(self) -> int:
+        return len(self._enteros(ASIGNACIONES)) // ANCHO[ASIGNACIONES]
+
+    def cerrar(self):
+        # las memoryview deben soltarse antes de cerrar el mmap
+        for v in reversed(getattr(self, "_vistas", [])):
+            v.release()
+        self._vistas = []
+        if getattr(self, "_mm", None) is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    # --- modelos ---
+    def entradas(self) -> Tuple[str, List[Room], List[Professor], List[Course], List[str]]:
+        cs: List[Optional[str]] = [self.cadena(i) for i in range(len(self._desp) - 1)]
+        s = lambda i: cs[i] if i >= 0 else None
+        rooms = [Room(cs[rid], cs[fac], cs[kind], cap) for rid, fac, kind, cap in self.filas(SALAS)]
+        profs = [Professor(cs[pid], cs[name], hab, bool(labs), {}) for pid, name, hab, labs in self.filas(PROFESORES)]
+        for i, d, ini, fin in self.filas(VENTANAS):
+            vs = profs[i].disponibilidad.setdefault(DAYS[d], [])
+            if ini >= 0:
+                vs.append((cs[ini], cs[fin]))
+        courses = [Course(cs[code], cs[name], cs[fac], cyc, it, il, dt, dl, s(pid))
+                   for code, name, fac, cyc, it, il, dt, dl, pid in self.filas(CURSOS)]
+        asistentes = [cs[i] for i, in self.filas(ASISTENTES)]
+        self._cs = cs
+        return cs[self.filas(META)[0][0]], rooms, profs, courses, asistentes
+
+    def resultado(self) -> Tuple[List[Assignment], List[str], List[Tuple[str, str]]]:
+        cs = getattr(self, "_cs", None) or [self.cadena(i) for i in range(len(self._desp) - 1)]
+        assignments = [Assignment(cs[code], cs[grp], Slot(d, ini, fin), cs[room], cs[prof] if prof >= 0 else None)
+                       for code, grp, d, ini, fin, room, prof in self.filas(ASIGNACIONES)]
+        filas = self.filas(ALERTAS)
+        return assignments, [cs[m] for m, _, _ in filas], [(cs[t], cs[e]) for _, t, e in filas]
@@ -0,0 +1,83 @@
+from __future__ import annotations
+import random
+from typing import Dict, List, Sequence, Tuple
+from .models import Room, Professor, Course, DAYS, START_MINUTES, END_MINUTES, SLOT, minutes_to_hhmm
+
+# Generador de campus sintéticos (mismo formato que dataset_ejemplo) para medir escalabilidad.
+
+FACULTADES = ("Ingeniería", "Ciencias", "Letras")
+CAP_TEORICO = (30, 40, 50, 60, 60, 80)
+CAP_LAB = (15, 20, 20, 25)
+
+def _ventanas(rng: random.Random, densidad: float) -> List[Tuple[str, str]]:
+    # una o dos ventanas alineadas a SLOT; densidad ~ fracción del día cubierta
+    bloques = (END_MINUTES - START_MINUTES) // SLOT
+    largo = max(4, round(bloques * densidad * rng.uniform(0.7, 1.3)))
+    largo = min(largo, bloques)
+    ini = rng.randint(0, bloques - largo)
+    if largo >= 12 and rng.random() < 0.3:
+        corte = rng.randint(ini + 4, ini + largo - 4)
+        partes = [(ini, corte), (corte + 2, ini + largo)]
+    else:
+        partes = [(ini, ini + largo)]
+    return [(minutes_to_hhmm(START_MINUTES + a * SLOT), minutes_to_hhmm(START_MINUTES + min(b, bloques) * SLOT)) for a, b in partes if b > a]
+
+def campus_sintetico(
+    cursos: int = 1000,
+    facultades: Sequence[str] = FACULTADES,
+    salas_por_curso: float = 0.06,
+    proporcion_labs: float = 0.25,
+    profesores_por_curso: float = 0.35,
+    densidad_disponibilidad: float = 0.6,
+    dias_disponibles: float = 0.8,
+    proporcion_con_lab: float = 0.4,
+    proporcion_impares: float = 0.5,
+    seed: int = 0,
+):
+    rng = random.Random(seed)
+    pesos_fac = [rng.uniform(0.6, 1.4) for _ in facultades]
+
+    rooms: List[Room] = []
+    n_salas = max(len(facultades) * 2, round(cursos * salas_por_curso))
+    por_fac: Dict[str, int] = {f: 0 for f in facultades}
+    for i in range(n_salas):
+        fac = facultades[i % len(facultades)] if i < len(facultades) * 2 else rng.choices(facultades, pesos_fac)[0]
+        por_fac[fac] += 1
+        lab = (i // len(facultades)) % 2 == 1 if i < len(facultades) * 2 else rng.random() < proporcion_labs
+        pref = fac[:3]
+        if lab:
+            rooms.append(Room(f"{pref}-Lab{por_fac[fac]}", fac, "lab", rng.choice(CAP_LAB)))
+        else:
+            rooms.append(Room(f"{pref}-{100 + por_fac[fac]}", fac, "teorico", rng.choice(CAP_TEORICO)))
+
+    profs: List[Professor] = []
+    for i in range(max(1, round(cursos * profesores_por_curso))):
+        disp = {d: _ventanas(rng, densidad_disponibilidad) for d in DAYS if rng.random() < dias_disponibles}
+        profs.append(Professor(
+            id=f"p{i + 1}",
+            name=f"Prof. {i + 1}",
+            habilitado_desde_ciclo=rng.choices((1, 2, 3, 5), (6, 2, 2, 1))[0],
+            disponible_labs=rng.random() < 0.7,
+            disponibilidad=disp,
+        ))
+
+    courses: List[Course] = []
+    for i in range(cursos):
+        fac = rng.choices(facultades, pesos_fac)[0]
+        impar = rng.random() < proporcion_impares
+        cycle = rng.choice((1, 3, 5, 7, 9) if impar else (2, 4, 6, 8, 10))
+        con_lab = rng.random() < proporcion_con_lab
+        courses.append(Course(
+            code=f"{fac[:3].upper()}{i + 1:05d}",
+            name=f"Curso {i + 1}",
+            faculty=fac,
+            cycle=cycle,
+            inscritos_teorico=rng.randint(15, 120),
+            inscritos_lab=rng.randint(10, 60) if con_lab else 0,
+            duracion_teorico_horas=rng.choice((2, 2, 3)),
+            duracion_lab_horas=rng.choice((2, 2, 3)),
+            profesor_id=rng.choice(profs).id if rng.random() < 0.95 else None,
+        ))
+
+    assistants = [f"asist{i + 1}" for i in range(max(1, cursos // 50))]
+    return rooms, profs, courses, assistants
@@ -1,22 +1,62 @@
-from typing import List
+from functools import lru_cache
+from typing import Dict, List, Tuple
 from .models import Slot, DAYS, START_MINUTES, END_MINUTES, SLOT, hhmm_to_minutes, minutes_to_hhmm
+from .occupancy import slot_mask, ventana_mask
 
-def generar_candidatos(duracion_horas: int) -> List[Slot]:
+@lru_cache(maxsize=None)
+def _candidatos(duracion_horas: int) -> Tuple[Slot, ...]:
+    # los Slot son inmutables: se crean una vez por duración y se comparten
     delta = duracion_horas * 60
     slots: List[Slot] = []
-    for d in DAYS:
+    for d in range(len(DAYS)):
         t = START_MINUTES
         while t + delta <= END_MINUTES:
             slots.append(Slot(d, t, t + delta))
             t += SLOT
-    return slots
+    return tuple(slots)
+
+def generar_candidatos(duracion_horas: int) -> List[Slot]:
+    # lista nueva (el llamador puede reordenarla) con los Slot cacheados
+    return list(_candidatos(duracion_horas))
+
+# disponibilidad del profesor como bitmask por día (mismos bloques que occupancy);
+# las ventanas contiguas o solapadas quedan unidas
+def compilar_disponibilidad(prof) -> Dict[str, int]:
+    masks: Dict[str, int] = {}
+    for day, ventanas in prof.disponibilidad.items():
+        if day not in DAYS:
+            raise ValueError(f"Disponibilidad inválida para {prof.id}: día desconocido {day!r}")
+        m = 0
+        for ventana in ventanas:
+            try:
+                ini, fin = ventana
+                s, e = hhmm_to_minutes(ini), hhmm_to_minutes(fin)
+            except (ValueError, TypeError, AttributeError):
+                raise ValueError(f"Disponibilidad inválida para {prof.id}: ventana {ventana!r} en {day}") from None
+            if not (0 <= s < e <= 24 * 60):
+                raise ValueError(f"Disponibilidad inválida para {prof.id}: ventana {ini}-{fin} en {day}")
+            m |= ventana_mask(s, e)
+        masks[day] = m
+    return masks
+
+def disponible_en(masks: Dict[str, int], slot: Slot) -> bool:
+    m = slot_mask(slot)
+    return (masks.get(slot.day, 0) & m) == m
+
+def ventanas_unidas(prof) -> Dict[str, List[Tuple[int, int]]]:
+    # ventanas en minutos exactos por día, unidas si se tocan o solapan (como las máscaras)
+    dias: Dict[str, List[Tuple[int, int]]] = {}
+    for day, vs in prof.disponibilidad.items():
+        unidas: List[Tuple[int, int]] = []
+        for ini, fin in sorted((hhmm_to_minutes(i), hhmm_to_minutes(f)) for i, f in vs):
+            if unidas and ini <= unidas[-1][1]:
+                unidas[-1] = (unidas[-1][0], max(unidas[-1][1], fin))
+            else:
+                unidas.append((ini, fin))
+        dias[day] = unidas
+    return dias
 
 def profesor_disponible(prof, slot: Slot) -> bool:
-    if slot.day not in prof.disponibilidad:
-        return False
-    for (ini, fin) in prof.disponibilidad[slot.day]:
-        s = hhmm_to_minutes(ini)
-        e = hhmm_to_minutes(fin)
-        if s <= slot.start and slot.end <= e:
-            return True
-    return False
+    # contención exacta en una ventana unida (sin redondear a bloques): coincide con el Scheduler
+    # en los slots alineados a SLOT de generar_candidatos y sirve también para slots desalineados
+    return any(ini <= slot.start and slot.end <= fin for ini, fin in ventanas_unidas(prof).get(slot.day, ()))
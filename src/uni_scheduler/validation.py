@@ -0,0 +1,183 @@
+from __future__ import annotations
+import math
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+from .models import Room, Professor, Course, Assignment, DAYS, START_MINUTES, END_MINUTES, minutes_to_hhmm
+from .utils import ventanas_unidas
+
+# Validación independiente de build(): revisa un conjunto de asignaciones (p. ej. un
+# horarios.xlsx editado a mano) contra todas las reglas. Capacidad, tipo de sala y
+# disponibilidad cuestan O(1) por asignación (ventanas exactas, sin redondear a bloques: los
+# horarios editados a mano pueden no estar alineados); después cada (recurso, día) se ordena
+# por inicio y se recorre una sola vez para choques y horas por día. El costo crece con las
+# asignaciones, no con salas × slots.
+
+ERROR, AVISO = "error", "aviso"
+
+# código -> nivel
+CODIGOS = {
+    "curso_desconocido": ERROR,
+    "sala_desconocida": ERROR,
+    "profesor_desconocido": ERROR,
+    "grupo_invalido": ERROR,
+    "grupo_duplicado": ERROR,
+    "fuera_de_jornada": ERROR,
+    "duracion": ERROR,
+    "sala_doble_reserva": ERROR,
+    "sala_capacidad": ERROR,
+    "sala_tipo": ERROR,
+    "sala_facultad": ERROR,
+    "profesor_choque": ERROR,
+    "profesor_fuera_disponibilidad": ERROR,
+    "profesor_horas_dia": ERROR,
+    "profesor_no_habilitado": ERROR,
+    "profesor_sin_labs": ERROR,
+    "ciclo_no_permitido": AVISO,
+    "grupo_no_asignado": AVISO,
+    "hueco_teorico_lab": AVISO,
+}
+
+@dataclass(frozen=True)
+class Alerta:
+    codigo: str
+    nivel: str
+    mensaje: str
+    curso: Optional[str] = None
+    grupo: Optional[str] = None
+    sala: Optional[str] = None
+    profesor: Optional[str] = None
+    dia: Optional[str] = None
+
+def _alerta(codigo: str, mensaje: str, **ids) -> Alerta:
+    return Alerta(codigo, CODIGOS[codigo], mensaje, **ids)
+
+def ciclo_permitido(semester: str, cycle: int) -> bool:
+    # misma regla que Scheduler.ciclo_permitido
+    if semester == "Abril-Agosto":
+        return cycle % 2 == 1
+    if semester == "Agosto-Diciembre":
+        return cycle % 2 == 0
+    return True
+
+def grupos_esperados(c: Course) -> Dict[str, Tuple[str, int]]:
+    # grupo -> (tipo de sala, alumnos), como los arma build()
+    grupos: Dict[str, Tuple[str, int]] = {}
+    for g in range(1, math.ceil(c.inscritos_lab / 15) + 1):
+        grupos[f"Lab-{g}"] = ("lab", min(15, c.inscritos_lab - 15 * (g - 1)))
+    if c.inscritos_teorico > 60:
+        grupos["Teo-A"] = ("teorico", 60)
+        grupos["Teo-B"] = ("teorico", min(60, c.inscritos_teorico - 60))
+    elif c.inscritos_teorico > 0:
+        grupos["Teo-A"] = ("teorico", c.inscritos_teorico)
+    return grupos
+
+def _disponible(ventanas: Dict[str, List[Tuple[int, int]]], a: Assignment) -> bool:
+    return any(ini <= a.slot.start and a.slot.end <= fin for ini, fin in ventanas.get(a.slot.day, ()))
+
+def _barrer(asigns: List[Assignment], choque) -> None:
+    # asigns ordenadas por inicio (un recurso, un día): se compara contra la que termina más tarde
+    ultima = None
+    for a in asigns:
+        if ultima is not None and a.slot.start < ultima.slot.end:
+            choque(ultima, a)
+        if ultima is None or a.slot.end > ultima.slot.end:
+            ultima = a
+
+def validar(semester: str, rooms: Iterable[Room], professors: Iterable[Professor], courses: Iterable[Course],
+            assignments: Iterable[Assignment]) -> List[Alerta]:
+    salas = {r.id: r for r in rooms}
+    profs = {p.id: p for p in professors}
+    cursos = {c.code: c for c in courses}
+    disponibilidad = {pid: ventanas_unidas(p) for pid, p in profs.items()}
+    alertas: List[Alerta] = []
+
+    # --- reglas por asignación ---
+    por_sala: Dict[Tuple[str, int], List[Assignment]] = defaultdict(list)
+    por_prof: Dict[Tuple[str, int], List[Assignment]] = defaultdict(list)
+    presentes: Dict[str, Dict[str, Assignment]] = defaultdict(dict)
+    esperados: Dict[str, Dict[str, Tuple[str, int]]] = {}
+    for a in assignments:
+        ids = {"curso": a.course_code, "grupo": a.group, "sala": a.room_id, "profesor": a.professor_id, "dia": a.slot.day}
+        donde = f"{a.course_code} {a.group} ({a.slot})"
+        c = cursos.get(a.course_code)
+        if c is None:
+            alertas.append(_alerta("curso_desconocido", f"Curso desconocido: {donde}", **ids))
+            continue
+        if c.code not in esperados:
+            esperados[c.code] = grupos_esperados(c)
+        esperado = esperados[c.code].get(a.group)
+        if esperado is None:
+            alertas.append(_alerta("grupo_invalido", f"Grupo inexistente para {c.name}: {donde}", **ids))
+        elif a.group in presentes[c.code]:
+            alertas.append(_alerta("grupo_duplicado", f"Grupo asignado dos veces: {donde} y {presentes[c.code][a.group].slot}", **ids))
+        else:
+            presentes[c.code][a.group] = a
+        if a.slot.start < START_MINUTES or a.slot.end > END_MINUTES or a.slot.end <= a.slot.start:
+            alertas.append(_alerta("fuera_de_jornada", f"Fuera de la jornada {minutes_to_hhmm(START_MINUTES)}-{minutes_to_hhmm(END_MINUTES)}: {donde}", **ids))
+        if esperado is not None:
+            horas = c.duracion_lab_horas if esperado[0] == "lab" else c.duracion_teorico_horas
+            if a.slot.end - a.slot.start != horas * 60:
+                alertas.append(_alerta("duracion", f"Duración distinta de {horas}h: {donde}", **ids))
+
+        sala = salas.get(a.room_id)
+        if sala is None:
+            alertas.append(_alerta("sala_desconocida", f"Sala desconocida: {a.room_id} en {donde}", **ids))
+        else:
+            por_sala[(sala.id, a.slot.dia)].append(a)
+            if sala.faculty != c.faculty:
+                alertas.append(_alerta("sala_facultad", f"Sala {sala.id} es de {sala.faculty} y el curso de {c.faculty}: {donde}", **ids))
+            if esperado is not None:
+                tipo, alumnos = esperado
+                if sala.kind != tipo:
+                    alertas.append(_alerta("sala_tipo", f"Sala {sala.id} ({sala.kind}) para un grupo {tipo}: {donde}", **ids))
+                if sala.capacity < alumnos:
+                    alertas.append(_alerta("sala_capacidad", f"Sala {sala.id} (cap. {sala.capacity}) para {alumnos} alumnos: {donde}", **ids))
+
+        if a.professor_id is None:
+            continue
+        prof = profs.get(a.professor_id)
+        if prof is None:
+            alertas.append(_alerta("profesor_desconocido", f"Profesor desconocido: {a.professor_id} en {donde}", **ids))
+            continue
+        por_prof[(prof.id, a.slot.dia)].append(a)
+        if not _disponible(disponibilidad[prof.id], a):
+            alertas.append(_alerta("profesor_fuera_disponibilidad", f"Profesor {prof.name} no disponible: {donde}", **ids))
+        # como en build(): la habilitación por ciclo se exige en teóricos (los labs admiten al profesor igual)
+        if esperado is not None and esperado[0] == "teorico" and prof.habilitado_desde_ciclo > c.cycle:
+            alertas.append(_alerta("profesor_no_habilitado", f"Profesor no habilitado: {prof.name} desde {prof.habilitado_desde_ciclo}+ para {c.name} (ciclo {c.cycle})", **ids))
+        if esperado is not None and esperado[0] == "lab" and not prof.disponible_labs:
+            alertas.append(_alerta("profesor_sin_labs", f"Profesor {prof.name} no dicta labs: {donde}", **ids))
+
+    # --- barrido por recurso y día ---
+    for (rid, d), asigns in sorted(por_sala.items()):
+        asigns.sort(key=lambda a: (a.slot.start, a.slot.end))
+        _barrer(asigns, lambda x, y: alertas.append(_alerta(
+            "sala_doble_reserva", f"Sala {rid} con dos clases a la vez el {DAYS[d]}: {x.course_code} {x.group} ({x.slot}) y {y.course_code} {y.group} ({y.slot})",
+            curso=y.course_code, grupo=y.group, sala=rid, dia=DAYS[d])))
+    for (pid, d), asigns in sorted(por_prof.items()):
+        asigns.sort(key=lambda a: (a.slot.start, a.slot.end))
+        nombre = profs[pid].name
+        _barrer(asigns, lambda x, y: alertas.append(_alerta(
+            "profesor_choque", f"Profesor {nombre} en dos clases a la vez el {DAYS[d]}: {x.course_code} {x.group} ({x.slot}) y {y.course_code} {y.group} ({y.slot})",
+            curso=y.course_code, grupo=y.group, profesor=pid, dia=DAYS[d])))
+        horas = sum(a.slot.end - a.slot.start for a in asigns) / 60
+        if horas > 6:
+            alertas.append(_alerta("profesor_horas_dia", f"Profesor {nombre} sobrepasó horas máximas el {DAYS[d]}: {horas:.1f}h", profesor=pid, dia=DAYS[d]))
+
+    # --- reglas por curso ---
+    for c in cursos.values():
+        if not ciclo_permitido(semester, c.cycle):
+            alertas.append(_alerta("ciclo_no_permitido", f"Curso fuera del ciclo permitido ({semester}): {c.name} (ciclo {c.cycle})", curso=c.code))
+            continue
+        grupos = presentes.get(c.code, {})
+        for g in esperados.get(c.code) or grupos_esperados(c):
+            if g not in grupos:
+                alertas.append(_alerta("grupo_no_asignado", f"Grupo sin asignar: {c.name} {g}", curso=c.code, grupo=g))
+        t = {a.slot.dia for g, a in grupos.items() if g.startswith("Teo")}
+        l = {a.slot.dia for g, a in grupos.items() if g.startswith("Lab")}
+        if t and l:
+            gap = min(abs(x - y) for x in t for y in l)
+            if gap > 2:
+                alertas.append(_alerta("hueco_teorico_lab", f"Hueco >2 días entre teórico y lab: {c.name} (min {gap} días)", curso=c.code))
+    return alertas
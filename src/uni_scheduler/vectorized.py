@@ -0,0 +1,140 @@
+from __future__ import annotations
+from typing import List, Optional, Tuple
+import numpy as np
+from .models import Room, Professor, Course, Slot, Assignment, DAYS, DAY_INDEX, START_MINUTES, END_MINUTES, SLOT
+
+# Motor opcional (engine="numpy"): ocupación como tensores booleanos [recurso, día, bloque]
+# y factibilidad de todos los candidatos de un curso en una sola pasada. Elige lo mismo
+# que la búsqueda en Python: primer slot con sala libre, primera sala del catálogo con capacidad suficiente.
+
+N_BLOQUES = (END_MINUTES - START_MINUTES) // SLOT
+
+def _acumulado(occ: np.ndarray) -> np.ndarray:
+    # suma acumulada sobre bloques con un cero al inicio: ocupados en [a, b) = cs[..., b] - cs[..., a]
+    cs = np.zeros(occ.shape[:-1] + (occ.shape[-1] + 1,), dtype=np.int16)
+    np.cumsum(occ, axis=-1, out=cs[..., 1:])
+    return cs
+
+class MotorNumpy:
+    def __init__(self, sched):
+        self.sched = sched
+        self.room_pos = {r.id: i for i, r in enumerate(sched.rooms)}
+        self.prof_pos = {pid: i for i, pid in enumerate(sched.professors)}
+        self.room_occ = np.zeros((len(self.room_pos), len(DAYS), N_BLOQUES), dtype=bool)
+        self.prof_occ = np.zeros((len(self.prof_pos), len(DAYS), N_BLOQUES), dtype=bool)
+        self.prof_horas = np.zeros((len(self.prof_pos), len(DAYS)))
+        self.prof_disp = np.zeros((len(self.prof_pos), len(DAYS), N_BLOQUES), dtype=bool)
+        self.disp_acum = np.zeros((len(self.prof_pos), len(DAYS), N_BLOQUES + 1), dtype=np.int16)
+        for pid in sched.disponibilidad:
+            self.actualizar_disponibilidad(pid)
+        for a in sched.assignments:
+            self.ocupar(a)
+
+    @staticmethod
+    def _bloques(start: int, end: int) -> Tuple[int, int]:
+        a = (start - START_MINUTES) // SLOT
+        b = -(-(end - START_MINUTES) // SLOT)
+        return max(a, 0), min(b, N_BLOQUES)
+
+    def ocupar(self, asg: Assignment):
+        d = asg.slot.dia
+        a, b = self._bloques(asg.slot.start, asg.slot.end)
+        self.room_occ[self.room_pos[asg.room_id], d, a:b] = True
+        if asg.professor_id:
+            p = self.prof_pos[asg.professor_id]
+            self.prof_occ[p, d, a:b] = True
+            self.prof_horas[p, d] += asg.slot.duration_hours()
+
+    def liberar(self, asg: Assignment):
+        d = asg.slot.dia
+        a, b = self._bloques(asg.slot.start, asg.slot.end)
+        self.room_occ[self.room_pos[asg.room_id], d, a:b] = False
+        if asg.professor_id:
+            p = self.prof_pos[asg.professor_id]
+            self.prof_occ[p, d, a:b] = False
+            self.prof_horas[p, d] -= asg.slot.duration_hours()
+
+    def actualizar_disponibilidad(self, prof_id: str):
+        p = self.prof_pos[prof_id]
+        base = START_MINUTES // SLOT
+        self.prof_disp[p] = False
+        for day, m in self.sched.disponibilidad[prof_id].items():
+            self.prof_disp[p, DAY_INDEX[day]] = [(m >> (base + j)) & 1 for j in range(N_BLOQUES)]
+        self.disp_acum[p] = _acumulado(self.prof_disp[p])
+
+    @staticmethod
+    def candidatos(slots: List[Slot]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        d = np.fromiter((s.dia for s in slots), dtype=np.intp, count=len(slots))
+        a = np.fromiter(((s.start - START_MINUTES) // SLOT for s in slots), dtype=np.intp, count=len(slots))
+        b = np.fromiter(((s.end - START_MINUTES) // SLOT for s in slots), dtype=np.intp, count=len(slots))
+        return d, a, b
+
+    # --- matrices de factibilidad ---
+    def salas_libres(self, faculty: str, kind: str, capacidad_req: int, d, a, b) -> Tuple[List[Room], np.ndarray]:
+        # [candidato, sala] con las salas en el orden del catálogo
+        salas = self.sched.salas_candidatas(faculty, kind, capacidad_req)
+        if not salas:
+            return salas, np.zeros((len(d), 0), dtype=bool)
+        filas = np.fromiter((self.room_pos[r.id] for r in salas), dtype=np.intp, count=len(salas))
+        cs = _acumulado(self.room_occ[filas])
+        return salas, (cs[:, d, b] == cs[:, d, a]).T
+
+    def prof_libre(self, prof: Optional[Professor], d, a, b) -> np.ndarray:
+        # disponibilidad + sin choque, por candidato (sin el tope diario)
+        if prof is None:
+            return np.zeros(len(d), dtype=bool)
+        p = self.prof_pos[prof.id]
+        occ = _acumulado(self.prof_occ[p])
+        disp = self.disp_acum[p]
+        return (disp[d, b] - disp[d, a] == b - a) & (occ[d, b] == occ[d, a])
+
+    def factibilidad(self, c: Course, kind: str, capacidad_req: int, slots: List[Slot], prof: Optional[Professor]):
+        d, a, b = self.candidatos(slots)
+        salas, libres = self.salas_libres(c.faculty, kind, capacidad_req, d, a, b)
+        prof_ok = self.prof_libre(prof, d, a, b)
+        if prof is not None:
+            prof_ok &= self.prof_horas[self.prof_pos[prof.id], d] + (b - a) * (SLOT / 60.0) <= 6
+        return salas, libres, prof_ok
+
+    # --- búsquedas (misma interfaz que Scheduler.buscar_*) ---
+    def buscar_lab(self, c: Course, slots: List[Slot], prof: Optional[Professor]):
+        if prof is not None and not prof.disponible_labs:
+            prof = None
+        salas, libres, prof_ok = self.factibilidad(c, "lab", 15, slots, prof)
+        hay = libres.any(axis=1)
+        if not hay.any():
+            return None
+        i = int(hay.argmax())
+        return slots[i], salas[int(libres[i].argmax())], prof.id if prof_ok[i] else None
+
+    def buscar_simple(self, c: Course, cap: int, slots: List[Slot], prof: Optional[Professor]):
+        salas, libres, prof_ok = self.factibilidad(c, "teorico", min(60, cap), slots, prof)
+        hay = libres.any(axis=1)
+        if not hay.any():
+            return None
+        i = int(hay.argmax())
+        return slots[i], salas[int(libres[i].argmax())], prof.id if prof_ok[i] else None
+
+    def buscar_doble(self, c: Course, grupos, slots: List[Slot], prof: Optional[Professor]):
+        dur = c.duracion_teorico_horas * 60
+        gap = 30
+        d, a, b = self.candidatos(slots)
+        # segundo bloque: mismo día, tras un hueco de 30 min
+        a2 = b + gap // SLOT
+        b2 = a2 + dur // SLOT
+        valido = b2 <= N_BLOQUES
+        a2c, b2c = np.minimum(a2, N_BLOQUES), np.minimum(b2, N_BLOQUES)
+        salas_A, libres_A = self.salas_libres(c.faculty, "teorico", min(60, grupos[0][1]), d, a, b)
+        salas_B, libres_B = self.salas_libres(c.faculty, "teorico", min(60, grupos[1][1]), d, a2c, b2c)
+        hay = valido & libres_A.any(axis=1) & libres_B.any(axis=1)
+        if not hay.any():
+            return None
+        i = int(hay.argmax())
+        s = slots[i]
+        s2 = Slot(s.dia, s.end + gap, s.end + gap + dur)
+        prof_id = None
+        if prof is not None:
+            ok = self.prof_libre(prof, d[i:i+1], a[i:i+1], b[i:i+1])[0] and self.prof_libre(prof, d[i:i+1], a2c[i:i+1], b2c[i:i+1])[0]
+            if ok and self.prof_horas[self.prof_pos[prof.id], d[i]] + s.duration_hours() + s2.duration_hours() <= 6:
+                prof_id = prof.id
+        return s, salas_A[int(libres_A[i].argmax())], s2, salas_B[int(libres_B[i].argmax())], prof_id
@@ -0,0 +1,63 @@
+# helpers compartidos por los tests (horarios construidos y su estado derivado)
+from collections import Counter
+from src.uni_scheduler import Scheduler
+from src.uni_scheduler.synthetic import campus_sintetico
+from src.uni_scheduler.validation import ERROR, grupos_esperados
+
+SEMESTRES = ("Agosto-Diciembre", "Abril-Agosto")
+
+def construir(semester, datos):
+    rooms, profs, courses, assistants = datos
+    s = Scheduler(semester, rooms, profs, courses, assistants)
+    s.build()
+    return s
+
+def sintetico(cursos=120, seed=0):
+    return campus_sintetico(cursos, seed=seed)
+
+def estado(s):
+    # estado derivado de las asignaciones, sin entradas en cero (liberar deja claves vacías)
+    nz = lambda d: {k: v for k, v in d.items() if v}
+    ag = s.agregados
+    return {
+        "asignaciones": Counter(s.assignments),
+        "room_index": nz(s.room_index.masks),
+        "prof_index": nz(s.prof_index.masks),
+        "room_occupancy": {k: Counter(v) for k, v in s.room_occupancy.items() if v},
+        "prof_occupancy": {k: Counter(v) for k, v in s.prof_occupancy.items() if v},
+        "por_curso": {k: Counter(v) for k, v in s.por_curso.items() if v},
+        "salas_por_grupo": nz(ag.salas_por_grupo),
+        "sala_dia": nz(ag.sala_dia),
+        "sala_total": ag.sala_total,
+        "salas_por_uso": {m: set(salas) for m, salas in ag.salas_por_uso.items() if salas},
+        "minutos_tipo": nz(ag.minutos_tipo),
+        "mapa": ag.mapa,
+        "prof_dia": nz(ag.prof_dia),
+        "prof_total": ag.prof_total,
+        "carga": nz(ag.carga),
+        "carga_dia": nz(ag.carga_dia),
+        "sobrecarga": ag.sobrecarga,
+        "alertas": Counter(zip(s.alert_keys, s.alerts)),
+    }
+
+def desde_cero(s):
+    # mismo horario colocado sobre un Scheduler nuevo, con las alertas que build() daría para él:
+    # grupos que no se pudieron colocar y profesor no habilitado (fases de colocación) + validaciones
+    ref = Scheduler(s.semester, list(s.rooms), list(s.professors.values()), list(s.courses), s.assistants_pool)
+    ref._restaurar(s.assignments, [], [])
+    colocados = {(a.course_code, a.group) for a in ref.assignments}
+    for c in ref.courses:
+        if not ref.ciclo_permitido(c.cycle):
+            continue
+        prof = ref.professors.get(c.profesor_id)
+        if c.inscritos_teorico > 0 and prof and prof.habilitado_desde_ciclo > c.cycle:
+            ref._alerta(("curso", c.code), f"Profesor no habilitado: {prof.name} desde {prof.habilitado_desde_ciclo}+ para {c.name} (ciclo {c.cycle})")
+        for g in grupos_esperados(c):
+            if (c.code, g) not in colocados:
+                msg = f"Laboratorio no asignado: {c.name} requiere grupo {g} y no hay slot disponible" if g.startswith("Lab") else f"Teórico no asignado: {c.name} {g}"
+                ref._alerta(("curso", c.code), msg)
+    ref.fase_validaciones()
+    return ref
+
+def errores(s):
+    return [a for a in s.validar() if a.nivel == ERROR]
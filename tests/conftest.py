@@ -0,0 +1,5 @@
+import os
+import sys
+
+# los módulos se importan como en la CLI y la API (src.uni_scheduler, app_api) desde la raíz del repo
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
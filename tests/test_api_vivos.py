@@ -0,0 +1,30 @@
+import pytest
+
+pytest.importorskip("fastapi")
+pytest.importorskip("httpx")
+from fastapi.testclient import TestClient
+import app_api
+
+@pytest.fixture
+def cliente(monkeypatch):
+    monkeypatch.setattr(app_api, "_vivos", {})
+    monkeypatch.setattr(app_api, "_vivos_uso", {})
+    return TestClient(app_api.app)
+
+def _crear(cliente):
+    return cliente.post("/schedules", json=cliente.get("/sample").json())
+
+def test_limite_de_horarios_vivos(cliente, monkeypatch):
+    monkeypatch.setattr(app_api, "VIVOS_MAX", 2)
+    ids = [_crear(cliente).json()["schedule_id"] for _ in range(2)]
+    assert _crear(cliente).status_code == 429
+    assert cliente.delete(f"/schedules/{ids[0]}").status_code == 200
+    assert _crear(cliente).status_code == 200
+    assert cliente.get(f"/schedules/{ids[1]}").status_code == 200
+
+def test_horarios_vivos_expiran(cliente, monkeypatch):
+    schedule_id = _crear(cliente).json()["schedule_id"]
+    assert cliente.get(f"/schedules/{schedule_id}").status_code == 200
+    monkeypatch.setattr(app_api, "VIVOS_TTL", -1.0)
+    assert cliente.get(f"/schedules/{schedule_id}").status_code == 404
+    assert not app_api._vivos
@@ -0,0 +1,39 @@
+import pytest
+from comun import SEMESTRES, sintetico, estado
+from src.uni_scheduler import Scheduler
+from src.uni_scheduler.cache import ResultCache
+from src.uni_scheduler.data_example import dataset_ejemplo
+
+def _nuevo(semester, datos, **kw):
+    rooms, profs, courses, assistants = datos
+    return Scheduler(semester, rooms, profs, courses, assistants, **kw)
+
+@pytest.mark.parametrize("semester", SEMESTRES)
+@pytest.mark.parametrize("datos", (dataset_ejemplo, lambda: sintetico(300)), ids=("ejemplo", "sintetico"))
+def test_hit_igual_a_build(tmp_path, semester, datos):
+    datos = datos()
+    fresco = _nuevo(semester, datos)
+    fresco.build()
+    for cache in (ResultCache(), ResultCache(path=str(tmp_path))):
+        _nuevo(semester, datos).build(cache=cache)
+        if cache.path:
+            cache = ResultCache(path=cache.path)  # otro proceso: solo el disco
+        s = _nuevo(semester, datos)
+        s.build(cache=cache)
+        assert cache.stats()["hits"] == 1
+        assert s.assignments == fresco.assignments
+        assert s.alerts == fresco.alerts and s.alert_keys == fresco.alert_keys
+        assert estado(s) == estado(fresco)
+
+def test_build_con_seed_no_usa_la_cache():
+    datos = sintetico(300)
+    cache = ResultCache()
+    _nuevo("Agosto-Diciembre", datos, seed="0:3").build(cache=cache)
+    assert cache.stats()["entries"] == 0
+    fresco = _nuevo("Agosto-Diciembre", datos)
+    fresco.build()
+    s = _nuevo("Agosto-Diciembre", datos)
+    s.build(cache=cache)
+    assert s.assignments == fresco.assignments
+    _nuevo("Agosto-Diciembre", datos, seed="0:3").build(cache=cache)
+    assert cache.stats()["hits"] == 0
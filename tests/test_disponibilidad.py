@@ -0,0 +1,18 @@
+from src.uni_scheduler import Scheduler, Professor, Slot
+from src.uni_scheduler.synthetic import campus_sintetico
+from src.uni_scheduler.utils import generar_candidatos, profesor_disponible
+
+def test_ventanas_contiguas_se_unen():
+    p = Professor("p1", "Prof. X", 1, True, {"Lunes": [("07:00", "08:00"), ("08:00", "12:00")], "Martes": [("09:00", "10:00"), ("10:30", "12:00")]})
+    s = Scheduler("Agosto-Diciembre", [], [p], [])
+    for slot, esperado in ((Slot("Lunes", 420, 540), True), (Slot("Lunes", 690, 750), False),
+                           (Slot("Martes", 540, 600), True), (Slot("Martes", 570, 660), False)):
+        assert profesor_disponible(p, slot) == s.disponible_prof("p1", slot) == esperado
+
+def test_profesor_disponible_igual_al_scheduler():
+    rooms, profs, courses, assistants = campus_sintetico(200, seed=3)
+    s = Scheduler("Agosto-Diciembre", rooms, profs, courses, assistants)
+    slots = [slot for h in (1, 2, 3) for slot in generar_candidatos(h)]
+    for p in profs:
+        for slot in slots:
+            assert profesor_disponible(p, slot) == s.disponible_prof(p.id, slot)
@@ -0,0 +1,52 @@
+import io
+import threading
+import pytest
+from comun import construir, sintetico
+from src.uni_scheduler.export import escribir_excel, escribir_pdf_alertas, transmitir
+
+openpyxl = pytest.importorskip("openpyxl")
+
+def _hojas(raw: bytes):
+    wb = openpyxl.load_workbook(io.BytesIO(raw), read_only=True)
+    try:
+        return {ws.title: [list(f) for f in ws.iter_rows(values_only=True)] for ws in wb.worksheets}
+    finally:
+        wb.close()
+
+def _excel(s) -> bytes:
+    buf = io.BytesIO()
+    escribir_excel(s, buf)
+    return buf.getvalue()
+
+def test_descarga_no_retiene_el_lock(monkeypatch):
+    from src.uni_scheduler import export
+    monkeypatch.setattr(export._Tubo, "TROZO", 1024)  # la cola se llena antes de terminar
+    s = construir("Agosto-Diciembre", sintetico(300))
+    antes = _hojas(_excel(s))
+    lock = threading.Lock()
+    trozos = transmitir(escribir_excel, s, lock)
+    # la descarga todavía no se leyó: los cambios no esperan y no aparecen en el archivo
+    assert lock.acquire(timeout=1)
+    s.quitar_curso(s.assignments[0].course_code)
+    lock.release()
+    assert _hojas(b"".join(trozos)) == antes
+    assert _hojas(_excel(s)) != antes
+
+def test_pdf_en_streaming():
+    pytest.importorskip("reportlab")
+    s = construir("Agosto-Diciembre", sintetico(100))
+    raw = b"".join(transmitir(escribir_pdf_alertas, s, threading.Lock()))
+    assert raw.startswith(b"%PDF") and raw.rstrip().endswith(b"%%EOF")
+
+def test_productor_termina_si_nadie_lee(monkeypatch):
+    from src.uni_scheduler import export
+    monkeypatch.setattr(export._Tubo, "ESPERA_MAX", 0.2)
+    monkeypatch.setattr(export._Tubo, "TROZO", 1024)  # más trozos que lugares en la cola
+    s = construir("Agosto-Diciembre", sintetico(100))
+    hilos = threading.active_count()
+    transmitir(escribir_excel, s, threading.Lock())  # el cliente se fue antes del primer trozo
+    for _ in range(50):
+        if threading.active_count() == hilos:
+            break
+        threading.Event().wait(0.1)
+    assert threading.active_count() == hilos
@@ -0,0 +1,50 @@
+from collections import Counter
+from dataclasses import replace
+import pytest
+from comun import SEMESTRES, construir, sintetico, estado, desde_cero, errores
+from src.uni_scheduler.data_example import dataset_ejemplo
+
+@pytest.mark.parametrize("semester", SEMESTRES)
+def test_incremental_ejemplo(semester):
+    s = construir(semester, dataset_ejemplo())
+    s.agregar_curso(replace(s.cursos_por_codigo["FIS203"], code="FIS204", name="Física III", cycle=s.courses[0].cycle))
+    assert estado(s) == estado(desde_cero(s))
+    s.modificar_curso(replace(s.cursos_por_codigo["BIO401"], inscritos_lab=50))
+    assert estado(s) == estado(desde_cero(s))
+    s.retirar_sala("Ing-Lab1")
+    assert all(a.room_id != "Ing-Lab1" for a in s.assignments)
+    assert estado(s) == estado(desde_cero(s))
+    s.quitar_curso("MAT101")
+    assert all(a.course_code != "MAT101" for a in s.assignments)
+    assert estado(s) == estado(desde_cero(s))
+    assert errores(s) == []
+
+@pytest.mark.parametrize("seed", (0, 1))
+def test_incrementalsintetico(seed):
+    s = construir("Agosto-Diciembre", sintetico(seed=seed))
+    codigos = [c.code for c in s.courses]
+    nuevo = replace(s.courses[0], code="NUEVO1", profesor_id=s.courses[1].profesor_id)
+    s.agregar_curso(nuevo)
+    assert estado(s) == estado(desde_cero(s))
+    for code in codigos[2:6]:
+        c = s.cursos_por_codigo[code]
+        s.modificar_curso(replace(c, inscritos_teorico=c.inscritos_teorico + 70, inscritos_lab=c.inscritos_lab + 15))
+        assert estado(s) == estado(desde_cero(s))
+    usadas = Counter(a.room_id for a in s.assignments)
+    for room_id, _ in usadas.most_common(2):
+        s.retirar_sala(room_id)
+        assert estado(s) == estado(desde_cero(s))
+    for code in codigos[6:12]:
+        s.quitar_curso(code)
+        assert estado(s) == estado(desde_cero(s))
+    p = next(iter(s.professors))
+    s.cambiar_disponibilidad(p, {"Lunes": [("07:00", "11:00")], "Jueves": [("14:00", "20:00")]})
+    assert estado(s) == estado(desde_cero(s))
+    assert errores(s) == []
+
+def test_incrementalerrores():
+    s = construir("Agosto-Diciembre", dataset_ejemplo())
+    with pytest.raises(ValueError):
+        s.agregar_curso(s.courses[0])
+    with pytest.raises(KeyError):
+        s.retirar_sala("no-existe")
@@ -0,0 +1,54 @@
+import io
+import pytest
+from src.uni_scheduler.ingest import cargar_salas, cargar_campus, leer_filas, ErrorIngesta
+
+SALAS = "id,faculty,kind,capacity\nA1,Ingeniería,teorico,40\nA2,Ingeniería,lab,20\n"
+PROFES = "id,name,habilitado_desde_ciclo,disponible_labs,day,start,end\np1,Prof. X,1,si,Lunes,07:00,12:00\n"
+CURSOS = "code,name,faculty,cycle,inscritos_teorico,inscritos_lab,profesor_id\nC1,Curso 1,Ingeniería,2,40,10,p1\n"
+
+def _errores(*fuentes, nombres=("salas.csv", "profesores.csv", "cursos.csv")):
+    with pytest.raises(ErrorIngesta) as e:
+        cargar_campus(*[io.BytesIO(f) for f in fuentes], nombres)
+    return [(f.archivo, f.fila, f.columna) for f in e.value.errores], e.value.errores
+
+def test_campus_valido():
+    rooms, profs, courses = cargar_campus(*[io.BytesIO(t.encode()) for t in (SALAS, PROFES, CURSOS)])
+    assert [r.id for r in rooms] == ["A1", "A2"] and profs[0].disponibilidad == {"Lunes": [("07:00", "12:00")]}
+    assert courses[0].profesor_id == "p1"
+
+def test_ingesta_reporta_errores_por_fila():
+    csv = b"id,faculty,kind,capacity\nA1,Ciencias,teorico,40\nA2,Ciencias,aula,40\nA1,Ciencias,lab,x\nA3,Letras,lab,20\n"
+    with pytest.raises(ErrorIngesta) as e:
+        cargar_salas(io.BytesIO(csv), "salas.csv")
+    assert [(f.fila, f.columna) for f in e.value.errores] == [(3, "kind"), (4, "capacity")]
+
+def test_csv_que_no_es_utf8():
+    donde, errores = _errores(SALAS.encode("cp1252"), PROFES.encode(), CURSOS.encode())
+    assert donde[0][0] == "salas.csv" and donde[0][2] is None
+    assert "UTF-8" in errores[0].mensaje
+
+def test_xlsx_corrupto():
+    donde, _ = _errores(b"PK\x03\x04 no es un zip", PROFES.encode(), CURSOS.encode(),
+                        nombres=("salas.xlsx", "profesores.csv", "cursos.csv"))
+    assert donde == [("salas.xlsx", 1, None)]
+
+def test_archivo_vacio():
+    for vacio in range(3):
+        fuentes = [t.encode() for t in (SALAS, PROFES, CURSOS)]
+        fuentes[vacio] = b""
+        donde, errores = _errores(*fuentes)
+        assert donde[0][1:] == (1, None) and "faltan columnas" in errores[0].mensaje
+
+def test_solo_cabecera_se_valida():
+    donde, errores = _errores(b"id,faculty\n", PROFES.encode(), CURSOS.encode())
+    assert donde == [("salas.csv", 1, None)] and "kind" in errores[0].mensaje
+
+def test_archivo_inexistente(tmp_path):
+    with pytest.raises(ErrorIngesta) as e:
+        cargar_salas(str(tmp_path / "no-existe.csv"))
+    assert e.value.errores[0].fila == 1 and "no se pudo abrir" in e.value.errores[0].mensaje
+
+def test_leer_filas_llena_la_cabecera():
+    cabecera = []
+    assert list(leer_filas(io.BytesIO(b"id;faculty\n"), "x.csv", cabecera)) == []
+    assert cabecera == ["id", "faculty"]
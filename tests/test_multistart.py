@@ -0,0 +1,43 @@
+import pytest
+from comun import sintetico
+from src.uni_scheduler import Scheduler
+from src.uni_scheduler import multistart
+
+def _multistart(datos, n, workers, seed):
+    rooms, profs, courses, assistants = datos
+    s = Scheduler("Agosto-Diciembre", rooms, profs, courses, assistants)
+    score = s.build_multistart(n, workers, seed=seed)
+    return score, s.assignments, s.alerts, s.alert_keys
+
+def test_mismo_seed_mismo_resultado():
+    datos = sintetico(200)
+    a = _multistart(datos, 4, 1, seed=5)
+    assert _multistart(datos, 4, 1, seed=5) == a
+    # en paralelo (pool compartido) gana la misma variante
+    assert _multistart(datos, 4, 2, seed=5) == a
+
+def test_variante_0_es_el_build():
+    rooms, profs, courses, assistants = datos = sintetico(200)
+    s = Scheduler("Agosto-Diciembre", rooms, profs, courses, assistants)
+    s.build()
+    score, assignments, _, _ = _multistart(datos, 1, 1, seed=0)
+    assert score["variante"] == 0 and assignments == s.assignments
+
+def test_pool_compartido_entre_llamadas():
+    datos = sintetico(60)
+    _multistart(datos, 3, 2, seed=1)
+    pool = multistart._pool
+    assert pool is not None
+    _multistart(datos, 3, 2, seed=2)
+    assert multistart._pool is pool
+
+def test_api_workers_no_depende_de_la_maquina():
+    pytest.importorskip("fastapi")
+    pytest.importorskip("httpx")
+    from fastapi.testclient import TestClient
+    import app_api
+    cliente = TestClient(app_api.app)
+    payload = {**cliente.get("/sample").json(), "multistart": 4, "workers": 2}
+    r = cliente.post("/schedule", json=payload)
+    assert r.status_code == 200 and r.json()["score"] is not None
+    assert cliente.post("/schedule", json={**payload, "workers": app_api.MAX_WORKERS + 1}).status_code == 422
@@ -0,0 +1,35 @@
+from dataclasses import replace
+import pytest
+from comun import SEMESTRES, sintetico
+from src.uni_scheduler import Scheduler
+from src.uni_scheduler.data_example import dataset_ejemplo
+
+pytest.importorskip("numpy")
+
+def _par(semester, datos):
+    # mismo dataset con cada motor (listas propias: los cambios incrementales las modifican)
+    rooms, profs, courses, assistants = datos
+    return [Scheduler(semester, list(rooms), profs, list(courses), assistants, engine=e) for e in ("python", "numpy")]
+
+def _igual(py, np_):
+    assert np_.assignments == py.assignments
+    assert np_.alerts == py.alerts and np_.alert_keys == py.alert_keys
+
+@pytest.mark.parametrize("semester", SEMESTRES)
+@pytest.mark.parametrize("datos", (dataset_ejemplo, lambda: sintetico(400), lambda: sintetico(400, seed=7)), ids=("ejemplo", "sintetico", "sintetico7"))
+def test_numpy_igual_a_python(semester, datos):
+    py, np_ = _par(semester, datos())
+    py.build()
+    np_.build()
+    _igual(py, np_)
+
+def test_numpy_igual_en_cambios_incrementales():
+    py, np_ = _par("Agosto-Diciembre", sintetico(200))
+    for s in (py, np_):
+        s.build()
+        c = s.courses[3]
+        s.modificar_curso(replace(c, inscritos_teorico=c.inscritos_teorico + 70))
+        s.retirar_sala(s.assignments[0].room_id)
+        s.quitar_curso(s.courses[5].code)
+        s.cambiar_disponibilidad(next(iter(s.professors)), {"Martes": [("07:00", "13:00")]})
+    _igual(py, np_)
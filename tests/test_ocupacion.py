@@ -0,0 +1,31 @@
+from collections import Counter
+import pytest
+from comun import SEMESTRES, construir, sintetico
+from src.uni_scheduler.data_example import dataset_ejemplo
+from src.uni_scheduler.utils import generar_candidatos
+
+def _libre_por_lista(ocupacion, key, slot):
+    # el chequeo anterior al índice: recorrer las asignaciones del recurso con Slot.overlaps
+    return not any(a.slot.overlaps(slot) for a in ocupacion.get(key, ()))
+
+def _comparar(s):
+    slots = [slot for h in (1, 2, 3) for slot in generar_candidatos(h)]
+    for r in s.rooms:
+        for slot in slots:
+            assert s.libre_room(r.id, slot) == _libre_por_lista(s.room_occupancy, r.id, slot)
+    for pid in s.professors:
+        for slot in slots:
+            assert s.libre_prof(pid, slot) == _libre_por_lista(s.prof_occupancy, pid, slot)
+
+@pytest.mark.parametrize("semester", SEMESTRES)
+def test_indice_igual_a_recorrer_asignaciones(semester):
+    for datos in (dataset_ejemplo(), sintetico(150)):
+        _comparar(construir(semester, datos))
+
+def test_indice_despues_de_liberar():
+    s = construir("Agosto-Diciembre", sintetico(150))
+    for room_id, _ in Counter(a.room_id for a in s.assignments).most_common(2):
+        s.retirar_sala(room_id)
+    for code in [c.code for c in s.courses[:10]]:
+        s.quitar_curso(code)
+    _comparar(s)
@@ -0,0 +1,34 @@
+import pytest
+from comun import construir, sintetico, estado
+from src.uni_scheduler import Scheduler
+from src.uni_scheduler.data_example import dataset_ejemplo
+
+@pytest.mark.parametrize("datos", (dataset_ejemplo, sintetico), ids=("ejemplo", "sintetico"))
+def test_snapshot_ida_y_vuelta(tmp_path, datos):
+    s = construir("Agosto-Diciembre", datos())
+    path = str(tmp_path / "horario.snap")
+    s.save_snapshot(path)
+    r = Scheduler.load_snapshot(path)
+    assert r.semester == s.semester
+    assert r.rooms == s.rooms
+    assert r.professors == s.professors
+    assert r.courses == s.courses
+    assert r.assistants_pool == s.assistants_pool
+    assert r.assignments == s.assignments
+    assert r.alerts == s.alerts and r.alert_keys == s.alert_keys
+    assert estado(r) == estado(s)
+
+def test_snapshot_despues_de_cambios(tmp_path):
+    s = construir("Abril-Agosto", sintetico(200))
+    s.quitar_curso(s.courses[0].code)
+    s.retirar_sala(s.assignments[0].room_id)
+    path = str(tmp_path / "horario.snap")
+    s.save_snapshot(path)
+    r = Scheduler.load_snapshot(path)
+    assert r.rooms == s.rooms and r.assignments == s.assignments and estado(r) == estado(s)
+
+def test_snapshot_invalido(tmp_path):
+    path = tmp_path / "roto.snap"
+    path.write_bytes(b"no es un snapshot")
+    with pytest.raises(ValueError):
+        Scheduler.load_snapshot(str(path))
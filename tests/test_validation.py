@@ -0,0 +1,44 @@
+from dataclasses import replace
+import io
+import os
+import subprocess
+import sys
+import pytest
+from comun import SEMESTRES, construir, sintetico, errores
+from src.uni_scheduler.data_example import dataset_ejemplo
+from src.uni_scheduler.ingest import cargar_horario, ErrorIngesta
+
+@pytest.mark.parametrize("semester", SEMESTRES)
+def test_validar_horario_construido(semester):
+    for datos in (dataset_ejemplo(), sintetico(300)):
+        assert errores(construir(semester, datos)) == []
+
+def test_validar_detecta_choque_de_sala():
+    s = construir("Agosto-Diciembre", dataset_ejemplo())
+    a, b = s.assignments[0], s.assignments[1]
+    s.assignments[1] = replace(b, room_id=a.room_id, slot=a.slot)
+    assert "sala_doble_reserva" in {e.codigo for e in errores(s)}
+
+def test_horario_exportado_se_valida_igual():
+    pytest.importorskip("openpyxl")
+    from src.uni_scheduler.export import escribir_excel
+    s = construir("Agosto-Diciembre", sintetico(200))
+    buf = io.BytesIO()
+    escribir_excel(s, buf)
+    buf.seek(0)
+    leidas = cargar_horario(buf, s.courses, list(s.professors.values()), "horarios.xlsx")
+    assert sorted(leidas, key=repr) == sorted(s.assignments, key=repr)
+
+def test_horario_ilegible(tmp_path):
+    pytest.importorskip("openpyxl")
+    falso = tmp_path / "horarios.xlsx"
+    falso.write_bytes(b"no es un xlsx")
+    for path in (falso, tmp_path / "no-existe.xlsx"):
+        with pytest.raises(ErrorIngesta) as e:
+            cargar_horario(str(path), [], [])
+        assert [(f.fila, f.columna) for f in e.value.errores] == [(1, None)]
+
+def test_cli_validate_archivo_inexistente(tmp_path):
+    r = subprocess.run([sys.executable, "app_cli.py", "--validate", str(tmp_path / "nope.xlsx")], capture_output=True, text=True,
+                       cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    assert r.returncode == 2 and "Traceback" not in r.stderr and "no se pudo abrir" in r.stderr